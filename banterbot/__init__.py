@@ -1,12 +1,18 @@
-from banterbot.extensions.interface import Interface
-from banterbot.gui.tk_interface import TKInterface
-from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
-from banterbot.managers.memory_chain import MemoryChain
-from banterbot.managers.openai_model_manager import OpenAIModelManager
-from banterbot.services.openai_service import OpenAIService
-from banterbot.services.speech_recognition_service import SpeechRecognitionService
-from banterbot.services.speech_synthesis_service import SpeechSynthesisService
-from banterbot.utils.nlp import NLP
+from typing import TYPE_CHECKING
+
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.extensions.interface import Interface
+    from banterbot.gui.tk_interface import TKInterface
+    from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
+    from banterbot.managers.memory_chain import MemoryChain
+    from banterbot.managers.openai_model_manager import OpenAIModelManager
+    from banterbot.services.async_openai_service import AsyncOpenAIService
+    from banterbot.services.openai_service import OpenAIService
+    from banterbot.services.speech_recognition_service import SpeechRecognitionService
+    from banterbot.services.speech_synthesis_service import SpeechSynthesisService
+    from banterbot.utils.nlp import NLP
 
 __all__ = [
     "Interface",
@@ -14,8 +20,28 @@ __all__ = [
     "AzureNeuralVoiceManager",
     "MemoryChain",
     "OpenAIModelManager",
+    "AsyncOpenAIService",
     "OpenAIService",
     "SpeechRecognitionService",
     "SpeechSynthesisService",
     "NLP",
 ]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "Interface": "banterbot.extensions.interface",
+        "TKInterface": "banterbot.gui.tk_interface",
+        "AzureNeuralVoiceManager": "banterbot.managers.azure_neural_voice_manager",
+        "MemoryChain": "banterbot.managers.memory_chain",
+        "OpenAIModelManager": "banterbot.managers.openai_model_manager",
+        "AsyncOpenAIService": "banterbot.services.async_openai_service",
+        "OpenAIService": "banterbot.services.openai_service",
+        "SpeechRecognitionService": "banterbot.services.speech_recognition_service",
+        "SpeechSynthesisService": "banterbot.services.speech_synthesis_service",
+        "NLP": "banterbot.utils.nlp",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
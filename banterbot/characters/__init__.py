@@ -1,10 +1,32 @@
-from banterbot.characters.android import run as android
-from banterbot.characters.bartender import run as bartender
-from banterbot.characters.chef import run as chef
-from banterbot.characters.historian import run as historian
-from banterbot.characters.quiz import run as quiz
-from banterbot.characters.teacher_french import run as teacher_french
-from banterbot.characters.teacher_mandarin import run as teacher_mandarin
-from banterbot.characters.therapist import run as therapist
+from typing import TYPE_CHECKING
+
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.characters.android import run as android
+    from banterbot.characters.bartender import run as bartender
+    from banterbot.characters.chef import run as chef
+    from banterbot.characters.historian import run as historian
+    from banterbot.characters.quiz import run as quiz
+    from banterbot.characters.teacher_french import run as teacher_french
+    from banterbot.characters.teacher_mandarin import run as teacher_mandarin
+    from banterbot.characters.therapist import run as therapist
 
 __all__ = ["android", "bartender", "chef", "historian", "quiz", "teacher_french", "teacher_mandarin", "therapist"]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "android": "banterbot.characters.android:run",
+        "bartender": "banterbot.characters.bartender:run",
+        "chef": "banterbot.characters.chef:run",
+        "historian": "banterbot.characters.historian:run",
+        "quiz": "banterbot.characters.quiz:run",
+        "teacher_french": "banterbot.characters.teacher_french:run",
+        "teacher_mandarin": "banterbot.characters.teacher_mandarin:run",
+        "therapist": "banterbot.characters.therapist:run",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
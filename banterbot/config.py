@@ -1,14 +1,23 @@
 import datetime
 import logging
+from typing import Optional
 
 import uuid6
 
 # Maximum number of retries in calls to the OpenAI API
 RETRY_LIMIT = 3
 
-# The number of seconds to wait if the OpenAI API raises a RateLimitError
+# The maximum number of seconds to wait between retries if the OpenAI API raises a RateLimitError or an APIError
 RETRY_TIME = 60
 
+# The initial number of seconds to wait between retries, doubled on each subsequent attempt (with random jitter)
+RETRY_BACKOFF_BASE = 0.5
+
+# The default request and token limits per minute shared by all OpenAI ChatCompletion requests in the process; these
+# are updated automatically from the `x-ratelimit-*` headers returned by the OpenAI API
+RATE_LIMIT_REQUESTS_PER_MINUTE = 500
+RATE_LIMIT_TOKENS_PER_MINUTE = 150000
+
 # The default seed to use in all random generation
 SEED = 1337
 
@@ -30,3 +39,124 @@ PHRASE_DELIM = [",", ".", "?", "!", ":", ";", "|", "\n", "\t", "\r\n"]
 
 # The amount of time that should be added to a "soft interruption" as defined in class `SpeechRecognitionService`.
 INTERRUPTION_DELAY: datetime.timedelta = datetime.timedelta(seconds=1.0)
+
+# Define the characters that can mark the end of a sentence. During incremental sentence segmentation of a stream, the
+# spaCy model is only invoked when at least one of these characters is pending in the buffer.
+SENTENCE_DELIM = [".", "?", "!", "…", ";", ":", "\n", "。", "？", "！"]
+
+# The number of words that must follow a potential sentence boundary before it is considered resolved by the segmenter.
+SEGMENTATION_LOOKAHEAD = 8
+
+# The default backend of sentence segmentation: "spacy" for the spaCy `senter` pipeline, or "rules" for the faster
+# rule-based segmenter that needs no model (see enum `SegmentationBackend`).
+SEGMENTATION_BACKEND = "spacy"
+
+# The default number of strings processed together by the batched methods of class `NLP` (e.g., `tokenize`).
+NLP_BATCH_SIZE = 256
+
+# The default number of worker processes of the batched methods of class `NLP`; 1 to process in the calling process, or
+# -1 for one per CPU.
+NLP_N_PROCESS = 1
+
+# Whether the results of sentence/word segmentation and keyword extraction by class `NLP` are memoized by default.
+NLP_CACHE_ENABLED = True
+
+# The maximum approximate number of bytes held by the memoized results of class `NLP`.
+NLP_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# The number of word vectors normalized at once when exporting a `KeywordVectorStore` from a spaCy model.
+KEYWORD_VECTOR_EXPORT_CHUNK = 65536
+
+# Abbreviations (lowercase, without their final period) after which a period does not end a sentence in the rule-based
+# segmenter. Abbreviations that commonly end sentences, such as "etc.", are deliberately left out.
+SENTENCE_ABBREVIATIONS = [
+    "approx",
+    "capt",
+    "cf",
+    "col",
+    "dr",
+    "e.g",
+    "gen",
+    "gov",
+    "i.e",
+    "lt",
+    "messrs",
+    "mr",
+    "mrs",
+    "ms",
+    "mt",
+    "prof",
+    "rep",
+    "rev",
+    "sen",
+    "sgt",
+    "st",
+    "vs",
+]
+
+# The maximum number of responses kept in the in-memory tier of a `ResponseCache`.
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# The maximum number of responses kept in the on-disk tier of a `ResponseCache`.
+RESPONSE_CACHE_MAX_DISK_ENTRIES = 16384
+
+# The number of seconds after which a cached response expires (None for no expiry).
+RESPONSE_CACHE_TTL: Optional[float] = 7 * 24 * 3600
+
+# The fraction of a model's maximum number of tokens that the conversation context sent in each request may occupy.
+CONTEXT_WINDOW_FRACTION = 0.75
+
+# The HTTP connection pool settings of the OpenAI API clients: connections are kept alive between requests so that only
+# the first request to the API pays for DNS resolution and the TCP/TLS handshakes.
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 120.0
+
+# The number of seconds to wait when connecting to, or reading from the OpenAI API before a request fails.
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 60.0
+
+# Whether HTTP/2 should be used by the OpenAI API clients (requires the optional `h2` package).
+HTTP2 = False
+
+# The number of connections that are opened in advance by `OpenAIService.warmup`.
+WARMUP_CONNECTIONS = 2
+
+# The default maximum number of requests that `OpenAIService.prompt_many` keeps in flight at once.
+PROMPT_MANY_MAX_CONCURRENCY = 8
+
+# The upper bounds, in seconds, of the buckets of the histogram of gaps between consecutive chunks in `StreamStats`.
+STREAM_STATS_GAP_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+
+# The maximum number of gaps between consecutive chunks sampled by `StreamStats` for the computation of percentiles.
+STREAM_STATS_GAP_SAMPLES = 256
+
+# The number of most recent streams retained by a `StreamStatsAggregator` for the computation of percentiles.
+STREAM_STATS_WINDOW = 1000
+
+# The number of seconds a partial speech-to-text transcript must remain unchanged before a speculative response to it is
+# requested from the OpenAI API, and the minimum number of words it must contain.
+SPECULATION_STABLE_TIME = 0.4
+SPECULATION_MIN_WORDS = 3
+
+# The maximum number of seconds the end of a voice turn waits for a speculative request of the same words that is still
+# being sent, before requesting the response anew.
+SPECULATION_RESOLVE_TIMEOUT = 2.0
+
+# Whether instances of `StreamManager` run their streams on shared worker pools rather than on dedicated threads by
+# default, and the maximum number of workers consuming the iterables (producers) and processing their items.
+STREAM_MANAGER_POOLED = False
+STREAM_PRODUCER_WORKERS = 32
+STREAM_PROCESSOR_WORKERS = 32
+
+# The number of processed entries each stream log retains for debugging; older entries are released from memory.
+STREAM_LOG_RETAIN = 0
+
+# The maximum number of items buffered between two consecutive stages of a `StreamPipeline`, or zero for no limit.
+STREAM_PIPELINE_QUEUE_MAXSIZE = 2
+
+# The number of seconds between two samples of the gauges of the active streams by a `StreamGaugeSampler`.
+STREAM_GAUGE_INTERVAL = 0.1
+
+# The maximum number of synthesized words buffered for the consumer of `SpeechSynthesisService`, or zero for no limit.
+SPEECH_SYNTHESIS_QUEUE_MAXSIZE = 0
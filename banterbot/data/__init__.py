@@ -1,4 +1,4 @@
-from banterbot.data.enums import ChatCompletionRoles, EnvVar, Prosody, SpaCyLangModel
+from banterbot.data.enums import ChatCompletionRoles, EnvVar, Prosody, SegmentationBackend, SpaCyLangModel
 from banterbot.data.prompts import (
     Greetings,
     OptionPredictorPrompts,
@@ -18,5 +18,6 @@ __all__ = [
     "ChatCompletionRoles",
     "EnvVar",
     "Prosody",
+    "SegmentationBackend",
     "SpaCyLangModel",
 ]
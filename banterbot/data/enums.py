@@ -34,6 +34,26 @@ class SpaCyLangModel(Enum):
     EN_CORE_WEB_LG = "en_core_web_lg"
 
 
+class SegmentationBackend(Enum):
+    """
+    Backends of sentence segmentation in method `NLP.segment_sentences`: the spaCy `senter` pipeline, or the rule-based
+    segmenter of class `RuleSentenceSegmenter`, which needs no model.
+    """
+
+    SPACY = "spacy"
+    RULES = "rules"
+
+
+class StreamRecordingKind(Enum):
+    """
+    Kinds of streams that can be recorded by class `StreamRecorder` and replayed by class `StreamReplay`.
+    """
+
+    OPENAI = "openai"
+    SPEECH_RECOGNITION = "speech_recognition"
+    WORD_BOUNDARY = "word_boundary"
+
+
 class Prosody:
     """
     Prosody specifications for Azure Speech API SSML.
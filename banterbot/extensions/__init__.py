@@ -1,6 +1,26 @@
-from banterbot.extensions.interface import Interface
-from banterbot.extensions.option_selector import OptionSelector
-from banterbot.extensions.persona import Persona
-from banterbot.extensions.prosody_selector import ProsodySelector
+from typing import TYPE_CHECKING
 
-__all__ = ["Interface", "OptionSelector", "Persona", "ProsodySelector"]
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.extensions.interface import Interface
+    from banterbot.extensions.option_selector import OptionSelector
+    from banterbot.extensions.persona import Persona
+    from banterbot.extensions.prosody_selector import ProsodySelector
+    from banterbot.extensions.speculator import Speculator
+
+__all__ = ["Interface", "OptionSelector", "Persona", "ProsodySelector", "Speculator"]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "Interface": "banterbot.extensions.interface",
+        "OptionSelector": "banterbot.extensions.option_selector",
+        "Persona": "banterbot.extensions.persona",
+        "ProsodySelector": "banterbot.extensions.prosody_selector",
+        "Speculator": "banterbot.extensions.speculator",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
@@ -1,23 +1,33 @@
 import datetime
+import functools
 import logging
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Generator
 from typing import Optional, Union
 
 from banterbot import config
 from banterbot.data.enums import ChatCompletionRoles
 from banterbot.exceptions.format_mismatch_error import FormatMismatchError
 from banterbot.extensions.prosody_selector import ProsodySelector
+from banterbot.extensions.speculator import Speculator
+from banterbot.handlers.speech_synthesis_handler import SpeechSynthesisHandler
+from banterbot.handlers.stream_handler import StreamHandler
 from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
 from banterbot.managers.openai_model_manager import OpenAIModelManager
+from banterbot.managers.stream_pipeline import StreamPipeline
 from banterbot.models.azure_neural_voice_profile import AzureNeuralVoiceProfile
 from banterbot.models.message import Message
 from banterbot.models.openai_model import OpenAIModel
+from banterbot.models.phrase import Phrase
+from banterbot.models.word import Word
 from banterbot.paths import chat_logs
 from banterbot.services.openai_service import OpenAIService
 from banterbot.services.speech_recognition_service import SpeechRecognitionService
 from banterbot.services.speech_synthesis_service import SpeechSynthesisService
+from banterbot.utils.context_window import ContextWindow
+from banterbot.utils.response_cache import ResponseCache
 from banterbot.utils.thread_queue import ThreadQueue
 
 
@@ -37,6 +47,8 @@ class Interface(ABC):
         tone_model: OpenAIModel = None,
         phrase_list: Optional[list[str]] = None,
         assistant_name: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        speculative: bool = False,
     ) -> None:
         """
         Initialize the Interface with the specified model and voice.
@@ -49,6 +61,8 @@ class Interface(ABC):
             tone_model (OpenAIModel): The OpenAI ChatCompletion model to use for tone evaluation.
             phrase_list (list[str], optional): Optionally provide the recognizer with context to improve recognition.
             assistant_name (str, optional): Optionally provide a name for the character.
+            response_cache (ResponseCache, optional): Optionally cache the deterministic prosody selection responses.
+            speculative (bool): If True, responses to voice input are requested speculatively from partial transcripts.
         """
         logging.debug(f"Interface initialized")
 
@@ -61,14 +75,19 @@ class Interface(ABC):
 
         # Initialize OpenAI ChatCompletion, Azure Speech-to-Text, and Azure Text-to-Speech components
         self._openai_service = OpenAIService(model=model)
-        self._openai_service_tone = OpenAIService(model=tone_model)
+        self._openai_service_tone = OpenAIService(model=tone_model, cache=response_cache)
         self._speech_recognition_service = SpeechRecognitionService(languages=languages, phrase_list=phrase_list)
         self._speech_synthesis_service = SpeechSynthesisService()
 
+        # Open connections to the OpenAI API in the background, so that the first response is not delayed by them.
+        self._warmup_thread = threading.Thread(target=self._openai_service.warmup, daemon=True)
+        self._warmup_thread.start()
+
         # Initialize message handling and conversation attributes
-        self._messages: list[Message] = []
+        self._messages = ContextWindow(model=self._model)
         self._log_lock = threading.Lock()
         self._log_path = chat_logs / f"chat_{datetime.datetime.now().strftime('%Y%m%dT%H%M%S')}.txt"
+        chat_logs.mkdir(parents=True, exist_ok=True)
         self._listening_toggle = False
         self._listening_active_lock = threading.Lock()
         self._listening_inactive_lock = threading.Lock()
@@ -85,6 +104,12 @@ class Interface(ABC):
             voice=self._voice,
         )
 
+        # Initialize the Speculator, if responses to voice input should be requested from partial transcripts.
+        self._speculator = Speculator(openai_service=self._openai_service) if speculative else None
+
+        # The handler of the pipeline of the response being spoken, if any.
+        self._response_handler: Optional[StreamHandler] = None
+
         # Initialize the interruption flag, set to zero.
         self._interrupt = 0
 
@@ -92,7 +117,7 @@ class Interface(ABC):
         self._system = system
         if self._system is not None:
             message = Message(role=ChatCompletionRoles.SYSTEM, content=system)
-            self._messages.append(message)
+            self._messages.append(message, pinned=True)
 
         # Initialize the subclass GUI
         self._init_gui()
@@ -111,6 +136,8 @@ class Interface(ABC):
         self._openai_service_tone.interrupt(kill=True)
         self._speech_recognition_service.interrupt()
         self._speech_synthesis_service.interrupt()
+        if self._response_handler is not None:
+            self._response_handler.interrupt(kill=True)
 
     def listener_activate(self, name: Optional[str] = None) -> None:
         """
@@ -160,9 +187,7 @@ class Interface(ABC):
             # Record the time at which the message was initialized in order to account for future interruptions.
             init_time = time.perf_counter_ns()
             self.send_message(message, ChatCompletionRoles.USER, name)
-            self._thread_queue.add_task(
-                threading.Thread(target=self.respond, kwargs={"init_time": init_time}, daemon=True)
-            )
+            self._thread_queue.add_task(functools.partial(self.respond, init_time=init_time))
 
     def send_message(
         self,
@@ -199,9 +224,7 @@ class Interface(ABC):
             # Record the time at which the message was initialized in order to account for future interruptions.
             init_time = time.perf_counter_ns()
             self.send_message(message, ChatCompletionRoles.USER, None, True)
-            self._thread_queue.add_task(
-                threading.Thread(target=self.respond, kwargs={"init_time": init_time}, daemon=True)
-            )
+            self._thread_queue.add_task(functools.partial(self.respond, init_time=init_time))
 
     @abstractmethod
     def update_conversation_area(self, word: str) -> None:
@@ -242,27 +265,77 @@ class Interface(ABC):
             with open(self._log_path, "a+", encoding=config.ENCODING) as fs:
                 fs.write(word)
 
-    def respond(self, init_time: int) -> None:
+    @property
+    def speculation_stats(self) -> Optional[dict[str, float]]:
+        """
+        The hit rate and latency saved by speculative responses to voice input (see class `Speculator`).
+
+        Returns:
+            Optional[dict[str, float]]: The speculation statistics, or None if speculation is disabled.
+        """
+        return None if self._speculator is None else self._speculator.stats
+
+    def respond(self, init_time: int, handler: Optional[StreamHandler] = None) -> None:
         """
         Get a response from the bot and update the conversation area with the response. This method handles generating
         the bot's response using the OpenAIService and updating the conversation area with the response text using
-        text-to-speech synthesis.
+        text-to-speech synthesis. The sentence blocks of the response go through a `StreamPipeline` (prosody selection,
+        conversion to SSML, and synthesis), so that each block is prepared while the previous one is being spoken.
+
+        Args:
+            init_time (int): The time at which the response was initialized.
+            handler (Optional[StreamHandler]): A stream that was already requested for the response (speculatively).
         """
         content = ""
-        context = []
+
+        # The sentences already sent to the prosody selector, which provide context for the following ones.
+        selected = []
 
         # Add the name of the assistant to the conversation area.
         self.update_conversation_area(f"{self._assistant_name}:")
 
         # Initialize the generator for asynchronous yielding of sentence blocks
-        for block in self._openai_service.prompt_stream(messages=self._messages, init_time=init_time):
-            phrases, context = self._prosody_selector.select(sentences=block, context=content, system=self._system)
+        if handler is None:
+            handler = self._openai_service.prompt_stream(messages=self._messages, init_time=init_time)
+
+        # No stream is returned if it was interrupted before it started, in which case there is nothing to respond.
+        if not isinstance(handler, StreamHandler):
+            self.update_conversation_area("\n\n")
+            return
+
+        def merge_blocks(blocks: list[list[str]]) -> list[str]:
+            # Merge the sentence blocks that piled up while the prosody of the previous ones was being selected.
+            return [sentence for block in blocks for sentence in block]
+
+        def select_prosody(block: list[str]) -> list[Phrase]:
+            phrases, _ = self._prosody_selector.select(sentences=block, context=" ".join(selected), system=self._system)
             if phrases is None:
                 raise FormatMismatchError()
+            selected.extend(block)
+            return phrases
+
+        def synthesize(ssml: str) -> Generator[Word, None, None]:
+            yield from self._speech_synthesis_service.synthesize(phrases=ssml, init_time=init_time)
+
+        # Run the stages concurrently, so that the prosody of the next block is selected while this one is spoken.
+        pipeline = (
+            StreamPipeline()
+            .add_stage(merge_blocks, batch=True)
+            .add_stage(select_prosody)
+            .add_stage(SpeechSynthesisHandler.phrases_to_ssml)
+            .add_stage(synthesize)
+        )
+        response_handler = pipeline.run(iterable=handler, close_stream=lambda: handler.interrupt(kill=True))
+        self._response_handler = response_handler
 
-            for item in self._speech_synthesis_service.synthesize(phrases=phrases, init_time=init_time):
+        try:
+            for item in response_handler:
                 self.update_conversation_area(item.text)
                 content += item.text
+        finally:
+            # Release the finished pipeline, unless a newer response has already replaced it.
+            if self._response_handler is response_handler:
+                self._response_handler = None
 
         if self._interrupt < init_time and content.strip():
             message = Message(role=ChatCompletionRoles.ASSISTANT, content=content.strip())
@@ -281,26 +354,38 @@ class Interface(ABC):
         # Flag is set to True if a new user input is detected.
         input_detected = False
 
+        # The sentences recognized so far, which precede the partial transcript of the utterance being recognized.
+        sentences = []
+
+        # Speculatively request responses to the partial transcripts, if enabled.
+        if self._speculator is not None:
+            self._speculator.start(context=self._messages.messages, init_time=init_time, name=name)
+            self._speech_recognition_service.connect_recognizing_handler(
+                lambda partial: self._speculator.update(" ".join(sentences + [partial]))
+            )
+
         # Listen for user input using speech-to-text
         for item in self._speech_recognition_service.recognize(init_time=init_time):
             # Do not send the message if it is empty.
             if sentence := item.value.display.strip():
                 # Set the flag to True since a new user input was detected.
                 input_detected = True
+                sentences.append(sentence)
+                if self._speculator is not None:
+                    self._speculator.update(" ".join(sentences))
 
                 # Send the transcribed message to the bot
-                message_thread = threading.Thread(
-                    target=self.send_message,
-                    args=(
-                        sentence,
-                        ChatCompletionRoles.USER,
-                        name,
-                    ),
-                    daemon=True,
+                self._thread_queue.add_task(
+                    functools.partial(self.send_message, sentence, ChatCompletionRoles.USER, name), unskippable=True
                 )
-                self._thread_queue.add_task(message_thread, unskippable=True)
+
+        handler = None
+        if self._speculator is not None:
+            self._speech_recognition_service.connect_recognizing_handler(None)
+            if input_detected:
+                handler = self._speculator.resolve(" ".join(sentences))
+            else:
+                self._speculator.cancel()
 
         if input_detected:
-            self._thread_queue.add_task(
-                threading.Thread(target=self.respond, kwargs={"init_time": init_time}, daemon=True)
-            )
+            self._thread_queue.add_task(functools.partial(self.respond, init_time=init_time, handler=handler))
@@ -1,10 +1,12 @@
 import logging
+from typing import Optional
 
 from banterbot.data.enums import ChatCompletionRoles
 from banterbot.data.prompts import OptionSelectorPrompts
 from banterbot.models.message import Message
 from banterbot.models.openai_model import OpenAIModel
 from banterbot.services.openai_service import OpenAIService
+from banterbot.utils.response_cache import ResponseCache
 
 
 class OptionSelector:
@@ -34,7 +36,9 @@ class OptionSelector:
     response.
     """
 
-    def __init__(self, model: OpenAIModel, options: list[str], system: str, prompt: str):
+    def __init__(
+        self, model: OpenAIModel, options: list[str], system: str, prompt: str, cache: Optional[ResponseCache] = None
+    ):
         """
         Initialize the OptionSelector with the specified model, options, system message, prompt, and optional seed.
 
@@ -43,13 +47,14 @@ class OptionSelector:
             options (list[str]): A list of strings representing the options to be evaluated.
             system (str): The initial system message that sets the context for the OptionSelector's task.
             prompt (str): The prompt that provides a guideline for the evaluation.
+            cache (Optional[ResponseCache]): An optional cache for repeated selections given the same context.
         """
         logging.debug(f"OptionSelector initialized")
         self._options = options
         self._system = system
         self._prompt = prompt
 
-        self._openai_manager = OpenAIService(model=model)
+        self._openai_manager = OpenAIService(model=model, cache=cache)
         self._system_processed = self._init_system_prompt()
 
     def select(self, messages: list[Message]) -> str:
@@ -0,0 +1,272 @@
+import logging
+import re
+import threading
+import time
+from typing import Optional
+
+from banterbot.config import SPECULATION_MIN_WORDS, SPECULATION_RESOLVE_TIMEOUT, SPECULATION_STABLE_TIME
+from banterbot.data.enums import ChatCompletionRoles
+from banterbot.handlers.stream_handler import StreamHandler
+from banterbot.models.message import Message
+from banterbot.services.openai_service import OpenAIService
+
+
+class Speculator:
+    """
+    Starts OpenAI ChatCompletion streams speculatively from partial speech-to-text transcripts, so that most of the
+    round trip to the API overlaps with the user still speaking.
+
+    Whenever the partial transcript of a voice turn has remained unchanged for `stable_time` seconds, a stream is
+    requested for it; the chunks of the response are buffered by its `StreamHandler` until it is iterated over. Once the
+    final transcript is known, the speculative stream is kept if it was requested for the same words (ignoring case and
+    punctuation, which partial transcripts lack), and interrupted otherwise. A stream that no longer matches the partial
+    transcript is interrupted as soon as the transcript changes, so that at most one speculation is in flight.
+
+    Since a request only returns its stream once the response headers have arrived, the turn may end while a matching
+    speculation is still being requested: the final transcript then waits for it (up to `resolve_timeout` seconds)
+    rather than requesting the same response twice. Each turn is numbered, so that a request that returns after the end
+    of its turn is interrupted instead of being kept.
+    """
+
+    # Compile a regex pattern that matches anything but words, used to normalize transcripts before comparison.
+    _normalize_pattern = re.compile(r"[^\w]+")
+
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        stable_time: float = SPECULATION_STABLE_TIME,
+        min_words: int = SPECULATION_MIN_WORDS,
+        resolve_timeout: float = SPECULATION_RESOLVE_TIMEOUT,
+    ) -> None:
+        """
+        Initializes a `Speculator` instance.
+
+        Args:
+            openai_service (OpenAIService): The service used to request the speculative streams.
+            stable_time (float): The number of seconds a partial transcript must remain unchanged before speculating.
+            min_words (int): The minimum number of words a partial transcript must contain before speculating.
+            resolve_timeout (float): The maximum number of seconds method `resolve` waits for a matching speculation
+            that is still being requested.
+        """
+        logging.debug(f"Speculator initialized")
+        self._openai_service = openai_service
+        self._stable_time = stable_time
+        self._min_words = min_words
+        self._resolve_timeout = resolve_timeout
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+
+        # The state of the current turn: whether it is in progress, and the number of the turn (which identifies it).
+        self._active = False
+        self._turn = 0
+        self._context: list[Message] = []
+        self._name: Optional[str] = None
+        self._init_time = 0
+        self._transcript = ""
+        self._timer: Optional[threading.Timer] = None
+
+        # The speculative stream in flight, its normalized transcript, and the time at which it was requested.
+        self._handler: Optional[StreamHandler] = None
+        self._speculated = ""
+        self._speculation_time = 0
+
+        # The normalized transcript of the speculative request being sent, if any, and the number of that request.
+        self._pending: Optional[str] = None
+        self._requests = 0
+
+        self._speculations = 0
+        self._hits = 0
+        self._misses = 0
+        self._saved = 0
+
+    def start(self, context: list[Message], init_time: int, name: Optional[str] = None) -> None:
+        """
+        Begins a new voice turn, discarding any speculation from the previous one.
+
+        Args:
+            context (list[Message]): The messages of the conversation preceding the turn.
+            init_time (int): The time at which the turn was initialized, used for interruptions.
+            name (Optional[str]): The name of the user speaking.
+        """
+        with self._lock:
+            self._cancel()
+            self._active = True
+            self._turn += 1
+            self._context = list(context)
+            self._name = name
+            self._init_time = init_time
+            self._transcript = ""
+
+    def update(self, transcript: str) -> None:
+        """
+        Updates the partial transcript of the current turn, (re)starting the countdown to a speculation if it changed.
+
+        Args:
+            transcript (str): The transcript of everything the user has said so far during the turn.
+        """
+        normalized = self._normalize(transcript)
+        with self._lock:
+            if normalized == self._normalize(self._transcript):
+                return
+            self._transcript = transcript
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if self._handler is not None and self._speculated != normalized:
+                self._interrupt_handler()
+
+            if len(normalized.split()) >= self._min_words:
+                self._timer = threading.Timer(self._stable_time, self._speculate, args=(transcript,))
+                self._timer.daemon = True
+                self._timer.start()
+
+    def resolve(self, transcript: str) -> Optional[StreamHandler]:
+        """
+        Ends the current turn with its final transcript, waiting for a speculation of the same words if it is still
+        being requested.
+
+        Args:
+            transcript (str): The final transcript of the turn.
+
+        Returns:
+            Optional[StreamHandler]: The speculative stream if it was requested for the final transcript, or None if
+            there is none (in which case a new stream should be requested as usual).
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            self._transcript = transcript
+            normalized = self._normalize(transcript)
+            self._condition.wait_for(lambda: self._pending != normalized, timeout=self._resolve_timeout)
+
+            # End the turn, so that any request still being sent is interrupted once it returns.
+            self._active = False
+
+            if self._handler is not None and self._speculated == normalized:
+                handler = self._handler
+                self._handler = None
+                self._hits += 1
+                self._saved += time.perf_counter_ns() - self._speculation_time
+                logging.debug(f"Speculator hit: `{transcript}`")
+                return handler
+
+            self._misses += 1
+            self._interrupt_handler()
+            logging.debug(f"Speculator miss: `{transcript}`")
+            return None
+
+    def cancel(self) -> None:
+        """
+        Ends the current turn without a final transcript, interrupting any speculation in flight.
+        """
+        with self._lock:
+            self._cancel()
+            self._active = False
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """
+        The number of speculative streams requested, the number of turns for which one was kept (hits) or not (misses),
+        the hit rate, and the total and mean head start in seconds that the kept streams had over a regular request.
+
+        Returns:
+            dict[str, float]: The speculation statistics.
+        """
+        with self._lock:
+            turns = self._hits + self._misses
+            return {
+                "speculations": self._speculations,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / turns if turns else 0.0,
+                "saved": self._saved / 1e9,
+                "mean_saved": self._saved / 1e9 / self._hits if self._hits else 0.0,
+            }
+
+    def _speculate(self, transcript: str) -> None:
+        """
+        Requests a speculative stream for a partial transcript that has remained stable. Called by the countdown timer.
+
+        Args:
+            transcript (str): The stable partial transcript.
+        """
+        with self._lock:
+            if not self._active or transcript != self._transcript:
+                return
+            self._interrupt_handler()
+            messages = self._context + [Message(role=ChatCompletionRoles.USER, name=self._name, content=transcript)]
+            init_time = self._init_time
+            turn = self._turn
+            self._requests += 1
+            request = self._requests
+            self._pending = self._normalize(transcript)
+            self._speculations += 1
+
+        logging.debug(f"Speculator requesting a response to `{transcript}`")
+        speculation_time = time.perf_counter_ns()
+        handler = None
+        try:
+            handler = self._openai_service.prompt_stream(messages=messages, init_time=init_time)
+        finally:
+            with self._lock:
+                if isinstance(handler, StreamHandler):
+                    self._keep(handler=handler, transcript=transcript, turn=turn, speculation_time=speculation_time)
+                if self._requests == request:
+                    self._pending = None
+                self._condition.notify_all()
+
+    def _keep(self, handler: StreamHandler, transcript: str, turn: int, speculation_time: int) -> None:
+        """
+        Keeps the stream of a speculative request as the speculation of the current turn, or interrupts it if its turn
+        has ended or its transcript no longer matches. Must be called with the lock held.
+
+        Args:
+            handler (StreamHandler): The stream of the request.
+            transcript (str): The partial transcript for which the request was sent.
+            turn (int): The turn during which the request was sent.
+            speculation_time (int): The time at which the request was sent.
+        """
+        # Discard the stream if the turn ended, or the transcript changed, while the request was being sent.
+        normalized = self._normalize(transcript)
+        ended = not self._active or turn != self._turn
+        if ended or self._handler is not None or normalized != self._normalize(self._transcript):
+            handler.interrupt(kill=True)
+        else:
+            self._handler = handler
+            self._speculated = normalized
+            self._speculation_time = speculation_time
+
+    def _cancel(self) -> None:
+        """
+        Stops the countdown and interrupts any speculation in flight. Must be called with the lock held.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._interrupt_handler()
+
+    def _interrupt_handler(self) -> None:
+        """
+        Interrupts the speculative stream in flight, if any. Must be called with the lock held.
+        """
+        if self._handler is not None:
+            self._handler.interrupt(kill=True)
+            self._handler = None
+            self._speculated = ""
+
+    @classmethod
+    def _normalize(cls, transcript: str) -> str:
+        """
+        Normalizes a transcript for comparison, ignoring case, punctuation, and whitespace.
+
+        Args:
+            transcript (str): The transcript.
+
+        Returns:
+            str: The normalized transcript.
+        """
+        return cls._normalize_pattern.sub(" ", transcript.lower()).strip()
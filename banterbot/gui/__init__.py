@@ -1,3 +1,18 @@
-from banterbot.gui.tk_interface import TKInterface
+from typing import TYPE_CHECKING
+
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.gui.tk_interface import TKInterface
 
 __all__ = ["TKInterface"]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "TKInterface": "banterbot.gui.tk_interface",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
@@ -3,19 +3,18 @@ import logging
 import textwrap
 
 from banterbot import characters
-from banterbot.gui.tk_interface import TKInterface
 from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
 from banterbot.managers.openai_model_manager import OpenAIModelManager
 
 character_choices = {
-    "android": (characters.android, "Marvin the Paranoid Android"),
-    "bartender": (characters.bartender, "Sagehoof the Centaur Mixologist"),
-    "chef": (characters.chef, "Boyardine the Angry Chef"),
-    "historian": (characters.historian, "Blabberlore the Gnome Historian"),
-    "quiz": (characters.quiz, "Grondle the Quiz Troll"),
-    "teacher-french": (characters.teacher_french, "Henri the French Teacher"),
-    "teacher-mandarin": (characters.teacher_mandarin, "Chen Lao Shi the Mandarin Chinese Teacher"),
-    "therapist": (characters.therapist, "Grendel the Therapy Troll"),
+    "android": ("android", "Marvin the Paranoid Android"),
+    "bartender": ("bartender", "Sagehoof the Centaur Mixologist"),
+    "chef": ("chef", "Boyardine the Angry Chef"),
+    "historian": ("historian", "Blabberlore the Gnome Historian"),
+    "quiz": ("quiz", "Grondle the Quiz Troll"),
+    "teacher-french": ("teacher_french", "Henri the French Teacher"),
+    "teacher-mandarin": ("teacher_mandarin", "Chen Lao Shi the Mandarin Chinese Teacher"),
+    "therapist": ("therapist", "Grendel the Therapy Troll"),
 }
 
 
@@ -52,7 +51,7 @@ def init_parser(subparser) -> None:
         "--model",
         choices=OpenAIModelManager.list(),
         action=ModelChoice,
-        default=OpenAIModelManager.load("gpt-4o"),
+        default=None,
         dest="model",
         help="Select the OpenAI model the bot should use.",
     )
@@ -60,7 +59,7 @@ def init_parser(subparser) -> None:
     subparser.add_argument(
         "--voice",
         action=VoiceChoice,
-        default=AzureNeuralVoiceManager.load("aria"),
+        default=None,
         dest="voice",
         help="Select a Microsoft Azure Cognitive Services text-to-speech voice.",
     )
@@ -79,6 +78,13 @@ def init_parser(subparser) -> None:
         help="Greet the user on initialization.",
     )
 
+    subparser.add_argument(
+        "--speculative",
+        action="store_true",
+        dest="speculative",
+        help="Request responses to voice input speculatively from partial transcripts, reducing response latency.",
+    )
+
     subparser.add_argument(
         "--name",
         action="store",
@@ -159,11 +165,15 @@ def init_subparser_voice_search(subparser) -> None:
 
 
 def exec_main(args) -> None:
+    # Imported here rather than at the top, so that the other commands do not have to import tkinter and spaCy.
+    from banterbot.gui.tk_interface import TKInterface
+
     kwargs = {
-        "model": args.model,
-        "voice": args.voice,
+        "model": OpenAIModelManager.load("gpt-4o") if args.model is None else args.model,
+        "voice": AzureNeuralVoiceManager.load("aria") if args.voice is None else args.voice,
         "system": args.prompt,
         "assistant_name": args.name,
+        "speculative": args.speculative,
     }
 
     if args.debug:
@@ -175,7 +185,8 @@ def exec_main(args) -> None:
 
 def exec_character(args) -> None:
     character = args.character.lower().strip()
-    character_choices[character][0]()
+    # The characters are only imported once selected, since each of them imports the whole GUI.
+    getattr(characters, character_choices[character][0])()
 
 
 def exec_voice_search(args) -> None:
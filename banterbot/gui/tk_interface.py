@@ -1,3 +1,4 @@
+import functools
 import logging
 import threading
 import time
@@ -10,6 +11,7 @@ from banterbot.data.prompts import Greetings
 from banterbot.extensions.interface import Interface
 from banterbot.models.azure_neural_voice_profile import AzureNeuralVoiceProfile
 from banterbot.models.openai_model import OpenAIModel
+from banterbot.utils.response_cache import ResponseCache
 
 
 class TKInterface(tk.Tk, Interface):
@@ -31,6 +33,8 @@ class TKInterface(tk.Tk, Interface):
         system: Optional[str] = None,
         phrase_list: Optional[list[str]] = None,
         assistant_name: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        speculative: bool = False,
     ) -> None:
         """
         Initialize the TKInterface class, which inherits from both tkinter.Tk and Interface.
@@ -43,6 +47,8 @@ class TKInterface(tk.Tk, Interface):
             system (Optional[str]): An initialization prompt that can be used to set the scene.
             phrase_list(list[str], optional): Optionally provide the recognizer with context to improve recognition.
             assistant_name (str, optional): Optionally provide a name for the character.
+            response_cache (ResponseCache, optional): Optionally cache the deterministic prosody selection responses.
+            speculative (bool): If True, responses to voice input are requested speculatively from partial transcripts.
         """
         logging.debug(f"TKInterface initialized")
 
@@ -56,6 +62,8 @@ class TKInterface(tk.Tk, Interface):
             tone_model=tone_model,
             phrase_list=phrase_list,
             assistant_name=assistant_name,
+            response_cache=response_cache,
+            speculative=speculative,
         )
 
         # Bind the `_quit` method to program exit, in order to guarantee the stopping of all running threads.
@@ -80,9 +88,7 @@ class TKInterface(tk.Tk, Interface):
     def request_response(self) -> None:
         if self._messages:
             # Interrupt any currently active ChatCompletion, text-to-speech, or speech-to-text streams
-            self._thread_queue.add_task(
-                threading.Thread(target=self.respond, kwargs={"init_time": time.perf_counter_ns()}, daemon=True)
-            )
+            self._thread_queue.add_task(functools.partial(self.respond, init_time=time.perf_counter_ns()))
 
     def run(self, greet: bool = False) -> None:
         """
@@ -1,5 +1,22 @@
-from banterbot.handlers.speech_recognition_handler import SpeechRecognitionHandler
-from banterbot.handlers.speech_synthesis_handler import SpeechSynthesisHandler
-from banterbot.handlers.stream_handler import StreamHandler
+from typing import TYPE_CHECKING
+
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.handlers.speech_recognition_handler import SpeechRecognitionHandler
+    from banterbot.handlers.speech_synthesis_handler import SpeechSynthesisHandler
+    from banterbot.handlers.stream_handler import StreamHandler
 
 __all__ = ["SpeechRecognitionHandler", "SpeechSynthesisHandler", "StreamHandler"]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "SpeechRecognitionHandler": "banterbot.handlers.speech_recognition_handler",
+        "SpeechSynthesisHandler": "banterbot.handlers.speech_synthesis_handler",
+        "StreamHandler": "banterbot.handlers.stream_handler",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
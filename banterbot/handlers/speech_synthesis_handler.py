@@ -1,14 +1,16 @@
 import logging
 import threading
 import time
-from typing import Generator, Optional
+from typing import Generator, Optional, Union
 
 import azure.cognitiveservices.speech as speechsdk
 import numba as nb
 
+from banterbot.data.enums import StreamRecordingKind
 from banterbot.models.phrase import Phrase
 from banterbot.models.word import Word
 from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.stream_recorder import StreamRecorder
 
 
 class SpeechSynthesisHandler:
@@ -18,21 +20,31 @@ class SpeechSynthesisHandler:
     closed to stop the speech synthesis process.
     """
 
-    def __init__(self, phrases: list[Phrase], synthesizer: speechsdk.SpeechSynthesizer, queue: CloseableQueue) -> None:
+    def __init__(
+        self,
+        phrases: Union[list[Phrase], str],
+        synthesizer: speechsdk.SpeechSynthesizer,
+        queue: CloseableQueue,
+        recorder: Optional[StreamRecorder] = None,
+    ) -> None:
         """
         Initializes a `SpeechSynthesisHandler` instance.
 
         Args:
+            phrases (Union[list[Phrase], str]): The phrases to be synthesized, or an SSML string created from them in
+            advance (see method `phrases_to_ssml`).
             synthesizer (speechsdk.SpeechSynthesizer): The speech synthesizer to use for speech synthesis.
             queue (CloseableQueue): The queue to use for storing the words as they are synthesized.
+            recorder (Optional[StreamRecorder]): An optional recorder of the word boundary events.
         """
         self._synthesizer = synthesizer
         self._queue = queue
+        self._recorder = recorder
         self._iterating = False
         self._iterating_lock = threading.Lock()
 
-        # Convert the phrases into SSML
-        self._ssml = self._phrases_to_ssml(phrases)
+        # Convert the phrases into SSML, unless this was already done
+        self._ssml = phrases if isinstance(phrases, str) else self.phrases_to_ssml(phrases)
 
     def __iter__(self) -> Generator[Word, None, None]:
         """
@@ -57,7 +69,10 @@ class SpeechSynthesisHandler:
         logging.debug("SpeechSynthesisHandler synthesizer started")
 
         # Process the words as they are synthesized.
-        for item in self._queue:
+        items = self._queue
+        if self._recorder is not None:
+            items = self._recorder.record(self._queue, StreamRecordingKind.WORD_BOUNDARY)
+        for item in items:
             # Determine if a delay is needed to match the word's offset.
             dt = 1e-9 * (item["time"] - time.perf_counter_ns())
             # If a delay is needed, wait for the specified time.
@@ -151,7 +166,7 @@ class SpeechSynthesisHandler:
         return ssml
 
     @classmethod
-    def _phrases_to_ssml(cls, phrases: list[Phrase]) -> str:
+    def phrases_to_ssml(cls, phrases: list[Phrase]) -> str:
         """
         Creates a more advanced SSML string from the specified list of `Phrase` instances, that customizes the emphasis,
         style, pitch, and rate of speech on a sub-sentence level, including pitch contouring between phrases. Calls the
@@ -1,9 +1,14 @@
 import logging
 import threading
 import time
+from collections.abc import Callable
+from typing import Any, Optional, Union
 
 from banterbot.models.number import Number
+from banterbot.models.stream_state import StreamState
+from banterbot.models.stream_stats import StreamStats
 from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.stream_log import StreamLog
 
 
 class StreamHandler:
@@ -16,8 +21,11 @@ class StreamHandler:
         interrupt: Number,
         kill_event: threading.Event,
         queue: CloseableQueue,
-        processor_thread: threading.Thread,
-        shared_data: dict,
+        start: Callable[[], Any],
+        shared_data: Union[dict, StreamState],
+        stats: StreamStats,
+        on_interrupt: Optional[Callable[[], Any]] = None,
+        log: Optional[StreamLog] = None,
     ) -> None:
         """
         Initializes the stream handler with the given parameters. This should not be called directly, but rather
@@ -27,27 +35,76 @@ class StreamHandler:
             interrupt (Number): The shared interrupt value.
             kill_event (threading.Event): The shared kill event.
             queue (CloseableQueue): The shared queue.
-            processor_thread (threading.Thread): The shared processor thread.
-            shared_data (dict): The shared data.
+            start (Callable[[], Any]): Starts the processor, either as a thread or as a task in a worker pool.
+            shared_data (Union[dict, StreamState]): The shared data.
+            stats (StreamStats): The latency measurements of the stream.
+            on_interrupt (Optional[Callable[[], Any]]): Called on interruption, e.g., to close the stream's iterable.
+            log (Optional[StreamLog]): The log of the stream, if any, used to measure the lag of its processor.
         """
         self._interrupt = interrupt
         self._kill_event = kill_event
         self._queue = queue
         self._shared_data = shared_data
-        self._processor_thread = processor_thread
+        self._start = start
+        self._on_interrupt = on_interrupt
+        self._stats = stats
+        self._log = log
 
     def __iter__(self) -> CloseableQueue:
         """
         Inherits the `__iter__` method from the `CloseableQueue` class to allow for iteration over the stream handler.
         """
-        # Start the processor thread.
-        self._processor_thread.start()
+        # Start the processor.
+        self._start()
         # Prevent multiple iterations over the stream handler.¨
         logging.debug(f"StreamHandler iterating")
         # Return the queue for iteration as a generator.
         for item in self._queue:
             yield item
 
+    @property
+    def stats(self) -> StreamStats:
+        """
+        The latency measurements of the stream, which are updated while it is running.
+
+        Returns:
+            StreamStats: The latency measurements.
+        """
+        return self._stats
+
+    def gauges(self) -> dict[str, Optional[int]]:
+        """
+        Samples the live state of the stream, in order to tell whether its processor or its consumer is the bottleneck:
+        the number of entries logged from the iterable, the number of entries processed, the lag of the processor in
+        entries and in nanoseconds (the age of the oldest unprocessed entry), the number of outputs waiting in the queue
+        for the consumer, and the total time the consumer has spent waiting for outputs. The log-related gauges are None
+        if the stream has no log.
+
+        Returns:
+            dict[str, Optional[int]]: The gauges of the stream.
+        """
+        gauges = {
+            "log_length": None,
+            "processor_index": None,
+            "lag_entries": None,
+            "lag_ns": None,
+            "queue_depth": self._queue.qsize(),
+            "consumer_wait_ns": self._queue.wait_time,
+        }
+        if self._log is not None:
+            length = len(self._log)
+            index = self._log.cursor
+            gauges["log_length"] = length
+            gauges["processor_index"] = index
+            gauges["lag_entries"] = length - index
+            gauges["lag_ns"] = 0
+            if index < length:
+                try:
+                    gauges["lag_ns"] = time.perf_counter_ns() - self._log[index].timestamp
+                except IndexError:
+                    pass
+        return gauges
+
     def is_alive(self) -> bool:
         """
         Returns whether the stream handler is alive or not.
@@ -67,6 +124,8 @@ class StreamHandler:
         self._kill_event.set()
         self._interrupt.set(time.perf_counter_ns())
         self._shared_data["interrupt"] = self._interrupt.value
+        if self._on_interrupt is not None:
+            self._on_interrupt()
         logging.debug(f"StreamHandler interrupted")
 
         if kill:
@@ -1,7 +1,35 @@
-from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
-from banterbot.managers.memory_chain import MemoryChain
-from banterbot.managers.openai_model_manager import OpenAIModelManager
-from banterbot.managers.resource_manager import ResourceManager
-from banterbot.managers.stream_manager import StreamManager
+from typing import TYPE_CHECKING
 
-__all__ = ["AzureNeuralVoiceManager", "MemoryChain", "OpenAIModelManager", "ResourceManager", "StreamManager"]
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.managers.azure_neural_voice_manager import AzureNeuralVoiceManager
+    from banterbot.managers.memory_chain import MemoryChain
+    from banterbot.managers.openai_model_manager import OpenAIModelManager
+    from banterbot.managers.resource_manager import ResourceManager
+    from banterbot.managers.stream_manager import StreamManager
+    from banterbot.managers.stream_pipeline import StreamPipeline
+
+__all__ = [
+    "AzureNeuralVoiceManager",
+    "MemoryChain",
+    "OpenAIModelManager",
+    "ResourceManager",
+    "StreamManager",
+    "StreamPipeline",
+]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "AzureNeuralVoiceManager": "banterbot.managers.azure_neural_voice_manager",
+        "MemoryChain": "banterbot.managers.memory_chain",
+        "OpenAIModelManager": "banterbot.managers.openai_model_manager",
+        "ResourceManager": "banterbot.managers.resource_manager",
+        "StreamManager": "banterbot.managers.stream_manager",
+        "StreamPipeline": "banterbot.managers.stream_pipeline",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
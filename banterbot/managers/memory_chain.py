@@ -8,7 +8,7 @@ import banterbot.paths
 from banterbot import config
 from banterbot.models.memory import Memory
 from banterbot.protos import memory_pb2
-from banterbot.utils.nlp import NLP
+from banterbot.utils.keyword_vector_store import KeywordVectorStore
 
 
 class MemoryChain:
@@ -93,8 +93,7 @@ class MemoryChain:
         self._index_cache = memory_index
         self._memories = {}
         self._similarity_cache = {}
-        self._token_cache = {}
-        self._update_token_cache(self._index_cache.keys())
+        self._vector_cache = {}
         self._find_memories()
 
     def append(self, memory: Memory) -> None:
@@ -212,7 +211,6 @@ class MemoryChain:
             if keyword not in self._index_cache.keys():
                 self._index_cache[keyword] = set()
             self._index_cache[keyword].add(memory.uuid)
-        self._update_token_cache(memory.keywords)
 
     def _load_memory(self, memory_uuid: str) -> None:
         """
@@ -226,18 +224,19 @@ class MemoryChain:
         with open(self._directory / filename, "rb") as fs:
             self._memories[memory_uuid] = Memory.deserialize(fs.read())
 
-    def _update_token_cache(self, keywords: list[str]) -> None:
+    def _update_vector_cache(self, keywords: list[str]) -> None:
         """
-        Update the token cache with new keywords. This method is used to keep the token cache up-to-date when new
-        keywords are added to the MemoryChain. The token cache allows for efficient computation of similarity scores
-        between keywords.
+        Update the vector cache with new keywords. This method is used to compute the normalized vectors of keywords
+        only once, from the memory-mapped `KeywordVectorStore` rather than from the large spaCy model, which allows for
+        efficient computation of similarity scores between keywords.
 
         Args:
             keywords (list[str]): The new keywords to update the cache with.
         """
-        new_keywords = [keyword for keyword in keywords if keyword not in self._token_cache.keys()]
-        for keyword, token in zip(new_keywords, NLP.tokenize(strings=new_keywords)):
-            self._token_cache[keyword] = token
+        new_keywords = [keyword for keyword in keywords if keyword not in self._vector_cache.keys()]
+        if new_keywords:
+            for keyword, vector in zip(new_keywords, KeywordVectorStore.instance().vectors(new_keywords)):
+                self._vector_cache[keyword] = vector
 
     def _update_similarity_cache(self, keywords: list[str]) -> None:
         """
@@ -248,10 +247,11 @@ class MemoryChain:
         Args:
             keywords (list[str]): The new keywords to update the cache with.
         """
-        self._update_token_cache(keywords=keywords)
+        self._update_vector_cache(keywords=[*keywords, *self._index_cache.keys()])
         for keyword_indexed in self._index_cache.keys():
             for keyword in keywords:
                 pair = (keyword, keyword_indexed)
                 if pair not in self._similarity_cache.keys():
-                    similarity = self._token_cache[keyword].similarity(self._token_cache[keyword_indexed])
+                    # The vectors are normalized, so that their dot product is their cosine similarity.
+                    similarity = float(self._vector_cache[keyword] @ self._vector_cache[keyword_indexed])
                     self._similarity_cache[pair] = similarity
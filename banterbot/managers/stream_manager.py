@@ -3,84 +3,129 @@ import logging
 import threading
 import time
 from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
+from banterbot.config import (
+    STREAM_LOG_RETAIN,
+    STREAM_MANAGER_POOLED,
+    STREAM_PROCESSOR_WORKERS,
+    STREAM_PRODUCER_WORKERS,
+)
 from banterbot.handlers.stream_handler import StreamHandler
 from banterbot.models.number import Number
 from banterbot.models.stream_log_entry import StreamLogEntry
+from banterbot.models.stream_state import StreamState
+from banterbot.models.stream_stats import StreamStats
 from banterbot.utils.closeable_queue import CloseableQueue
-from banterbot.utils.indexed_event import IndexedEvent
+from banterbot.utils.counting_event import CountingEvent
+from banterbot.utils.stream_gauge_sampler import StreamGaugeSampler
+from banterbot.utils.stream_log import StreamLog
 
 
 class StreamManager:
     """
     Manages streaming of data through threads and allows hard or soft interruption of the streamed data.
+
+    By default, each stream is run on dedicated threads: one that consumes the iterable, one that waits to close it on
+    interruption, and one that processes its items. In pooled mode, the iterables and processors of all streams are
+    instead run as tasks on two bounded worker pools shared by every pooled `StreamManager` in the process, which
+    avoids creating threads for every stream and bounds the number of threads under load; closing the iterable on
+    interruption is then done directly by the `StreamHandler`.
     """
 
-    def __init__(self) -> None:
+    # The worker pools shared by all pooled instances of `StreamManager`, created on first use.
+    _producer_executor: Optional[ThreadPoolExecutor] = None
+    _processor_executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, pooled: bool = STREAM_MANAGER_POOLED, log_retain: int = STREAM_LOG_RETAIN) -> None:
         """
         Initializes the StreamManager with default values.
+
+        Args:
+            pooled (bool): Whether streams should be run on the shared worker pools rather than on dedicated threads.
+            log_retain (int): The number of processed entries each stream log retains for debugging (see `StreamLog`).
         """
-        self._processor: Callable[[IndexedEvent, int, dict], Any] = lambda log, index, shared_data: log[index]
-        self._exception_handler: Optional[Callable[[IndexedEvent, dict], Any]] = None
-        self._completion_handler: Callable[[IndexedEvent, int, dict], Any] = None
+        self._pooled = pooled
+        self._log_retain = log_retain
+        self._processor: Callable[[StreamLog, int, dict], Any] = lambda log, index, shared_data: log[index]
+        self._exception_handler: Optional[Callable[[StreamLog, int, dict], Any]] = None
+        self._completion_handler: Optional[Callable[[StreamLog, dict], Any]] = None
+        self._stats_handler: Optional[Callable[[StreamStats], Any]] = None
 
-    def connect_processor(self, func: Callable[[list[StreamLogEntry], int, dict], Any]) -> None:
+    def connect_processor(self, func: Callable[[StreamLog, int, dict], Any]) -> None:
         """
         Connects a processor function for processing each streamed item. The stream processor function should take a
-        list of `StreamLogEntry` instances, the current index of the log, and a dictionary which will contain shared
-        data between the connected functions.
+        `StreamLog` of `StreamLogEntry` instances, the current index of the log, and a dictionary which will contain
+        shared data between the connected functions.
 
         Args:
-            func (Callable[[list[StreamLogEntry], int, dict], Any]): The stream processor function to be used.
+            func (Callable[[StreamLog, int, dict], Any]): The stream processor function to be used.
         """
         if (sig := sorted(list(inspect.signature(func).parameters))) != ["index", "log", "shared_data"]:
             raise ValueError(
                 "Argument `func` in method `connect_processor` of class `StreamManager` expects the following"
-                f" signature: `func(log: list[StreamLogEntry], index: int, shared_data: dict) -> Any`. Got {sig}."
+                f" signature: `func(log: StreamLog, index: int, shared_data: dict) -> Any`. Got {sig}."
             )
         self._processor = func
 
-    def connect_completion_handler(self, func: Callable[[list[StreamLogEntry], dict], Any]) -> None:
+    def connect_completion_handler(self, func: Callable[[StreamLog, dict], Any]) -> None:
         """
         Connects an optional completion handler function for handling the final result of the parser. The handler
-        function should take a list of `StreamLogEntry` instances and a dictionary which will contain shared data
+        function should take a `StreamLog` of `StreamLogEntry` instances and a dictionary which will contain shared data
         between the connected functions.
 
         Args:
-            func (Callable[[list[StreamLogEntry], dict], Any]): The completion handler function to be used.
+            func (Callable[[StreamLog, dict], Any]): The completion handler function to be used.
         """
         if (sig := sorted(list(inspect.signature(func).parameters))) != ["log", "shared_data"]:
             raise ValueError(
                 "Argument `func` in method `connect_completion_handler` of class `StreamManager`  expects the following"
-                f" signature: `func(log: list[StreamLogEntry], shared_data: dict) -> Any`. Got {sig}."
+                f" signature: `func(log: StreamLog, shared_data: dict) -> Any`. Got {sig}."
             )
 
         self._completion_handler = func
 
-    def connect_exception_handler(self, func: Callable[[list[StreamLogEntry], int, dict], Any]) -> None:
+    def connect_exception_handler(self, func: Callable[[StreamLog, int, dict], Any]) -> None:
         """
         Connects an optional exception handler function for the parser, to be used when the stream iterable is
         interrupted. The stream exception handler function is provided with the log and the current index for all
-        remaining items in the stream. The handler function should take a list of `StreamLogEntry` instances, the
+        remaining items in the stream. The handler function should take a `StreamLog` of `StreamLogEntry` instances, the
         current index of the log, and a dictionary which will contain shared data between the connected functions.
 
         Args:
-            func (Callable[[list[StreamLogEntry], int, dict], Any]): The finalizer function to be used.
+            func (Callable[[StreamLog, int, dict], Any]): The finalizer function to be used.
         """
         if (sig := sorted(list(inspect.signature(func).parameters))) != ["index", "log", "shared_data"]:
             raise ValueError(
                 "Argument `func` in method `connect_exception_handler` of class `StreamManager`  expects the following"
-                f" signature: `func(log: list[StreamLogEntry], index: int, shared_data: dict) -> Any`. Got {sig}."
+                f" signature: `func(log: StreamLog, index: int, shared_data: dict) -> Any`. Got {sig}."
             )
         self._exception_handler = func
 
+    def connect_stats_handler(self, func: Callable[[StreamStats], Any]) -> None:
+        """
+        Connects an optional handler function that is called with the `StreamStats` of each stream once it has ended,
+        for instance to aggregate latency measurements.
+
+        Args:
+            func (Callable[[StreamStats], Any]): The stats handler function to be used.
+        """
+        if (sig := list(inspect.signature(func).parameters)) != ["stats"]:
+            raise ValueError(
+                "Argument `func` in method `connect_stats_handler` of class `StreamManager` expects the following"
+                f" signature: `func(stats: StreamStats) -> Any`. Got {sig}."
+            )
+        self._stats_handler = func
+
     def stream(
         self,
         iterable: Iterable[Any],
         close_stream: Optional[Callable] = None,
-        init_shared_data: Optional[dict[str, Any]] = None,
+        init_shared_data: Optional[Union[dict[str, Any], StreamState]] = None,
+        stats: Optional[StreamStats] = None,
     ) -> StreamHandler:
         """
         Starts streaming data from an iterable source in a separate thread.
@@ -88,14 +133,20 @@ class StreamManager:
         Args:
             iterable (Iterable[Any]): The iterable to stream data from.
             close_stream (Optional[str]): The method to use for closing the iterable.
-            init_shared_data (Optional[dict[str, Any]]): The initial shared data to use (key `interrupt` is reserved.)
+            init_shared_data (Optional[Union[dict[str, Any], StreamState]]): The initial shared data to use, either as
+            a dict that is deep copied (key `interrupt` is reserved), or as a new `StreamState` instance used as is.
+            stats (Optional[StreamStats]): The latency measurements of the stream, if its start was recorded earlier
+            (e.g., before sending a request); otherwise, the stream starts now.
         """
         logging.debug("StreamManager initializing stream.")
         # Getting the timestamp of the stream.
         timestamp = time.perf_counter_ns()
 
-        # Creating the indexed event and kill event to be used.
-        indexed_event = IndexedEvent()
+        # Creating the latency measurements of the stream.
+        stats = StreamStats(start=timestamp) if stats is None else stats
+
+        # Creating the counting event and kill event to be used.
+        counting_event = CountingEvent()
         kill_event = threading.Event()
 
         # Creating the interrupt, index, and index_max values to be used.
@@ -103,10 +154,12 @@ class StreamManager:
 
         # Creating the queue and log to be used.
         queue = CloseableQueue()
-        log = []
+        log = StreamLog(retain=self._log_retain)
 
         # Creating the shared data to be used.
-        if init_shared_data:
+        if isinstance(init_shared_data, StreamState):
+            shared_data = init_shared_data
+        elif init_shared_data:
             if "interrupt" in init_shared_data:
                 raise ValueError(
                     "The key `interrupt` is reserved in the dict argument `init_shared_data` for method `stream` in"
@@ -116,75 +169,136 @@ class StreamManager:
         else:
             shared_data = {"interrupt": Number(0)}
 
-        # Creating the stream thread with the `_wrap_stream` method as the target function.
-        stream_thread = threading.Thread(
-            target=self._wrap_stream,
-            kwargs={
-                "indexed_event": indexed_event,
-                "kill_event": kill_event,
-                "log": log,
-                "iterable": iterable,
-                "close_stream": close_stream,
-            },
-            daemon=False,
-        )
+        processor_kwargs = {
+            "timestamp": timestamp,
+            "interrupt": interrupt,
+            "counting_event": counting_event,
+            "kill_event": kill_event,
+            "queue": queue,
+            "log": log,
+            "processor": self._processor,
+            "completion_handler": self._completion_handler,
+            "exception_handler": self._exception_handler,
+            "stats_handler": self._stats_handler,
+            "shared_data": shared_data,
+            "stats": stats,
+        }
 
-        # Creating the stream processor thread with the `_wrap_stream_processor` method as the target function.
-        processor_thread = threading.Thread(
-            target=self._wrap_processor,
-            kwargs={
-                "timestamp": timestamp,
-                "interrupt": interrupt,
-                "indexed_event": indexed_event,
-                "kill_event": kill_event,
-                "queue": queue,
-                "log": log,
-                "processor": self._processor,
-                "completion_handler": self._completion_handler,
-                "exception_handler": self._exception_handler,
-                "shared_data": shared_data,
-            },
-            daemon=True,
-        )
+        if self._pooled:
+            producer_executor, processor_executor = self._executors()
 
-        # Starting the stream processor and stream threads.
-        stream_thread.start()
+            # Submitting the stream task, which is closed by the handler on interruption instead of by a waiting thread.
+            producer = producer_executor.submit(
+                self._stream,
+                counting_event=counting_event,
+                kill_event=kill_event,
+                log=log,
+                iterable=iterable,
+                stats=stats,
+            )
 
-        # Return an instance of StreamHandler
-        return StreamHandler(
-            interrupt=interrupt,
-            kill_event=kill_event,
-            queue=queue,
-            processor_thread=processor_thread,
-            shared_data=shared_data,
-        )
+            def on_interrupt() -> None:
+                if close_stream and not producer.done():
+                    close_stream()
+                # Wake the processor, in case it is waiting for an item that will never arrive.
+                counting_event.increment()
+
+            handler = StreamHandler(
+                interrupt=interrupt,
+                kill_event=kill_event,
+                queue=queue,
+                start=lambda: processor_executor.submit(self._wrap_processor, **processor_kwargs),
+                shared_data=shared_data,
+                stats=stats,
+                on_interrupt=on_interrupt,
+                log=log,
+            )
+        else:
+
+            # Creating the stream thread with the `_wrap_stream` method as the target function.
+            stream_thread = threading.Thread(
+                target=self._wrap_stream,
+                kwargs={
+                    "counting_event": counting_event,
+                    "kill_event": kill_event,
+                    "log": log,
+                    "iterable": iterable,
+                    "close_stream": close_stream,
+                    "stats": stats,
+                },
+                daemon=False,
+            )
+
+            # Creating the stream processor thread with the `_wrap_stream_processor` method as the target function.
+            processor_thread = threading.Thread(target=self._wrap_processor, kwargs=processor_kwargs, daemon=True)
+
+            # Starting the stream processor and stream threads.
+            stream_thread.start()
+
+            handler = StreamHandler(
+                interrupt=interrupt,
+                kill_event=kill_event,
+                queue=queue,
+                start=processor_thread.start,
+                shared_data=shared_data,
+                stats=stats,
+                log=log,
+            )
+
+        # Sample the gauges of the stream, if a process-wide sampler is enabled.
+        if (sampler := StreamGaugeSampler.instance()) is not None:
+            sampler.add(handler)
+
+        return handler
+
+    @classmethod
+    def _executors(cls) -> tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """
+        Returns the worker pools shared by all pooled instances, creating them on first use. Producers and processors
+        run on separate pools, so that processors waiting for items can never starve the producers of workers.
+
+        Returns:
+            tuple[ThreadPoolExecutor, ThreadPoolExecutor]: The producer and processor worker pools.
+        """
+        with cls._executor_lock:
+            if cls._producer_executor is None:
+                cls._producer_executor = ThreadPoolExecutor(
+                    max_workers=STREAM_PRODUCER_WORKERS, thread_name_prefix="StreamManagerProducer"
+                )
+                cls._processor_executor = ThreadPoolExecutor(
+                    max_workers=STREAM_PROCESSOR_WORKERS, thread_name_prefix="StreamManagerProcessor"
+                )
+            return cls._producer_executor, cls._processor_executor
 
     def _wrap_stream(
         self,
-        indexed_event: IndexedEvent,
+        counting_event: CountingEvent,
         kill_event: threading.Event,
-        log: list[StreamLogEntry],
+        log: StreamLog,
         iterable: Iterable[Any],
         close_stream: Optional[str] = None,
+        stats: Optional[StreamStats] = None,
     ) -> None:
         """
         Wraps the `_stream` thread to allow for instant interruption using the `kill` event.
 
         Args:
-            indexed_event (IndexedEvent): The indexed event to use for tracking the current index.
+            counting_event (CountingEvent): The counting event used to signal that items have been logged.
             kill_event (threading.Event): The event to use for interrupting the stream.
-            log (list[StreamLogEntry]): The log to store streamed data in.
+            log (StreamLog): The log to store streamed data in.
             iterable (Iterable[Any]): The iterable to stream data from.
             close_stream (Optional[str]): The method to use for closing the iterable.
+            stats (Optional[StreamStats]): The latency measurements of the stream.
         """
         # Instantiating the stream thread with the `_stream` method as the target function.
         thread = threading.Thread(
             target=self._stream,
             kwargs={
-                "indexed_event": indexed_event,
+                "counting_event": counting_event,
                 "kill_event": kill_event,
                 "log": log,
                 "iterable": iterable,
+                "stats": stats,
             },
             daemon=True,
         )
@@ -201,39 +315,56 @@ class StreamManager:
 
     def _stream(
         self,
-        indexed_event: IndexedEvent,
+        counting_event: CountingEvent,
         kill_event: threading.Event,
-        log: list[StreamLogEntry],
+        log: StreamLog,
         iterable: Iterable[Any],
+        stats: Optional[StreamStats] = None,
     ) -> None:
         """
         Wraps the streaming process for the given iterable.
 
         Args:
             index_max (Number): The maximum index to stream to.
-            indexed_event (IndexedEvent): The indexed event to use for tracking the current index.
+            counting_event (CountingEvent): The counting event used to signal that items have been logged.
             kill_event (threading.Event): The event to use for interrupting the stream.
-            log (list[StreamLogEntry]): The log to store streamed data in.
+            log (StreamLog): The log to store streamed data in.
             iterable (Iterable[Any]): The iterable to stream data from.
+            stats (Optional[StreamStats]): The latency measurements of the stream.
         """
-        for value in iterable:
-            log.append(StreamLogEntry(value=value))
-            indexed_event.increment()
-        kill_event.set()
-        indexed_event.increment()
+        try:
+            for value in iterable:
+                # Stop consuming the iterable once interrupted, so that a worker in pooled mode is not held by it.
+                if kill_event.is_set():
+                    break
+                entry = StreamLogEntry(value=value)
+                log.append(entry)
+                if stats is not None:
+                    stats.record_chunk(entry.timestamp)
+                counting_event.increment()
+        except Exception:
+            # Closing an iterable while it is being consumed (e.g., an HTTP response) typically raises an exception.
+            if not kill_event.is_set():
+                logging.exception("StreamManager stream raised an exception")
+        finally:
+            # Always signal the end of the stream, so that the processor never waits for items that will never arrive.
+            kill_event.set()
+            counting_event.increment()
 
     def _wrap_processor(
         self,
         timestamp: float,
         interrupt: Number,
-        indexed_event: IndexedEvent,
+        counting_event: CountingEvent,
         kill_event: threading.Event,
         queue: CloseableQueue,
-        log: list[StreamLogEntry],
-        processor: Callable[[list[StreamLogEntry], int, dict], Any],
-        completion_handler: Optional[Callable[[list[StreamLogEntry], dict], Any]],
-        exception_handler: Callable[[list[StreamLogEntry], int, dict], Any],
-        shared_data: Optional[dict[str, Any]] = None,
+        log: StreamLog,
+        processor: Callable[[StreamLog, int, dict], Any],
+        completion_handler: Optional[Callable[[StreamLog, dict], Any]],
+        exception_handler: Callable[[StreamLog, int, dict], Any],
+        stats_handler: Optional[Callable[[StreamStats], Any]] = None,
+        shared_data: Optional[Union[dict[str, Any], StreamState]] = None,
+        stats: Optional[StreamStats] = None,
     ) -> None:
         """
         Wraps the parser function to process each item in the stream log.
@@ -241,36 +372,48 @@ class StreamManager:
         Args:
             timestamp (float): The timestamp of the stream.
             interrupt (Number): The interrupt time of the stream.
-            indexed_event (IndexedEvent): The indexed event to use for tracking the current index.
+            counting_event (CountingEvent): The counting event used to signal that items have been logged.
             kill_event (threading.Event): The event to use for interrupting the stream.
             queue (CloseableQueue): The queue to store processed data in.
-            log (list[StreamLogEntry]): The log to store streamed data in.
-            stream_processor (Callable[[list[StreamLogEntry], int, dict], Any]): The stream processor function to
+            log (StreamLog): The log to store streamed data in.
+            stream_processor (Callable[[StreamLog, int, dict], Any]): The stream processor function to
                 be used.
-            stream_completion_handler (Optional[Callable[[list[StreamLogEntry], dict], Any]]): The completion
+            stream_completion_handler (Optional[Callable[[StreamLog, dict], Any]]): The completion
                 handler function to be used.
-            stream_exception_handler (Callable[[list[StreamLogEntry], int, dict], Any]): The exception handler
+            stream_exception_handler (Callable[[StreamLog, int, dict], Any]): The exception handler
                 function to be used.
-            shared_data (Optional[dict[str, Any]]): The shared data to be used.
+            stats_handler (Optional[Callable[[StreamStats], Any]]): The stats handler function to be used.
+            shared_data (Optional[Union[dict[str, Any], StreamState]]): The shared data to be used.
+            stats (Optional[StreamStats]): The latency measurements of the stream.
         """
+        completed = False
         index = 0
-        while interrupt < timestamp and (not kill_event.is_set() or index < len(log)):
-            indexed_event.wait()
-            indexed_event.decrement()
-            if kill_event.is_set() and index >= len(log):
-                continue
-            try:
-                output = processor(log=log, index=index, shared_data=shared_data)
-                if output is not None:
-                    queue.put(output)
-            except StopIteration:
-                break
-            index += 1
-        else:
+        stopped = False
+        while not stopped and interrupt < timestamp and (not kill_event.is_set() or index < len(log)):
+            # Claim every item logged since the last wake-up, and process them in a single pass.
+            counting_event.take_all()
+            end = len(log)
+            while index < end and interrupt < timestamp:
+                try:
+                    output = processor(log=log, index=index, shared_data=shared_data)
+                    if output is not None:
+                        queue.put(output)
+                        if stats is not None:
+                            stats.record_output()
+                except StopIteration:
+                    stopped = True
+                    break
+                index += 1
+                log.advance(index)
+
+        if not stopped:
+            completed = interrupt < timestamp
             if interrupt < timestamp and completion_handler:
                 output = completion_handler(log=log, shared_data=shared_data)
                 if output is not None:
                     queue.put(output)
+                    if stats is not None:
+                        stats.record_output()
 
         if exception_handler:
             while index < len(log):
@@ -281,5 +424,11 @@ class StreamManager:
                 except StopIteration:
                     break
                 index += 1
+                log.advance(index)
 
         queue.close()
+
+        if stats is not None:
+            stats.record_end(completed=completed)
+            if stats_handler:
+                stats_handler(stats=stats)
@@ -0,0 +1,213 @@
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Optional
+
+from typing_extensions import Self
+
+from banterbot.config import STREAM_PIPELINE_QUEUE_MAXSIZE
+from banterbot.handlers.stream_handler import StreamHandler
+from banterbot.models.number import Number
+from banterbot.models.stream_stats import StreamStats
+from banterbot.utils.closeable_queue import CloseableQueue
+
+
+class StreamPipeline:
+    """
+    Streams data through a chain of processing stages that run concurrently, each on its own thread, connected by
+    bounded instances of `CloseableQueue`. While a slow stage is busy with one item, the stages before it can already
+    work on the next ones, and the bounded queues keep them from running more than `maxsize` items ahead.
+
+    Stages are added in order with method `add_stage`, and the same pipeline can be run on any number of iterables
+    (typically the `StreamHandler` of a `StreamManager` stream). Each run returns a `StreamHandler` for the outputs of
+    the last stage, and interrupting it interrupts every stage of the run, as well as the source iterable if a callable
+    that closes it is provided.
+    """
+
+    def __init__(self, maxsize: int = STREAM_PIPELINE_QUEUE_MAXSIZE) -> None:
+        """
+        Initializes an empty `StreamPipeline` instance.
+
+        Args:
+            maxsize (int): The maximum number of items buffered between two consecutive stages, or zero for no limit.
+        """
+        self._maxsize = maxsize
+        self._stages: list[tuple[Callable[[Any], Any], bool, Optional[int]]] = []
+
+    def add_stage(self, func: Callable[[Any], Any], batch: bool = False, max_items: Optional[int] = None) -> Self:
+        """
+        Appends a processing stage to the pipeline. The stage function is called with each output of the previous stage
+        (or each item of the source iterable, for the first stage) and returns its own output, or None to drop the item.
+        If the stage function is a generator function, every item it yields is output instead.
+
+        Args:
+            func (Callable[[Any], Any]): The stage function.
+            batch (bool): If True, the stage function is instead called with a list of all the items available at once
+            (see method `CloseableQueue.get_batch`), which lets a stage merge the items that piled up while it was busy.
+            max_items (Optional[int]): The maximum number of items per batch, if `batch` is True; None for no limit.
+
+        Returns:
+            Self: The pipeline itself, so that calls can be chained.
+        """
+        self._stages.append((func, batch, max_items))
+        return self
+
+    def run(self, iterable: Iterable[Any], close_stream: Optional[Callable] = None) -> StreamHandler:
+        """
+        Streams the items of an iterable through the stages of the pipeline. As with class `StreamManager`, the threads
+        of the run are only started once the returned handler is iterated over.
+
+        Args:
+            iterable (Iterable[Any]): The iterable to stream data from.
+            close_stream (Optional[Callable]): The method to use for closing the iterable when the run is interrupted.
+
+        Returns:
+            StreamHandler: A handler for the stream of outputs of the last stage.
+        """
+        logging.debug("StreamPipeline initializing stream.")
+        timestamp = time.perf_counter_ns()
+        stats = StreamStats(start=timestamp)
+        kill_event = threading.Event()
+
+        # Creating the queues connecting the source iterable to the first stage, and each stage to the next.
+        queues = [CloseableQueue(maxsize=self._maxsize) for _ in range(len(self._stages) + 1)]
+
+        def on_interrupt() -> None:
+            # Discard the items pending between stages, but let the consumer finish the outputs it already received.
+            for queue in queues[:-1]:
+                queue.kill()
+            queues[-1].close()
+            if close_stream:
+                close_stream()
+
+        def abort() -> None:
+            kill_event.set()
+            on_interrupt()
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                kwargs={
+                    "iterable": iterable,
+                    "sink": queues[0],
+                    "kill_event": kill_event,
+                    "stats": stats,
+                    "abort": abort,
+                },
+                daemon=True,
+            )
+        ]
+        for n, (func, batch, max_items) in enumerate(self._stages):
+            threads.append(
+                threading.Thread(
+                    target=self._run_stage,
+                    kwargs={
+                        "func": func,
+                        "batch": batch,
+                        "max_items": max_items,
+                        "source": queues[n],
+                        "sink": queues[n + 1],
+                        "kill_event": kill_event,
+                        "stats": stats if n == len(self._stages) - 1 else None,
+                        "abort": abort,
+                    },
+                    daemon=True,
+                )
+            )
+
+        def start() -> None:
+            for thread in threads:
+                thread.start()
+
+        return StreamHandler(
+            interrupt=Number(value=0),
+            kill_event=kill_event,
+            queue=queues[-1],
+            start=start,
+            shared_data={},
+            stats=stats,
+            on_interrupt=on_interrupt,
+        )
+
+    @staticmethod
+    def _feed(
+        iterable: Iterable[Any],
+        sink: CloseableQueue,
+        kill_event: threading.Event,
+        stats: StreamStats,
+        abort: Callable[[], None],
+    ) -> None:
+        """
+        Puts the items of the source iterable into the queue of the first stage.
+
+        Args:
+            iterable (Iterable[Any]): The iterable to stream data from.
+            sink (CloseableQueue): The input queue of the first stage.
+            kill_event (threading.Event): The event that is set when the run is interrupted.
+            stats (StreamStats): The latency measurements of the run.
+            abort (Callable[[], None]): Interrupts the run, in case the iterable raises an exception.
+        """
+        try:
+            for item in iterable:
+                if kill_event.is_set():
+                    break
+                stats.record_chunk(time.perf_counter_ns())
+                if not sink.put(item):
+                    break
+        except Exception:
+            logging.exception("StreamPipeline source raised an exception")
+            abort()
+        finally:
+            sink.close()
+
+    @staticmethod
+    def _run_stage(
+        func: Callable[[Any], Any],
+        batch: bool,
+        max_items: Optional[int],
+        source: CloseableQueue,
+        sink: CloseableQueue,
+        kill_event: threading.Event,
+        stats: Optional[StreamStats],
+        abort: Callable[[], None],
+    ) -> None:
+        """
+        Applies a stage function to the items of its input queue, and puts its outputs into its output queue.
+
+        Args:
+            func (Callable[[Any], Any]): The stage function.
+            batch (bool): Whether the stage function is called with batches of items.
+            max_items (Optional[int]): The maximum number of items per batch.
+            source (CloseableQueue): The input queue of the stage.
+            sink (CloseableQueue): The output queue of the stage.
+            kill_event (threading.Event): The event that is set when the run is interrupted.
+            stats (Optional[StreamStats]): The latency measurements of the run, if this is the last stage.
+            abort (Callable[[], None]): Interrupts the run, in case the stage function raises an exception.
+        """
+        generator = inspect.isgeneratorfunction(func)
+        try:
+            for item in source.iter_batches(max_items=max_items) if batch else source:
+                if kill_event.is_set():
+                    break
+                outputs = func(item) if generator else (func(item),)
+                try:
+                    for output in outputs:
+                        if output is None:
+                            continue
+                        if kill_event.is_set() or not sink.put(output):
+                            break
+                        if stats is not None:
+                            stats.record_output()
+                finally:
+                    # Release whatever the generator holds (e.g., a lock) if the stage stopped before exhausting it.
+                    if generator:
+                        outputs.close()
+        except Exception:
+            logging.exception("StreamPipeline stage raised an exception")
+            abort()
+        finally:
+            sink.close()
+            if stats is not None:
+                stats.record_end(completed=not kill_event.is_set())
@@ -1,12 +1,21 @@
-from banterbot.models.azure_neural_voice_profile import AzureNeuralVoiceProfile
-from banterbot.models.memory import Memory
-from banterbot.models.message import Message
-from banterbot.models.number import Number
-from banterbot.models.openai_model import OpenAIModel
-from banterbot.models.phrase import Phrase
-from banterbot.models.speech_recognition_input import SpeechRecognitionInput
-from banterbot.models.stream_log_entry import StreamLogEntry
-from banterbot.models.word import Word
+from typing import TYPE_CHECKING
+
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.models.azure_neural_voice_profile import AzureNeuralVoiceProfile
+    from banterbot.models.memory import Memory
+    from banterbot.models.message import Message
+    from banterbot.models.number import Number
+    from banterbot.models.openai_model import OpenAIModel
+    from banterbot.models.openai_stream_state import OpenAIStreamState
+    from banterbot.models.phrase import Phrase
+    from banterbot.models.speech_recognition_input import SpeechRecognitionInput
+    from banterbot.models.speech_recognition_stream_state import SpeechRecognitionStreamState
+    from banterbot.models.stream_log_entry import StreamLogEntry
+    from banterbot.models.stream_state import StreamState
+    from banterbot.models.stream_stats import StreamStats
+    from banterbot.models.word import Word
 
 __all__ = [
     "AzureNeuralVoiceProfile",
@@ -14,8 +23,34 @@ __all__ = [
     "Message",
     "Number",
     "OpenAIModel",
+    "OpenAIStreamState",
     "Phrase",
     "SpeechRecognitionInput",
+    "SpeechRecognitionStreamState",
     "StreamLogEntry",
+    "StreamState",
+    "StreamStats",
     "Word",
 ]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "AzureNeuralVoiceProfile": "banterbot.models.azure_neural_voice_profile",
+        "Memory": "banterbot.models.memory",
+        "Message": "banterbot.models.message",
+        "Number": "banterbot.models.number",
+        "OpenAIModel": "banterbot.models.openai_model",
+        "OpenAIStreamState": "banterbot.models.openai_stream_state",
+        "Phrase": "banterbot.models.phrase",
+        "SpeechRecognitionInput": "banterbot.models.speech_recognition_input",
+        "SpeechRecognitionStreamState": "banterbot.models.speech_recognition_stream_state",
+        "StreamLogEntry": "banterbot.models.stream_log_entry",
+        "StreamState": "banterbot.models.stream_state",
+        "StreamStats": "banterbot.models.stream_stats",
+        "Word": "banterbot.models.word",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
@@ -0,0 +1,21 @@
+from banterbot.models.stream_state import StreamState
+from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+
+
+class OpenAIStreamState(StreamState):
+    """
+    The state shared by the processor and completion handler of the ChatCompletion streams of class `OpenAIService`.
+    """
+
+    __slots__ = ("init_time", "segmenter")
+
+    def __init__(self, init_time: int) -> None:
+        """
+        Initializes the state of a new ChatCompletion stream.
+
+        Args:
+            init_time (int): The time at which the stream was initialized, used to detect interruptions.
+        """
+        super().__init__()
+        self.init_time = init_time
+        self.segmenter = IncrementalSentenceSegmenter()
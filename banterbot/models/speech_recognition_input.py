@@ -34,6 +34,28 @@ class SpeechRecognitionInput:
         language = language if language is not None else cls._extract_language(recognition_result=recognition_result)
         return cls(data=data, language=language)
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Constructor for the `SpeechRecognitionInput` class from the output of method `to_dict`.
+
+        Args:
+            data (dict): The JSON data output from a speech recognition event and the language used for recognition.
+
+        Returns:
+            SpeechRecognitionInput: The speech-to-text output.
+        """
+        return cls(data=data["data"], language=data["language"])
+
+    def to_dict(self) -> dict:
+        """
+        Returns the data required to recreate the instance with method `from_dict`, which can be serialized to JSON.
+
+        Returns:
+            dict: The JSON data output from a speech recognition event and the language used for recognition.
+        """
+        return {"data": self._data, "language": self._language}
+
     @classmethod
     def _extract_language(cls, recognition_result: speechsdk.SpeechRecognitionResult) -> Optional[str]:
         """
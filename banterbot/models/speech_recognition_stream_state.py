@@ -0,0 +1,19 @@
+from banterbot.models.stream_state import StreamState
+
+
+class SpeechRecognitionStreamState(StreamState):
+    """
+    The state shared by the exception handler of the recognition streams of class `SpeechRecognitionService`.
+    """
+
+    __slots__ = ("init_time",)
+
+    def __init__(self, init_time: int) -> None:
+        """
+        Initializes the state of a new recognition stream.
+
+        Args:
+            init_time (int): The time at which the recognition was initialized, used to compute the interruption cutoff.
+        """
+        super().__init__()
+        self.init_time = init_time
@@ -0,0 +1,102 @@
+from typing import Any, ClassVar
+
+
+class StreamState:
+    """
+    The base class of the typed state shared between the connected functions of a stream in class `StreamManager`.
+    Subclasses declare the fields of their processor in `__slots__`, so that processors can access them as attributes
+    (faster than dictionary lookups), and pass a new instance to `StreamManager.stream` as `init_shared_data` for each
+    stream, which is then used directly rather than deep copied.
+
+    For compatibility with processors written for the dict form of the shared data, the declared fields can also be
+    accessed by key. Field `interrupt`, which holds the time at which the stream was interrupted (zero if it was not),
+    is declared by every state and set by the `StreamHandler` of the stream.
+    """
+
+    __slots__ = ("interrupt",)
+
+    # The names of all the fields declared by the class and its bases.
+    _fields: ClassVar[frozenset[str]] = frozenset(__slots__)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Collects the fields declared by a subclass and its bases.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(name for base in cls.__mro__ for name in getattr(base, "__slots__", ()))
+
+    def __init__(self) -> None:
+        """
+        Initializes the state of a stream that has not been interrupted.
+        """
+        self.interrupt = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the value of a field, or a default value if it is not declared or not set.
+
+        Args:
+            key (str): The name of the field.
+            default (Any): The value returned if the field is not declared or not set.
+
+        Returns:
+            Any: The value of the field.
+        """
+        return getattr(self, key, default) if key in self._fields else default
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Returns the value of a field.
+
+        Args:
+            key (str): The name of the field.
+
+        Returns:
+            Any: The value of the field.
+
+        Raises:
+            KeyError: If the field is not declared or not set.
+        """
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """
+        Sets the value of a field.
+
+        Args:
+            key (str): The name of the field.
+            value (Any): The new value of the field.
+
+        Raises:
+            KeyError: If the field is not declared.
+        """
+        if key not in self._fields:
+            raise KeyError(f"Field `{key}` is not declared by class `{self.__class__.__name__}`.")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Returns whether a field is declared and set.
+
+        Args:
+            key (str): The name of the field.
+
+        Returns:
+            bool: True if the field is declared and set, False otherwise.
+        """
+        return key in self._fields and hasattr(self, key)
+
+    def __repr__(self) -> str:
+        """
+        Returns the fields of the state and their values.
+
+        Returns:
+            str: The representation of the state.
+        """
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in sorted(self._fields) if hasattr(self, name))
+        return f"{self.__class__.__name__}({fields})"
@@ -0,0 +1,210 @@
+import bisect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from banterbot.config import STREAM_STATS_GAP_BUCKETS, STREAM_STATS_GAP_SAMPLES
+
+
+@dataclass
+class StreamStats:
+    """
+    Latency measurements for a single stream in class `StreamManager`, all recorded with `perf_counter_ns()`. The stream
+    thread records the arrival of each chunk and the processor thread records each output, so that the time spent
+    waiting on the source (e.g., the OpenAI API) can be told apart from the time spent processing its chunks.
+
+    Times are stored in nanoseconds; the properties convert durations to seconds. The gaps between consecutive chunks
+    are not all retained, so that memory use does not grow with the length of the stream: they are counted in the
+    buckets of `config.STREAM_STATS_GAP_BUCKETS`, and a uniform sample of at most `config.STREAM_STATS_GAP_SAMPLES` of
+    them is kept for the computation of percentiles.
+    """
+
+    # The upper bounds of the buckets of the gaps between consecutive chunks, in nanoseconds.
+    _gap_bounds = [int(bound * 1e9) for bound in STREAM_STATS_GAP_BUCKETS]
+
+    start: int = field(default_factory=time.perf_counter_ns)
+    response: Optional[int] = None
+    first_chunk: Optional[int] = None
+    last_chunk: Optional[int] = None
+    first_output: Optional[int] = None
+    end: Optional[int] = None
+    chunks: int = 0
+    outputs: int = 0
+    completed: bool = False
+    gap_counts: list[int] = field(default_factory=lambda: [0] * (len(STREAM_STATS_GAP_BUCKETS) + 1))
+    gap_samples: list[int] = field(default_factory=list)
+
+    def record_response(self, timestamp: Optional[int] = None) -> None:
+        """
+        Records the time at which the source responded, before its first chunk (e.g., when HTTP headers are received).
+
+        Args:
+            timestamp (Optional[int]): The time of the response; defaults to the current time.
+        """
+        self.response = time.perf_counter_ns() if timestamp is None else timestamp
+
+    def record_chunk(self, timestamp: int) -> None:
+        """
+        Records the arrival of a chunk from the source, as well as the gap since the previous chunk.
+
+        Args:
+            timestamp (int): The time at which the chunk was logged.
+        """
+        if self.first_chunk is None:
+            self.first_chunk = timestamp
+        else:
+            self._record_gap(timestamp - self.last_chunk)
+        self.last_chunk = timestamp
+        self.chunks += 1
+
+    @property
+    def gap_count(self) -> int:
+        """
+        The number of gaps between consecutive chunks.
+
+        Returns:
+            int: The number of gaps.
+        """
+        return max(self.chunks - 1, 0)
+
+    def record_output(self) -> None:
+        """
+        Records that the processor has produced an output that is ready to be consumed.
+        """
+        if self.first_output is None:
+            self.first_output = time.perf_counter_ns()
+        self.outputs += 1
+
+    def record_end(self, completed: bool) -> None:
+        """
+        Records the end of the stream.
+
+        Args:
+            completed (bool): Whether the stream ran to completion, as opposed to being interrupted.
+        """
+        self.end = time.perf_counter_ns()
+        self.completed = completed
+
+    @property
+    def time_to_response(self) -> Optional[float]:
+        """
+        The number of seconds between the start of the stream and the response of the source, if recorded.
+
+        Returns:
+            Optional[float]: The duration, or None if unavailable.
+        """
+        return self._seconds(self.start, self.response)
+
+    @property
+    def time_to_first_chunk(self) -> Optional[float]:
+        """
+        The number of seconds between the start of the stream and the arrival of its first chunk.
+
+        Returns:
+            Optional[float]: The duration, or None if unavailable.
+        """
+        return self._seconds(self.start, self.first_chunk)
+
+    @property
+    def time_to_first_output(self) -> Optional[float]:
+        """
+        The number of seconds between the start of the stream and the first output of the processor (for instance, the
+        first complete sentence of a ChatCompletion).
+
+        Returns:
+            Optional[float]: The duration, or None if unavailable.
+        """
+        return self._seconds(self.start, self.first_output)
+
+    @property
+    def processing_delay(self) -> Optional[float]:
+        """
+        The number of seconds between the arrival of the first chunk and the first output of the processor.
+
+        Returns:
+            Optional[float]: The duration, or None if unavailable.
+        """
+        return self._seconds(self.first_chunk, self.first_output)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        The number of seconds between the start and the end of the stream.
+
+        Returns:
+            Optional[float]: The duration, or None if the stream has not ended.
+        """
+        return self._seconds(self.start, self.end)
+
+    def gap_histogram(self) -> dict[str, int]:
+        """
+        Counts the gaps between consecutive chunks in the buckets of `config.STREAM_STATS_GAP_BUCKETS`.
+
+        Returns:
+            dict[str, int]: The number of gaps per bucket, keyed by labels of the form "<=0.01" and ">1.0".
+        """
+        labels = [f"<={bound}" for bound in STREAM_STATS_GAP_BUCKETS] + [f">{STREAM_STATS_GAP_BUCKETS[-1]}"]
+        return dict(zip(labels, self.gap_counts))
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarizes the measurements of the stream.
+
+        Returns:
+            dict[str, Any]: The durations in seconds, the counts, and the histogram of the gaps between chunks.
+        """
+        return {
+            "time_to_response": self.time_to_response,
+            "time_to_first_chunk": self.time_to_first_chunk,
+            "time_to_first_output": self.time_to_first_output,
+            "processing_delay": self.processing_delay,
+            "duration": self.duration,
+            "chunks": self.chunks,
+            "outputs": self.outputs,
+            "completed": self.completed,
+            "gaps": self.gap_histogram(),
+        }
+
+    def _record_gap(self, gap: int) -> None:
+        """
+        Counts a gap between consecutive chunks in its bucket, and samples it by reservoir sampling (each of the gaps
+        recorded so far is retained with the same probability).
+
+        Args:
+            gap (int): The gap in nanoseconds.
+        """
+        self.gap_counts[bisect.bisect_left(self._gap_bounds, gap)] += 1
+
+        # The number of gaps recorded so far, including this one.
+        count = self.chunks
+        if len(self.gap_samples) < STREAM_STATS_GAP_SAMPLES:
+            self.gap_samples.append(gap)
+        elif (index := random.randrange(count)) < STREAM_STATS_GAP_SAMPLES:
+            self.gap_samples[index] = gap
+
+    @staticmethod
+    def _seconds(start: Optional[int], end: Optional[int]) -> Optional[float]:
+        """
+        Converts the difference between two timestamps in nanoseconds to seconds.
+
+        Args:
+            start (Optional[int]): The earlier timestamp.
+            end (Optional[int]): The later timestamp.
+
+        Returns:
+            Optional[float]: The difference in seconds, or None if either timestamp is missing.
+        """
+        return None if start is None or end is None else (end - start) / 1e9
+
+    def __repr__(self) -> str:
+        """
+        Return the main measurements of the stream in a compact form.
+
+        Returns:
+            str: Metadata about the stream.
+        """
+        return (
+            f"<StreamStats | chunks: {self.chunks} | first chunk: {self.time_to_first_chunk} s | first output:"
+            f" {self.time_to_first_output} s | duration: {self.duration} s>"
+        )
@@ -1,16 +1,26 @@
 from pathlib import Path
 
-# Initialize the filesystem for BanterBot
+# The filesystem for BanterBot. Its directories are created by their users before writing to them, so that importing
+# BanterBot has no side effects on the filesystem.
 filesystem = Path.home() / "Documents" / "BanterBot"
-filesystem.mkdir(parents=True, exist_ok=True)
 
-# Initialize the chat log directory
+# The chat log directory
 chat_logs = filesystem / "Conversations"
-chat_logs.mkdir(parents=True, exist_ok=True)
 
-# Initialize the personae memory and personality storage
+# The personae memory and personality storage
 personae = filesystem / "Personae"
-personae.mkdir(parents=True, exist_ok=True)
+
+# The on-disk cache directory
+cache = filesystem / "Cache"
+
+# The directory of recorded streams
+recordings = filesystem / "Recordings"
+
+# The directory of the samples of stream gauges
+gauges = filesystem / "Gauges"
+
+# The directory of the word vector stores exported from spaCy models
+vectors = filesystem / "Vectors"
 
 # The name of the resource file containing OpenAI ChatCompletion models.
 openai_models = "openai_models.json"
@@ -23,3 +33,10 @@ protobuf_extension = ".bin"
 memory_index = "memory_index" + protobuf_extension
 # The name of the directory in which memories should be saved
 memories = "memories"
+# The name of the cache subdirectory in which OpenAI ChatCompletion responses are saved
+response_cache = "responses"
+# The names of the files of a word vector store: its metadata, sorted word hashes, normalized vectors and their norms
+vectors_meta = "meta.json"
+vectors_keys = "keys.npy"
+vectors_units = "units.npy"
+vectors_norms = "norms.npy"
@@ -1,5 +1,24 @@
-from banterbot.services.openai_service import OpenAIService
-from banterbot.services.speech_recognition_service import SpeechRecognitionService
-from banterbot.services.speech_synthesis_service import SpeechSynthesisService
+from typing import TYPE_CHECKING
 
-__all__ = ["OpenAIService", "SpeechRecognitionService", "SpeechSynthesisService"]
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.services.async_openai_service import AsyncOpenAIService
+    from banterbot.services.openai_service import OpenAIService
+    from banterbot.services.speech_recognition_service import SpeechRecognitionService
+    from banterbot.services.speech_synthesis_service import SpeechSynthesisService
+
+__all__ = ["AsyncOpenAIService", "OpenAIService", "SpeechRecognitionService", "SpeechSynthesisService"]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "AsyncOpenAIService": "banterbot.services.async_openai_service",
+        "OpenAIService": "banterbot.services.openai_service",
+        "SpeechRecognitionService": "banterbot.services.speech_recognition_service",
+        "SpeechSynthesisService": "banterbot.services.speech_synthesis_service",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
@@ -0,0 +1,383 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+import weakref
+from collections.abc import AsyncGenerator
+from typing import Any, Callable, Optional, Union
+
+import httpx
+import openai
+
+from banterbot import config
+from banterbot.data.enums import EnvVar, SegmentationBackend
+from banterbot.models.message import Message
+from banterbot.models.openai_model import OpenAIModel
+from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+from banterbot.utils.nlp import NLP
+from banterbot.utils.openai_request import OpenAIRequest
+from banterbot.utils.rate_limiter import RateLimiter
+
+
+class AsyncOpenAIService:
+    """
+    An asyncio-native counterpart to `OpenAIService` built on the `openai.AsyncOpenAI` client. Rather than spawning
+    threads through a `StreamManager` for every stream, responses are consumed directly on the running event loop, so
+    that a large number of concurrent conversations can share a single loop.
+
+    Streamed responses are exposed as asynchronous generators of sentence blocks, and follow the same interruption
+    semantics as `OpenAIService`: any stream initialized before the latest call to `interrupt` is stopped.
+    """
+
+    api_key_set = False
+    rate_limiter = None
+
+    # The settings of the HTTP clients, and the OpenAI client of each event loop (see method `client`): since the
+    # connections of an `httpx.AsyncClient` are bound to the event loop they were opened on, a client is never shared
+    # between loops.
+    _client_options: dict[str, Any] = {}
+    _clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI] = weakref.WeakKeyDictionary()
+    _clients_lock = threading.Lock()
+
+    def __init__(self, model: OpenAIModel) -> None:
+        """
+        Initializes an `AsyncOpenAIService` instance for a specific model.
+
+        Args:
+            model (OpenAIModel): The OpenAI model to be used. This should be an instance of the OpenAIModel class, which
+            contains information about the model, such as its name and maximum token limit.
+        """
+        logging.debug(f"AsyncOpenAIService initialized")
+
+        # Set the OpenAI API key and the default connection pool settings of the clients.
+        if not self.__class__.api_key_set:
+            self.__class__.configure_client()
+
+        # The selected model that will be used in OpenAI ChatCompletion prompts.
+        self._model = model
+
+        # Set the interruption flag to zero: if interruptions are raised, this will be updated.
+        self._interrupt = 0
+
+        # The active response streams, each paired with the event loop it is being consumed on. Guarded by a lock,
+        # since method `interrupt` may be called from any thread.
+        self._streams: set[tuple[asyncio.AbstractEventLoop, openai.AsyncStream]] = set()
+        self._streams_lock = threading.Lock()
+
+    @classmethod
+    def configure_client(
+        cls,
+        max_connections: int = config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = config.HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout: float = config.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = config.HTTP_READ_TIMEOUT,
+        http2: bool = config.HTTP2,
+        base_url: Optional[str] = None,
+        http_client_factory: Optional[Callable[[], httpx.AsyncClient]] = None,
+    ) -> None:
+        """
+        (Re)configures the OpenAI clients used by all instances of `AsyncOpenAIService`, each with a persistent HTTP
+        connection pool. One client is created per event loop on first use, and discarded along with its loop. Should
+        be called before any instances are created if the default settings in `config.py` are not suitable. Retries are
+        disabled in the clients themselves, since they are handled by `_request` and the shared rate limiter.
+
+        Args:
+            max_connections (int): The maximum number of concurrent connections to the OpenAI API, per event loop.
+            max_keepalive_connections (int): The maximum number of idle connections kept alive in each pool.
+            keepalive_expiry (float): The number of seconds after which an idle connection is closed.
+            connect_timeout (float): The number of seconds to wait for a connection to be established.
+            read_timeout (float): The number of seconds to wait for data to be received, or to be sent.
+            http2 (bool): Whether HTTP/2 should be used; ignored with a warning if the `h2` package is not installed.
+            base_url (Optional[str]): An alternative base URL for the API, such as a proxy or a local server.
+            http_client_factory (Optional[Callable[[], httpx.AsyncClient]]): A function that creates a preconfigured
+            HTTP client for each event loop, overriding the settings above.
+        """
+        if http_client_factory is None:
+            options = OpenAIRequest.http_client_options(
+                service="AsyncOpenAIService",
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                http2=http2,
+            )
+            http_client_factory = functools.partial(httpx.AsyncClient, **options)
+
+        with cls._clients_lock:
+            cls._client_options = {
+                "api_key": os.environ.get(EnvVar.OPENAI_API_KEY.value),
+                "base_url": base_url,
+                "http_client_factory": http_client_factory,
+            }
+            # Clients configured with the previous settings are no longer used, although their open streams continue.
+            cls._clients = weakref.WeakKeyDictionary()
+        cls.rate_limiter = RateLimiter.default()
+        cls.api_key_set = True
+
+    @classmethod
+    def client(cls) -> openai.AsyncOpenAI:
+        """
+        Returns the OpenAI client of the running event loop, creating it on first use. Must be called from a coroutine.
+
+        Returns:
+            openai.AsyncOpenAI: The client of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with cls._clients_lock:
+            if (client := cls._clients.get(loop)) is None:
+                client = openai.AsyncOpenAI(
+                    api_key=cls._client_options["api_key"],
+                    base_url=cls._client_options["base_url"],
+                    max_retries=0,
+                    http_client=cls._client_options["http_client_factory"](),
+                )
+                cls._clients[loop] = client
+            return client
+
+    def interrupt(self) -> None:
+        """
+        Interrupts all current OpenAI ChatCompletion streams. Can safely be called from any thread: the underlying HTTP
+        responses are closed on the event loops they belong to.
+        """
+        self._interrupt = time.perf_counter_ns()
+        with self._streams_lock:
+            streams = list(self._streams)
+        for loop, stream in streams:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._close_stream, stream)
+        logging.debug(f"AsyncOpenAIService Interrupted")
+
+    async def warmup(self, connections: int = config.WARMUP_CONNECTIONS) -> int:
+        """
+        Opens connections to the OpenAI API in advance, so that the first prompt does not pay for DNS resolution and
+        the TCP/TLS handshakes. Each connection is opened by a concurrent request for the metadata of the model, which
+        does not count against the ChatCompletion rate limits.
+
+        Args:
+            connections (int): The number of connections to open, up to the size of the keep-alive pool.
+
+        Returns:
+            int: The number of connections that were successfully opened.
+        """
+
+        async def request() -> bool:
+            try:
+                await self.__class__.client().models.retrieve(self._model.model)
+                return True
+            except (openai.APIError, httpx.HTTPError) as error:
+                logging.debug(f"AsyncOpenAIService warmup request failed: {error}")
+                return False
+
+        successes = sum(await asyncio.gather(*(request() for _ in range(connections))))
+        logging.debug(f"AsyncOpenAIService warmed up {successes}/{connections} connections")
+        return successes
+
+    def count_tokens(self, string: str) -> int:
+        """
+        Counts the number of tokens in the provided string.
+
+        Args:
+            string (str): A string provided by the user where the number of tokens are to be counted.
+
+        Returns:
+            int: The number of tokens in the string.
+        """
+        return len(self._model.tokenizer.encode(string))
+
+    async def prompt(self, messages: list[Message], split: bool = True, **kwargs) -> Union[tuple[str], str]:
+        """
+        Sends messages to the OpenAI ChatCompletion API and retrieves the response as a list of sentences.
+
+        Args:
+            messages (list[Message]): A list of messages. Each message should be an instance of the `Message` class,
+            which contains the content and role (user or assistant) of the message.
+
+            split (bool): Whether the response should be split into sentences.
+
+            **kwargs: Additional parameters for the API request. These can include settings such as temperature, top_p,
+            and frequency_penalty.
+
+        Returns:
+            Union[list[str], str]: A list of sentences forming the response from the OpenAI API. If `split` is False,
+            returns a string.
+        """
+        response = await self._request(messages=messages, stream=False, **kwargs)
+        logging.debug(f"AsyncOpenAIService processed block: `{response}`")
+        sentences = await self._segment(NLP.segment_sentences, response) if split else response
+        return sentences
+
+    async def prompt_many(
+        self,
+        messages_list: list[list[Message]],
+        max_concurrency: int = config.PROMPT_MANY_MAX_CONCURRENCY,
+        split: bool = True,
+        **kwargs,
+    ) -> list[Union[tuple[str], str, Exception]]:
+        """
+        Sends several independent conversations to the OpenAI ChatCompletion API concurrently, as in method `prompt`.
+        A failed conversation does not fail the batch: its exception is returned in place of its response.
+
+        Args:
+            messages_list (list[list[Message]]): A list of conversations, each of which is a list of messages.
+
+            max_concurrency (int): The maximum number of requests in flight at once.
+
+            split (bool): Whether the responses should be split into sentences.
+
+            **kwargs: Additional parameters for every API request. These can include settings such as temperature,
+            top_p, and frequency_penalty.
+
+        Returns:
+            list[Union[tuple[str], str, Exception]]: The responses in the same order as the conversations, as returned
+            by method `prompt`, or the exception that was raised for that conversation.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"Argument `max_concurrency` must be positive. Got {max_concurrency}.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def prompt(messages: list[Message]) -> Union[tuple[str], str, Exception]:
+            async with semaphore:
+                try:
+                    return await self.prompt(messages=messages, split=split, **kwargs)
+                except Exception as error:
+                    logging.info(f"AsyncOpenAIService prompt_many item failed: {error}")
+                    return error
+
+        return list(await asyncio.gather(*(prompt(messages) for messages in messages_list)))
+
+    async def prompt_stream(
+        self, messages: list[Message], init_time: Optional[int] = None, **kwargs
+    ) -> AsyncGenerator[tuple[str, ...], None]:
+        """
+        Sends messages to the OpenAI API and asynchronously yields the response as blocks of sentences. Should be used
+        with `async for`. Yields nothing if the stream was interrupted before it was initialized.
+
+        Args:
+            messages (list[Message]): A list of messages. Each message should be an instance of the `Message` class,
+            which contains the content and role (user or assistant) of the message.
+
+            init_time (Optional[int]): The time at which the stream was initialized.
+
+            **kwargs: Additional parameters for the API request. These can include settings such as temperature, top_p,
+            and frequency_penalty.
+
+        Yields:
+            tuple[str, ...]: Blocks of sentences forming the response from the OpenAI API.
+        """
+        # Record the time at which the stream was initialized, in order to account for future interruptions.
+        init_time = time.perf_counter_ns() if init_time is None else init_time
+
+        if self._interrupt >= init_time:
+            return
+
+        # Obtain a response from the OpenAI ChatCompletion API
+        stream = await self._request(messages=messages, stream=True, **kwargs)
+        entry = (asyncio.get_running_loop(), stream)
+        with self._streams_lock:
+            self._streams.add(entry)
+
+        segmenter = IncrementalSentenceSegmenter()
+        try:
+            async for chunk in stream:
+                if self._interrupt >= init_time:
+                    break
+
+                if chunk.choices and chunk.choices[0].delta.content is not None:
+                    # If the current chunk completes one or more sentences, yield them.
+                    if sentences := await self._segment(segmenter.feed, chunk.choices[0].delta.content):
+                        logging.debug(f"AsyncOpenAIService yielded sentences: {sentences}")
+                        yield sentences
+
+        except Exception:
+            # Closing the response on interruption may cause the pending read to fail; otherwise, propagate the error.
+            if self._interrupt < init_time:
+                raise
+
+        finally:
+            with self._streams_lock:
+                self._streams.discard(entry)
+            await stream.close()
+
+        if self._interrupt < init_time and (sentences := await self._segment(segmenter.flush)):
+            logging.debug(f"AsyncOpenAIService yielded final sentences: {sentences}")
+            yield sentences
+
+        logging.debug("AsyncOpenAIService stream stopped")
+
+    @property
+    def model(self) -> OpenAIModel:
+        """
+        Return the `OpenAIModel` associated with the current instance.
+
+        Returns:
+            OpenAIModel
+        """
+        return self._model
+
+    @staticmethod
+    async def _segment(func: Callable[..., tuple[str, ...]], *args) -> tuple[str, ...]:
+        """
+        Runs a sentence segmentation function in a worker thread, so that the spaCy model does not block the event loop
+        and the other conversations on it. The rule-based backend is fast enough to be run on the event loop directly.
+
+        Args:
+            func (Callable[..., tuple[str, ...]]): The segmentation function.
+            *args: The arguments of the function.
+
+        Returns:
+            tuple[str, ...]: The sentences returned by the function.
+        """
+        if NLP.segmentation_backend() == SegmentationBackend.RULES:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    @staticmethod
+    def _close_stream(stream: openai.AsyncStream) -> None:
+        """
+        Schedules the closing of a response stream on the currently running event loop.
+
+        Args:
+            stream (openai.AsyncStream): The stream to close.
+        """
+        asyncio.ensure_future(stream.close())
+
+    async def _request(self, messages: list[Message], stream: bool, **kwargs) -> Union[openai.AsyncStream, str]:
+        """
+        Sends a request to the OpenAI API and generates a response based on the specified parameters. Retries are
+        awaited on the event loop rather than blocking the calling thread.
+
+        Args:
+            messages (list[Message]): A list of messages. Each message should be an instance of the `Message` class,
+            which contains the content and role (user or assistant) of the message.
+
+            stream (bool): Whether the response should be returned as an asynchronous stream or a complete text.
+
+            **kwargs: Additional parameters for the API request. These can include settings such as temperature, top_p,
+            and frequency_penalty.
+
+        Returns:
+            Union[openai.AsyncStream, str]: The response from the OpenAI API, either as a stream or text (str).
+        """
+        request = OpenAIRequest(
+            service="AsyncOpenAIService",
+            rate_limiter=self.__class__.rate_limiter,
+            model=self._model,
+            messages=messages,
+            stream=stream,
+            **kwargs,
+        )
+        client = self.__class__.client()
+        for attempt in request.attempts():
+            # Wait in the process-wide queue until the request may be sent without exceeding the rate limits.
+            await self.__class__.rate_limiter.acquire_async(tokens=request.tokens)
+            try:
+                return request.parse(await client.chat.completions.with_raw_response.create(**request.kwargs))
+            except openai.APIError as error:
+                await asyncio.sleep(request.retry_time(attempt=attempt, error=error))
+
+        raise request.failure()
@@ -1,20 +1,30 @@
-import datetime
+import functools
 import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterator, Optional, Union
 
+import httpx
 import openai
 
-from banterbot.config import RETRY_LIMIT, RETRY_TIME
-from banterbot.data.enums import EnvVar
+from banterbot import config
+from banterbot.data.enums import EnvVar, StreamRecordingKind
 from banterbot.handlers.stream_handler import StreamHandler
 from banterbot.managers.stream_manager import StreamManager
 from banterbot.models.message import Message
 from banterbot.models.openai_model import OpenAIModel
-from banterbot.models.stream_log_entry import StreamLogEntry
+from banterbot.models.openai_stream_state import OpenAIStreamState
+from banterbot.models.stream_stats import StreamStats
 from banterbot.utils.nlp import NLP
+from banterbot.utils.openai_request import OpenAIRequest
+from banterbot.utils.rate_limiter import RateLimiter
+from banterbot.utils.response_cache import ResponseCache
+from banterbot.utils.stream_log import StreamLog
+from banterbot.utils.stream_recorder import StreamRecorder
+from banterbot.utils.stream_replay import StreamReplay
+from banterbot.utils.stream_stats_aggregator import StreamStatsAggregator
 
 
 class OpenAIService:
@@ -30,26 +40,35 @@ class OpenAIService:
 
     api_key_set = False
     client = None
+    rate_limiter = None
 
-    def __init__(self, model: OpenAIModel) -> None:
+    # Process-wide counters of the streams that were cancelled upstream on interruption (see `cancellation_stats`).
+    _cancellations = {"streams": 0, "chunks_received": 0, "bytes_received": 0, "max_tokens_saved": 0}
+    _cancellations_lock = threading.Lock()
+
+    def __init__(self, model: OpenAIModel, cache: Optional[ResponseCache] = None) -> None:
         """
         Initializes an `OpenAIService` instance for a specific model.
 
         Args:
             model (OpenAIModel): The OpenAI model to be used. This should be an instance of the OpenAIModel class, which
             contains information about the model, such as its name and maximum token limit.
+
+            cache (Optional[ResponseCache]): An optional cache in which deterministic (temperature zero) responses to
+            method `prompt` are stored and reused. Can be shared between instances.
         """
         logging.debug(f"OpenAIService initialized")
 
-        # Set the OpenAI API key
+        # Set the OpenAI API key and initialize the shared client with the default connection pool settings.
         if not self.__class__.api_key_set:
-            api_key = os.environ.get(EnvVar.OPENAI_API_KEY.value)
-            self.__class__.client = openai.OpenAI(api_key=api_key)
-            self.__class__.api_key_set = True
+            self.__class__.configure_client()
 
         # The selected model that will be used in OpenAI ChatCompletion prompts.
         self._model = model
 
+        # The optional cache for deterministic responses.
+        self._cache = cache
+
         # Indicates whether the current instance of `OpenAIService` is streaming.
         self._streaming = False
 
@@ -60,11 +79,74 @@ class OpenAIService:
         self._stream_manager = StreamManager()
         self._stream_manager.connect_processor(self._processor)
         self._stream_manager.connect_completion_handler(self._completion_handler)
+        self._stream_manager.connect_stats_handler(self._stats_handler)
 
         # A list of active stream handlers.
         self._stream_handlers = []
         self._stream_handlers_lock = threading.Lock()
 
+        # The optional recorder of the streams.
+        self._recorder: Optional[StreamRecorder] = None
+
+    @classmethod
+    def configure_client(
+        cls,
+        max_connections: int = config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = config.HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout: float = config.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = config.HTTP_READ_TIMEOUT,
+        http2: bool = config.HTTP2,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None,
+    ) -> None:
+        """
+        (Re)initializes the OpenAI client shared by all instances of `OpenAIService` with a persistent HTTP connection
+        pool. Should be called before any instances are created if the default settings in `config.py` are not
+        suitable. Retries are disabled in the client itself, since they are handled by `_request` and the shared rate
+        limiter.
+
+        Args:
+            max_connections (int): The maximum number of concurrent connections to the OpenAI API.
+            max_keepalive_connections (int): The maximum number of idle connections kept alive in the pool.
+            keepalive_expiry (float): The number of seconds after which an idle connection is closed.
+            connect_timeout (float): The number of seconds to wait for a connection to be established.
+            read_timeout (float): The number of seconds to wait for data to be received, or to be sent.
+            http2 (bool): Whether HTTP/2 should be used; ignored with a warning if the `h2` package is not installed.
+            base_url (Optional[str]): An alternative base URL for the API, such as a proxy or a local server.
+            http_client (Optional[httpx.Client]): A preconfigured HTTP client, overriding the settings above.
+        """
+        if http_client is None:
+            options = OpenAIRequest.http_client_options(
+                service="OpenAIService",
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                http2=http2,
+            )
+            http_client = httpx.Client(**options)
+
+        cls.client = openai.OpenAI(
+            api_key=os.environ.get(EnvVar.OPENAI_API_KEY.value),
+            base_url=base_url,
+            max_retries=0,
+            http_client=http_client,
+        )
+        cls.rate_limiter = RateLimiter.default()
+        cls.api_key_set = True
+
+    def connect_recorder(self, recorder: Optional[StreamRecorder]) -> None:
+        """
+        Connects an optional recorder, with which all subsequent ChatCompletion streams are recorded for later replay
+        (see class `StreamReplay`). Passing None disconnects the current recorder.
+
+        Args:
+            recorder (Optional[StreamRecorder]): The recorder to be used.
+        """
+        self._recorder = recorder
+
     def interrupt(self, kill: bool = False) -> None:
         """
         Interrupts the current OpenAI ChatCompletion process.
@@ -79,6 +161,37 @@ class OpenAIService:
             self._stream_handlers.clear()
         logging.debug(f"OpenAIService Interrupted")
 
+    def warmup(self, connections: int = config.WARMUP_CONNECTIONS) -> int:
+        """
+        Opens connections to the OpenAI API in advance, so that the first prompt does not pay for DNS resolution and
+        the TCP/TLS handshakes. Each connection is opened by a concurrent request for the metadata of the model, which
+        does not count against the ChatCompletion rate limits. Blocks until all requests are done, so it is meant to be
+        run in a background thread at startup.
+
+        Args:
+            connections (int): The number of connections to open, up to the size of the keep-alive pool.
+
+        Returns:
+            int: The number of connections that were successfully opened.
+        """
+        successes = []
+
+        def request() -> None:
+            try:
+                self.__class__.client.models.retrieve(self._model.model)
+                successes.append(True)
+            except (openai.APIError, httpx.HTTPError) as error:
+                logging.debug(f"OpenAIService warmup request failed: {error}")
+
+        threads = [threading.Thread(target=request, daemon=True) for _ in range(connections)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        logging.debug(f"OpenAIService warmed up {len(successes)}/{connections} connections")
+        return len(successes)
+
     def count_tokens(self, string: str) -> int:
         """
         Counts the number of tokens in the provided string.
@@ -108,11 +221,60 @@ class OpenAIService:
             Union[list[str], str]: A list of sentences forming the response from the OpenAI API. This can be used to
             display the generated response to the user or for further processing. If `split` is False, returns a string.
         """
-        response = self._request(messages=messages, stream=False, **kwargs)
+        # Only deterministic requests are cached, since sampled responses are expected to vary between calls.
+        if self._cache is not None and kwargs.get("temperature") == 0.0:
+            key = self._cache.key(model=self._model.model, messages=[message() for message in messages], kwargs=kwargs)
+            if (response := self._cache.get(key)) is None:
+                response = self._request(messages=messages, stream=False, **kwargs)
+                self._cache.put(key, response)
+        else:
+            response = self._request(messages=messages, stream=False, **kwargs)
         logging.debug(f"OpenAIService stream processed block: `{response}`")
         sentences = NLP.segment_sentences(response) if split else response
         return sentences
 
+    def prompt_many(
+        self,
+        messages_list: list[list[Message]],
+        max_concurrency: int = config.PROMPT_MANY_MAX_CONCURRENCY,
+        split: bool = True,
+        **kwargs,
+    ) -> list[Union[tuple[str], str, Exception]]:
+        """
+        Sends several independent conversations to the OpenAI ChatCompletion API concurrently, for offline batch jobs.
+        Each conversation is handled as in method `prompt` (including retries, caching, and the shared rate limiter), so
+        throughput is bounded by the concurrency limit and the rate limits rather than by the round-trip time.
+
+        A failed conversation does not fail the batch: its exception is returned in place of its response.
+
+        Args:
+            messages_list (list[list[Message]]): A list of conversations, each of which is a list of messages.
+
+            max_concurrency (int): The maximum number of requests in flight at once. Values above the size of the HTTP
+            connection pool (see method `configure_client`) will wait for connections to become available.
+
+            split (bool): Whether the responses should be split into sentences.
+
+            **kwargs: Additional parameters for every API request. These can include settings such as temperature,
+            top_p, and frequency_penalty.
+
+        Returns:
+            list[Union[tuple[str], str, Exception]]: The responses in the same order as the conversations, as returned
+            by method `prompt`, or the exception that was raised for that conversation.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"Argument `max_concurrency` must be positive. Got {max_concurrency}.")
+
+        def prompt(messages: list[Message]) -> Union[tuple[str], str, Exception]:
+            try:
+                return self.prompt(messages=messages, split=split, **kwargs)
+            except Exception as error:
+                logging.info(f"OpenAIService prompt_many item failed: {error}")
+                return error
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="OpenAIService") as executor:
+            return list(executor.map(prompt, messages_list))
+
     def prompt_stream(
         self, messages: list[Message], init_time: Optional[int] = None, **kwargs
     ) -> Union[StreamHandler, tuple[()]]:
@@ -130,7 +292,8 @@ class OpenAIService:
 
         Returns:
             Union[StreamHandler, tuple[()]]: A handler for the stream of blocks of sentences forming the response from
-                the OpenAI API or an empty tuple if the stream was interrupted.
+                the OpenAI API or an empty tuple if the stream was interrupted. Its latency measurements, starting from
+                the request, are available through property `stats`.
         """
         # Record the time at which the stream was initialized pre-lock, in order to account for future interruptions.
         init_time = time.perf_counter_ns() if init_time is None else init_time
@@ -138,18 +301,64 @@ class OpenAIService:
         if self._interrupt >= init_time:
             return tuple()
         else:
-            # Obtain a response from the OpenAI ChatCompletion API
+            # Obtain a response from the OpenAI ChatCompletion API, measuring latency from the start of the request.
+            stats = StreamStats()
             stream = self._request(messages=messages, stream=True, **kwargs)
+            stats.record_response()
+            iterable = stream if self._recorder is None else self._recorder.record(stream, StreamRecordingKind.OPENAI)
+            handler = self._stream_manager.stream(
+                iterable=iterable,
+                # Close the HTTP response on interruption, so that the OpenAI API stops generating the response.
+                close_stream=functools.partial(self._close_stream, stream, stats, messages, kwargs.get("max_tokens")),
+                init_shared_data=OpenAIStreamState(init_time=init_time),
+                stats=stats,
+            )
+            with self._stream_handlers_lock:
+                self._stream_handlers.append(handler)
+
+            return handler
+
+    def replay_stream(self, replay: StreamReplay, init_time: Optional[int] = None) -> Union[StreamHandler, tuple[()]]:
+        """
+        Processes a stream recorded from the OpenAI API (see class `StreamRecorder`) exactly like method
+        `prompt_stream` processes a live one, without sending any request.
+
+        Args:
+            replay (StreamReplay): The replay of a recorded ChatCompletion stream.
+            init_time (Optional[int]): The time at which the stream was initialized.
+
+        Returns:
+            Union[StreamHandler, tuple[()]]: A handler for the stream of blocks of sentences forming the recorded
+                response, or an empty tuple if the stream was interrupted.
+        """
+        if replay.kind != StreamRecordingKind.OPENAI:
+            raise ValueError("Method `replay_stream` of class `OpenAIService` expects an OpenAI recording.")
+
+        init_time = time.perf_counter_ns() if init_time is None else init_time
+
+        if self._interrupt >= init_time:
+            return tuple()
+        else:
             handler = self._stream_manager.stream(
-                iterable=stream,
-                # close_stream=stream.response.close,
-                init_shared_data={"text": "", "sentences": [], "init_time": init_time},
+                iterable=replay,
+                close_stream=replay.close,
+                init_shared_data=OpenAIStreamState(init_time=init_time),
             )
             with self._stream_handlers_lock:
                 self._stream_handlers.append(handler)
 
             return handler
 
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """
+        Return the `ResponseCache` associated with the current instance, if any.
+
+        Returns:
+            Optional[ResponseCache]
+        """
+        return self._cache
+
     @property
     def model(self) -> OpenAIModel:
         """
@@ -160,53 +369,111 @@ class OpenAIService:
         """
         return self._model
 
-    def _processor(self, log: list[StreamLogEntry], index: int, shared_data: dict) -> list[str]:
+    def _processor(self, log: StreamLog, index: int, shared_data: OpenAIStreamState) -> list[str]:
         """
         Parses a chunk of data from the OpenAI API response.
 
         Args:
-            log (list[StreamLogEntry]): A list of `StreamLogEntry` instances containing the data from the OpenAI API
+            log (StreamLog): The log of `StreamLogEntry` instances containing the data from the OpenAI API
             response.
             index (int): The index of the current chunk of data.
-            shared_data (dict): A dictionary containing shared data between the stream handler and the processor.
+            shared_data (OpenAIStreamState): The state shared between the stream handler and the processor.
 
         Returns:
             list[str]: A list of sentences parsed from the chunk.
         """
-        if shared_data["interrupt"] >= shared_data["init_time"]:
+        if shared_data.interrupt >= shared_data.init_time:
             raise StopIteration
         else:
             if log[index].value.choices[0].delta.content is not None:
-                shared_data["text"] += log[index].value.choices[0].delta.content
-
-            shared_data["sentences"] = NLP.segment_sentences(shared_data["text"])
+                sentences = shared_data.segmenter.feed(log[index].value.choices[0].delta.content)
 
-            # If the current chunk is not the final chunk of data from the OpenAI API response, parse the chunk.
-            if len(shared_data["sentences"]) > 1:
-                shared_data["text"] = shared_data["sentences"][-1]
-                logging.debug(f"OpenAIService yielded sentences: {shared_data['sentences'][:-1]}")
-                return shared_data["sentences"][:-1]
+                # If the current chunk completes one or more sentences, yield them.
+                if sentences:
+                    logging.debug(f"OpenAIService yielded sentences: {sentences}")
+                    return sentences
 
-    def _completion_handler(self, log: list[StreamLogEntry], shared_data: dict) -> list[str]:
+    def _completion_handler(self, log: StreamLog, shared_data: OpenAIStreamState) -> list[str]:
         """
         Handles the completion of the OpenAI API response.
 
         Args:
-            log (list[StreamLogEntry]): A list of `StreamLogEntry` instances containing the data from the OpenAI API
+            log (StreamLog): The log of `StreamLogEntry` instances containing the data from the OpenAI API
             response.
-            shared_data (dict): A dictionary containing shared data between the stream handler and the processor.
+            shared_data (OpenAIStreamState): The state shared between the stream handler and the processor.
 
         Returns:
             list[str]: A list of sentences parsed from the chunk.
         """
-        if shared_data["interrupt"] >= shared_data["init_time"]:
+        if shared_data.interrupt >= shared_data.init_time:
             raise StopIteration
         else:
             # If the current chunk is the final chunk of data from the OpenAI API response, parse the final chunk.
-            shared_data["sentences"] = NLP.segment_sentences(shared_data["text"])
-            logging.debug(f"OpenAIService yielded final sentences: {shared_data['sentences'][:-1]}")
+            sentences = shared_data.segmenter.flush()
+            logging.debug(f"OpenAIService yielded final sentences: {sentences}")
             logging.debug("OpenAIService stream stopped")
-            return shared_data["sentences"]
+            return sentences
+
+    @classmethod
+    def cancellation_stats(cls) -> dict[str, int]:
+        """
+        The number of streams that were cancelled upstream (their HTTP response closed) because they were interrupted
+        before the OpenAI API finished sending them (`streams`), and the numbers of chunks and bytes received from them
+        before they were closed (`chunks_received`, `bytes_received`).
+
+        The number of tokens that were not generated cannot be known, since the length of the rest of each response is
+        unknown; `max_tokens_saved` is only an upper bound of it. For each stream, it is the number of tokens that the
+        OpenAI API could still have generated: the `max_tokens` limit of the request if any, or else the context window
+        of the model minus the tokens of the prompt, minus the chunks received (about one token each). Responses usually
+        end well before either limit, so the bound is loose, especially for requests without a `max_tokens` limit.
+
+        Returns:
+            dict[str, int]: The cancellation statistics of all instances.
+        """
+        with cls._cancellations_lock:
+            return cls._cancellations.copy()
+
+    def _close_stream(
+        self,
+        stream: openai.Stream,
+        stats: StreamStats,
+        messages: list[Message],
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Closes the HTTP response of an interrupted stream, so that the OpenAI API stops generating (and billing) it and
+        the thread consuming it is released, then counts the cancellation (see method `cancellation_stats`).
+
+        Args:
+            stream (openai.Stream): The stream to close.
+            stats (StreamStats): The latency measurements of the stream.
+            messages (list[Message]): The messages of the request.
+            max_tokens (Optional[int]): The `max_tokens` limit of the request, if any.
+        """
+        stream.close()
+
+        # Without a `max_tokens` limit, the response is only limited by the context window of the model.
+        if not max_tokens:
+            max_tokens = self._model.max_tokens - sum(message.count_tokens(model=self._model) for message in messages)
+
+        with self._cancellations_lock:
+            self._cancellations["streams"] += 1
+            self._cancellations["chunks_received"] += stats.chunks
+            self._cancellations["bytes_received"] += stream.response.num_bytes_downloaded
+            self._cancellations["max_tokens_saved"] += max(max_tokens - stats.chunks, 0)
+        logging.debug(f"OpenAIService closed an interrupted stream after {stats.chunks} chunks")
+
+    @staticmethod
+    def _stats_handler(stats: StreamStats) -> None:
+        """
+        Adds the latency measurements of a finished stream to the process-wide `StreamStatsAggregator`, if enabled.
+
+        Args:
+            stats (StreamStats): The latency measurements of the stream.
+        """
+        logging.debug(f"OpenAIService stream stats: {stats}")
+        if (aggregator := StreamStatsAggregator.instance()) is not None:
+            aggregator.add(stats)
 
     def _request(self, messages: list[Message], stream: bool, **kwargs) -> Union[Iterator, str]:
         """
@@ -224,39 +491,20 @@ class OpenAIService:
         Returns:
             Union[Iterator, str]: The stream from the OpenAI API, either as a stream (Iterator) or text (str).
         """
-        kwargs["model"] = self._model.model
-        kwargs["n"] = 1
-        kwargs["stream"] = stream
-        kwargs["messages"] = [message() for message in messages]
-        success = False
-        for i in range(RETRY_LIMIT):
+        request = OpenAIRequest(
+            service="OpenAIService",
+            rate_limiter=self.__class__.rate_limiter,
+            model=self._model,
+            messages=messages,
+            stream=stream,
+            **kwargs,
+        )
+        for attempt in request.attempts():
+            # Wait in the process-wide queue until the request may be sent without exceeding the rate limits.
+            self.__class__.rate_limiter.acquire(tokens=request.tokens)
             try:
-                response = self.__class__.client.chat.completions.create(**kwargs)
-                success = True
-                break
-
-            except openai.RateLimitError:
-                retry_timestamp = datetime.datetime.now() + datetime.timedelta(seconds=RETRY_TIME)
-                retry_timestamp = datetime.datetime.strftime(retry_timestamp, "%H:%M:%S")
-                error_message = (
-                    f"OpenAIService encountered an OpenAI Rate Limiting Error - Attempt {i+1}/{RETRY_LIMIT}."
-                    f" Waiting {RETRY_TIME} seconds until {retry_timestamp} to retry."
-                )
-                logging.info(error_message)
-                time.sleep(RETRY_TIME)
-
-            except openai.APIError:
-                retry_time = 0.25
-                retry_timestamp = datetime.datetime.now() + datetime.timedelta(seconds=retry_time)
-                retry_timestamp = retry_timestamp.strftime("%H:%M:%S")
-                error_message = (
-                    f"OpenAIService encountered an OpenAI API Error - Attempt {i+1}/{RETRY_LIMIT}. Waiting "
-                    f"{retry_time} seconds until {retry_timestamp} to retry."
-                )
-                logging.info(error_message)
-                time.sleep(retry_time)
-
-        if not success:
-            raise RuntimeError(f"OpenAIService encountered too many OpenAI API Errors; exiting program.")
-
-        return response if stream else response.choices[0].message.content.strip()
+                return request.parse(self.__class__.client.chat.completions.with_raw_response.create(**request.kwargs))
+            except openai.APIError as error:
+                time.sleep(request.retry_time(attempt=attempt, error=error))
+
+        raise request.failure()
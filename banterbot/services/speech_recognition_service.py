@@ -3,18 +3,21 @@ import logging
 import os
 import threading
 import time
+from collections.abc import Callable
 from typing import Optional, Union
 
 import azure.cognitiveservices.speech as speechsdk
 
 from banterbot.config import DEFAULT_LANGUAGE, INTERRUPTION_DELAY
-from banterbot.data.enums import EnvVar
+from banterbot.data.enums import EnvVar, StreamRecordingKind
 from banterbot.handlers.speech_recognition_handler import SpeechRecognitionHandler
 from banterbot.handlers.stream_handler import StreamHandler
 from banterbot.managers.stream_manager import StreamManager
 from banterbot.models.speech_recognition_input import SpeechRecognitionInput
-from banterbot.models.stream_log_entry import StreamLogEntry
+from banterbot.models.speech_recognition_stream_state import SpeechRecognitionStreamState
 from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.stream_log import StreamLog
+from banterbot.utils.stream_recorder import StreamRecorder
 
 
 class SpeechRecognitionService:
@@ -42,6 +45,12 @@ class SpeechRecognitionService:
             languages (Union[str, list[str]): The language(s) the speech-to-text recognizer expects to hear.
             phrase_list(list[str], optional): Optionally provide the recognizer with context to improve recognition.
         """
+        # An optional callback that receives the partial transcripts of the utterance currently being recognized.
+        self._recognizing_handler: Optional[Callable[[str], None]] = None
+
+        # The optional recorder of the recognized speech.
+        self._recorder: Optional[StreamRecorder] = None
+
         # Initialize the `SpeechRecognizer`.
         self._init_recognizer(languages=languages, phrase_list=phrase_list)
 
@@ -73,6 +82,27 @@ class SpeechRecognitionService:
             self._stream_handlers.clear()
         logging.debug(f"SpeechRecognitionService Interrupted")
 
+    def connect_recognizing_handler(self, func: Optional[Callable[[str], None]]) -> None:
+        """
+        Connects an optional handler function that is called with the partial transcript of the utterance currently
+        being recognized, each time it is updated by the recognizer (before the utterance is finalized). Passing None
+        disconnects the current handler.
+
+        Args:
+            func (Optional[Callable[[str], None]]): The handler function to be used.
+        """
+        self._recognizing_handler = func
+
+    def connect_recorder(self, recorder: Optional[StreamRecorder]) -> None:
+        """
+        Connects an optional recorder, with which all subsequent recognized speech inputs are recorded for later replay
+        (see class `StreamReplay`). Passing None disconnects the current recorder.
+
+        Args:
+            recorder (Optional[StreamRecorder]): The recorder to be used.
+        """
+        self._recorder = recorder
+
     def phrases_add(self, phrases: list[str]) -> None:
         """
         Add a new phrase to the PhraseListGrammar instance, which implements a bias towards the specified words/phrases
@@ -113,7 +143,13 @@ class SpeechRecognitionService:
 
                 iterable = SpeechRecognitionHandler(recognizer=self._recognizer, queue=self._queue)
                 handler = self._stream_manager.stream(
-                    iterable=iterable, close_stream=iterable.close, init_shared_data={"init_time": init_time}
+                    iterable=(
+                        iterable
+                        if self._recorder is None
+                        else self._recorder.record(iterable, StreamRecordingKind.SPEECH_RECOGNITION)
+                    ),
+                    close_stream=iterable.close,
+                    init_shared_data=SpeechRecognitionStreamState(init_time=init_time),
                 )
                 with self._stream_handlers_lock:
                     self._stream_handlers.append(handler)
@@ -217,12 +253,12 @@ class SpeechRecognitionService:
         logging.debug("SpeechRecognitionService connected")
         self._start_recognition_time = time.perf_counter_ns()
 
-    def exception_handler(self, log: list[StreamLogEntry], index: int, shared_data: dict):
+    def exception_handler(self, log: StreamLog, index: int, shared_data: SpeechRecognitionStreamState):
         """
         Handles exceptions that occur during the processing of the stream log.
         """
         cutoff = (
-            datetime.timedelta(microseconds=1e-3 * (shared_data["interrupt"] - shared_data["init_time"]))
+            datetime.timedelta(microseconds=1e-3 * (shared_data.interrupt - shared_data.init_time))
             + INTERRUPTION_DELAY
         )
         if log[index].offset - self._total_offset > cutoff:
@@ -250,11 +286,22 @@ class SpeechRecognitionService:
             )
         )
 
+    def _callback_recognizing(self, event: speechsdk.SpeechRecognitionEventArgs) -> None:
+        """
+        Forwards the partial transcript of a recognizing speech event to the connected handler, if any.
+
+        Args:
+            event (speechsdk.SpeechRecognitionEventArgs): The recognizing speech event.
+        """
+        if (handler := self._recognizing_handler) is not None and event.result.text:
+            handler(event.result.text)
+
     def _callbacks_connect(self) -> None:
         """
         Connects the recognizer events to their corresponding callback methods.
         """
         self._recognizer.session_started.connect(self._callback_started)
+        self._recognizer.recognizing.connect(self._callback_recognizing)
         self._recognizer.recognized.connect(self._callback_recognized)
         self._recognizer.canceled.connect(self._callback_completed)
         self._recognizer.session_stopped.connect(self._callback_completed)
@@ -4,17 +4,19 @@ import os
 import threading
 import time
 from collections.abc import Generator
-from typing import Optional
+from typing import Optional, Union
 
 import azure.cognitiveservices.speech as speechsdk
 import numba as nb
 from azure.cognitiveservices.speech import SpeechSynthesisOutputFormat
 
+from banterbot.config import SPEECH_SYNTHESIS_QUEUE_MAXSIZE
 from banterbot.data.enums import EnvVar
 from banterbot.handlers.speech_synthesis_handler import SpeechSynthesisHandler
 from banterbot.models.phrase import Phrase
 from banterbot.models.word import Word
 from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.stream_recorder import StreamRecorder
 
 
 class SpeechSynthesisService:
@@ -30,6 +32,7 @@ class SpeechSynthesisService:
     def __init__(
         self,
         output_format: SpeechSynthesisOutputFormat = SpeechSynthesisOutputFormat.Audio16Khz32KBitRateMonoMp3,
+        queue_maxsize: int = SPEECH_SYNTHESIS_QUEUE_MAXSIZE,
     ) -> None:
         """
         Initializes an instance of the `SpeechSynthesisService` class with a specified output format.
@@ -37,6 +40,8 @@ class SpeechSynthesisService:
         Args:
             output_format (SpeechSynthesisOutputFormat, optional): The desired output format for the synthesized speech.
             Default is Audio16Khz32KBitRateMonoMp3.
+            queue_maxsize (int, optional): The maximum number of synthesized words buffered until they are consumed;
+            when reached, the synthesizer's word boundary events block until the consumer catches up. Zero for no limit.
         """
         # Initialize the output format
         self._output_format = output_format
@@ -45,7 +50,7 @@ class SpeechSynthesisService:
         self._init_synthesizer(output_format=self._output_format)
 
         # Initialize the queue for storing the words as they are synthesized
-        self._queue = CloseableQueue()
+        self._queue = CloseableQueue(maxsize=queue_maxsize)
 
         # The iterable that is currently being iterated over
         self._iterable: Optional[SpeechSynthesisHandler] = None
@@ -53,6 +58,19 @@ class SpeechSynthesisService:
         # The latest interruption time.
         self._interrupt = 0
 
+        # The optional recorder of the word boundary events.
+        self._recorder: Optional[StreamRecorder] = None
+
+    def connect_recorder(self, recorder: Optional[StreamRecorder]) -> None:
+        """
+        Connects an optional recorder, with which the word boundary events of all subsequent syntheses are recorded for
+        later replay (see class `StreamReplay`). Passing None disconnects the current recorder.
+
+        Args:
+            recorder (Optional[StreamRecorder]): The recorder to be used.
+        """
+        self._recorder = recorder
+
     def interrupt(self) -> None:
         """
         Interrupts the current speech synthesis process.
@@ -68,12 +86,15 @@ class SpeechSynthesisService:
         self._init_synthesizer(output_format=self._output_format)
         logging.debug(f"SpeechSynthesisService Interrupted")
 
-    def synthesize(self, phrases: list[Phrase], init_time: Optional[int] = None) -> Generator[Word, None, None]:
+    def synthesize(
+        self, phrases: Union[list[Phrase], str], init_time: Optional[int] = None
+    ) -> Generator[Word, None, None]:
         """
         Synthesizes the given phrases into speech and returns a handler for the stream of synthesized words.
 
         Args:
-            phrases (list[Phrase]): The input phrases that are to be converted into speech.
+            phrases (Union[list[Phrase], str]): The input phrases that are to be converted into speech, or an SSML
+            string created from them in advance with method `SpeechSynthesisHandler.phrases_to_ssml`.
             init_time (Optional[int]): The time at which the synthesis was initialized.
 
         Returns:
@@ -87,7 +108,7 @@ class SpeechSynthesisService:
             else:
                 self._queue.reset()
                 self._iterable = SpeechSynthesisHandler(
-                    phrases=phrases, synthesizer=self._synthesizer, queue=self._queue
+                    phrases=phrases, synthesizer=self._synthesizer, queue=self._queue, recorder=self._recorder
                 )
 
                 for i in self._iterable:
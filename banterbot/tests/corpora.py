@@ -0,0 +1,33 @@
+# Short texts split into their reference sentences, with whitespace preserved (so that the sentences of each text add
+# up to the text), covering the cases that rule-based sentence segmentation must handle: abbreviations, initials,
+# decimal numbers, ellipses, quotes, brackets, numbered lists, line breaks and full-width punctuation.
+SENTENCES = [
+    ["Hello there. ", "How are you?"],
+    ["I met Mr. Smith yesterday. ", "He was fine."],
+    ["Dr. Jones arrived at 5 p.m. and left."],
+    ["Wait... ", "What was that?"],
+    ["It costs $3.50 today. ", "Tomorrow it's more."],
+    ['"Really?" she asked.'],
+    ['He said "Stop." ', "Then he left."],
+    ["J. R. R. Tolkien wrote books. ", "They are long."],
+    ["Use tools, e.g. hammers. ", "Or saws."],
+    ["Steps:\n", "1. Open the box.\n", "2. Take it out."],
+    ["Wow! ", "That's great!! ", "Isn't it?"],
+    ["This is the U.S. economy."],
+    ["你好。", "我很好！"],
+    ["Call me at 555.1234 please."],
+    ["The end"],
+    ["I love apples, pears, etc. ", "They are tasty."],
+    ["What?! ", "No way."],
+    ["(This is a parenthetical.) ", "And another."],
+    ["She lives on Main St. near the park."],
+    ["Version 3.11 is out. ", "Upgrade now!"],
+    ["Ok. ", "Sure. ", "Fine."],
+    ["The ship was called the S.S. Minnow."],
+    ["Prof. Xavier teaches. ", "Students listen."],
+    ['He yelled, "Run!" ', "And they ran."],
+    ["Is it 3 o'clock? ", "Yes."],
+    ["A sentence with an ellipsis… ", "Another one."],
+    ["Line one\n", "Line two"],
+    ["He arrived in the U.K. ", "Then he left."],
+]
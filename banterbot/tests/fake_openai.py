@@ -0,0 +1,59 @@
+import os
+import unittest
+from typing import Any
+from unittest import mock
+
+from banterbot.data.enums import EnvVar
+from banterbot.managers.openai_model_manager import OpenAIModelManager
+from banterbot.models.openai_model import OpenAIModel
+from banterbot.services.openai_service import OpenAIService
+from banterbot.utils.fake_openai_server import FakeOpenAIServer
+
+
+class FakeOpenAITestCase(unittest.TestCase):
+    """
+    A base class for tests that send requests through `OpenAIService` to a local `FakeOpenAIServer` instead of the
+    OpenAI API. The server is started once per test class with the options in `server_options`, its counters are reset
+    before every test, and the shared client of `OpenAIService` is reconfigured to the default on teardown.
+
+    The tests are skipped if the tokenizer of the model cannot be loaded (`tiktoken` downloads its encodings on first
+    use), since `OpenAIModel` requires it.
+    """
+
+    # The keyword arguments of the `FakeOpenAIServer` of the test class.
+    server_options: dict[str, Any] = {}
+
+    # The name of the model requested from the server.
+    model_name = "gpt-4o"
+
+    model: OpenAIModel
+    server: FakeOpenAIServer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        try:
+            cls.model = OpenAIModelManager.load(cls.model_name)
+        except OSError as error:
+            raise unittest.SkipTest(f"the tokenizer of model `{cls.model_name}` is unavailable: {error}")
+
+        cls.server = FakeOpenAIServer(**cls.server_options).start()
+        cls.addClassCleanup(cls.server.stop)
+
+        # The fake server ignores the API key, but the OpenAI client refuses to be created without one.
+        api_key = os.environ.get(EnvVar.OPENAI_API_KEY.value, "-")
+        with mock.patch.dict(os.environ, {EnvVar.OPENAI_API_KEY.value: api_key}):
+            OpenAIService.configure_client(base_url=cls.server.base_url)
+        cls.addClassCleanup(setattr, OpenAIService, "api_key_set", False)
+
+    def setUp(self) -> None:
+        self.server.reset_stats()
+
+    def service(self) -> OpenAIService:
+        """
+        Creates an `OpenAIService` that sends its requests to the fake server.
+
+        Returns:
+            OpenAIService: The service.
+        """
+        return OpenAIService(model=self.model)
@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+import unittest
+from typing import Callable
+
+from banterbot.utils.closeable_queue import CloseableQueue
+
+
+class TestCloseableQueue(unittest.TestCase):
+    """
+    Checks that a bounded `CloseableQueue` delivers every item in order to a slower consumer, and that puts blocked on
+    a full queue give up as soon as it is closed, killed, or reset, without waiting for a polling interval.
+    """
+
+    def blocked_put(self, queue_: CloseableQueue) -> tuple[threading.Thread, list[bool]]:
+        """
+        Starts a thread that puts an item into a full queue, and waits until it is blocked.
+
+        Args:
+            queue_ (CloseableQueue): The full queue.
+
+        Returns:
+            tuple[threading.Thread, list[bool]]: The thread, and the list to which it appends the result of the put.
+        """
+        results = []
+        thread = threading.Thread(target=lambda: results.append(queue_.put("blocked")))
+        thread.start()
+        while not thread.is_alive() or not queue_._not_full._waiters:
+            time.sleep(0.001)
+        return thread, results
+
+    def assert_put_released(self, release: Callable[[CloseableQueue], None]) -> None:
+        """
+        Checks that a put blocked on a full queue promptly returns False once the queue is released.
+
+        Args:
+            release (Callable[[CloseableQueue], None]): Closes, kills, or resets the queue.
+        """
+        queue_ = CloseableQueue(maxsize=1)
+        queue_.put("first")
+        thread, results = self.blocked_put(queue_)
+        start = time.perf_counter()
+        release(queue_)
+        thread.join(timeout=1.0)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(results, [False])
+
+    def test_bounded_delivery(self) -> None:
+        queue_ = CloseableQueue(maxsize=2)
+        items = 1000
+        sizes = []
+
+        def produce() -> None:
+            with queue_:
+                for item in range(items):
+                    queue_.put(item)
+                    sizes.append(queue_.qsize())
+
+        threading.Thread(target=produce).start()
+        received = []
+        for item in queue_:
+            received.append(item)
+            time.sleep(0.0001)
+        self.assertEqual(received, list(range(items)))
+        self.assertLessEqual(max(sizes), 2)
+
+    def test_close_releases_put(self) -> None:
+        self.assert_put_released(CloseableQueue.close)
+
+    def test_kill_releases_put(self) -> None:
+        self.assert_put_released(CloseableQueue.kill)
+
+    def test_reset_releases_put(self) -> None:
+        self.assert_put_released(CloseableQueue.reset)
+
+    def test_full_and_empty(self) -> None:
+        queue_ = CloseableQueue(maxsize=1)
+        self.assertRaises(queue.Empty, queue_.get, timeout=0.01)
+        queue_.put("first")
+        self.assertRaises(queue.Full, queue_.put, "second", block=False)
+        self.assertRaises(queue.Full, queue_.put, "second", timeout=0.01)
+        self.assertEqual(queue_.get(), "first")
+        self.assertTrue(queue_.put("second", timeout=0.01))
+        self.assertEqual(queue_.get_batch(), ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
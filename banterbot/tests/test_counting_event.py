@@ -0,0 +1,83 @@
+import threading
+import unittest
+from typing import Any, Callable
+
+from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.counting_event import CountingEvent
+
+
+class TestCountingEvent(unittest.TestCase):
+    """
+    Stress tests of `CountingEvent` and of the `CloseableQueue` built on it, with several concurrent producers (see
+    `benchmarks/counting_event.py` for their throughput).
+    """
+
+    producers = 8
+    items = 20000
+
+    def start_producers(self, target: Callable[..., Any], *args) -> list[threading.Thread]:
+        """
+        Starts the producer threads.
+
+        Args:
+            target (Callable[..., Any]): The function run by each producer, called with the index of the producer and
+            `args`.
+            *args: The additional arguments of the function.
+
+        Returns:
+            list[threading.Thread]: The started threads.
+        """
+        threads = [threading.Thread(target=target, args=(producer, *args)) for producer in range(self.producers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def test_take_all(self) -> None:
+        event = CountingEvent()
+        threads = self.start_producers(lambda producer: [event.increment() for _ in range(self.items)])
+        claimed = 0
+        while claimed < self.producers * self.items and (count := event.take_all(timeout=5.0)):
+            claimed += count
+        for thread in threads:
+            thread.join()
+        self.assertEqual(claimed, self.producers * self.items)
+        self.assertEqual(event.counter, 0)
+
+    def test_concurrent_decrement(self) -> None:
+        event = CountingEvent(initial_counter=self.producers * self.items)
+        threads = self.start_producers(lambda producer: [event.decrement() for _ in range(self.items)])
+        for thread in threads:
+            thread.join()
+        self.assertEqual(event.counter, 0)
+        self.assertFalse(event.is_set())
+        with self.assertRaises(ValueError):
+            event.decrement()
+
+    def test_wait_for(self) -> None:
+        event = CountingEvent()
+        self.assertFalse(event.wait_for(2, timeout=0.01))
+        event.increment(2)
+        self.assertTrue(event.wait_for(2, timeout=0.01))
+        self.assertEqual(event.take_all(timeout=0.01), 2)
+        self.assertEqual(event.take_all(timeout=0.01), 0)
+
+    def test_closeable_queue(self) -> None:
+        queue = CloseableQueue()
+        threads = self.start_producers(lambda producer: [queue.put((producer, item)) for item in range(self.items)])
+
+        def close() -> None:
+            for thread in threads:
+                thread.join()
+            queue.close()
+
+        threading.Thread(target=close).start()
+        received = list(queue)
+        self.assertEqual(len(received), self.producers * self.items)
+        expected = {(producer, item) for producer in range(self.producers) for item in range(self.items)}
+        self.assertEqual(set(received), expected)
+        for producer in range(self.producers):
+            self.assertEqual([item for source, item in received if source == producer], list(range(self.items)))
+
+
+if __name__ == "__main__":
+    unittest.main()
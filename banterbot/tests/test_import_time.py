@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Checks that `import banterbot` stays fast and does not import any heavy dependencies, which are only meant to be
+    imported once a name that needs them is used (see class `LazyExports`).
+    """
+
+    # The maximum cumulative time, in seconds, that `import banterbot` may take.
+    budget = 0.1
+
+    # The top-level packages that must not be imported by `import banterbot`.
+    forbidden = ("azure", "numpy", "openai", "spacy", "tiktoken", "tkinter")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Imports banterbot in a fresh interpreter with `-X importtime`, and parses the report printed to stderr, of the
+        form "import time: <self [us]> | <cumulative [us]> | <module>".
+        """
+        env = os.environ | {"PYTHONPATH": str(Path(__file__).parents[2])}
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import banterbot"],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        cls.cumulative = {}
+        for line in process.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+                _, cumulative, module = line.removeprefix("import time:").split("|")
+                cls.cumulative[module.strip()] = int(cumulative) / 1e6
+
+    def test_no_heavy_dependencies(self) -> None:
+        imported = {module.split(".")[0] for module in self.cumulative}
+        for package in self.forbidden:
+            with self.subTest(package=package):
+                self.assertNotIn(package, imported)
+
+    def test_budget(self) -> None:
+        self.assertIn("banterbot", self.cumulative)
+        self.assertLessEqual(self.cumulative["banterbot"], self.budget)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import importlib.util
+import random
+import re
+import unittest
+
+from banterbot.data.enums import SegmentationBackend, SpaCyLangModel
+from banterbot.tests.corpora import SENTENCES
+from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+from banterbot.utils.nlp import NLP
+
+
+class TestIncrementalSentenceSegmenter(unittest.TestCase):
+    """
+    Checks that streaming the texts of `corpora.SENTENCES` through the segmenter, in chunks of various sizes, yields the
+    same sentences as repeatedly segmenting the accumulated buffer: exactly with the rule-based backend, and up to the
+    gap documented in class `IncrementalSentenceSegmenter` with the spaCy backend.
+    """
+
+    # The minimum fraction of the sentences of repeated segmentation that must be reproduced with the spaCy backend.
+    min_spacy_agreement = 0.9
+
+    def setUp(self) -> None:
+        self.text = " ".join("".join(sentences) for sentences in SENTENCES)
+        self.rng = random.Random(42)
+
+    def chunkings(self) -> dict[str, list[str]]:
+        """
+        Splits the corpus into chunks in several ways, similar to the tokens of a streamed response.
+
+        Returns:
+            dict[str, list[str]]: The chunks of each chunking, by name.
+        """
+        cuts = sorted(self.rng.sample(range(1, len(self.text)), len(self.text) // 4))
+        return {
+            "characters": list(self.text),
+            "words": re.findall(r"\s*\S+", self.text),
+            "random": [self.text[i:j] for i, j in zip([0] + cuts, cuts + [len(self.text)])],
+        }
+
+    @staticmethod
+    def repeated(chunks: list[str], backend: SegmentationBackend) -> list[str]:
+        """
+        Segments a stream by repeatedly segmenting the whole buffer, and emitting all but the last sentence.
+
+        Args:
+            chunks (list[str]): The chunks of the stream.
+            backend (SegmentationBackend): The backend of sentence segmentation.
+
+        Returns:
+            list[str]: The sentences.
+        """
+        buffer, output = "", []
+        for chunk in chunks:
+            buffer += chunk
+            sentences = NLP.segment_sentences(buffer, backend=backend, cache=False)
+            if len(sentences) > 1:
+                output.extend(sentences[:-1])
+                buffer = sentences[-1]
+        return output + list(NLP.segment_sentences(buffer, backend=backend, cache=False))
+
+    @staticmethod
+    def incremental(chunks: list[str], backend: SegmentationBackend) -> list[str]:
+        """
+        Segments a stream with an `IncrementalSentenceSegmenter`.
+
+        Args:
+            chunks (list[str]): The chunks of the stream.
+            backend (SegmentationBackend): The backend of sentence segmentation.
+
+        Returns:
+            list[str]: The sentences.
+        """
+        segmenter = IncrementalSentenceSegmenter(backend=backend)
+        output = []
+        for chunk in chunks:
+            output.extend(segmenter.feed(chunk))
+        return output + list(segmenter.flush())
+
+    @staticmethod
+    def spans(sentences: list[str]) -> set[tuple[int, int]]:
+        """
+        Converts consecutive sentences to their spans in the text they add up to.
+
+        Args:
+            sentences (list[str]): The sentences.
+
+        Returns:
+            set[tuple[int, int]]: The start and end offsets of each sentence.
+        """
+        spans, start = set(), 0
+        for sentence in sentences:
+            spans.add((start, start + len(sentence)))
+            start += len(sentence)
+        return spans
+
+    def test_parity(self) -> None:
+        for name, chunks in self.chunkings().items():
+            with self.subTest(chunking=name):
+                output = self.incremental(chunks, backend=SegmentationBackend.RULES)
+                self.assertEqual(output, self.repeated(chunks, backend=SegmentationBackend.RULES))
+                self.assertEqual("".join(output), self.text)
+
+    @unittest.skipIf(
+        importlib.util.find_spec(SpaCyLangModel.EN_CORE_WEB_SM.value) is None,
+        f"the spaCy model `{SpaCyLangModel.EN_CORE_WEB_SM.value}` is not installed",
+    )
+    def test_parity_spacy(self) -> None:
+        for name, chunks in self.chunkings().items():
+            with self.subTest(chunking=name):
+                output = self.incremental(chunks, backend=SegmentationBackend.SPACY)
+                reference = self.repeated(chunks, backend=SegmentationBackend.SPACY)
+                self.assertEqual("".join(output), self.text)
+                agreement = len(self.spans(output) & self.spans(reference)) / len(reference)
+                self.assertGreaterEqual(agreement, self.min_spacy_agreement)
+
+    def test_cache_bypass(self) -> None:
+        # Start from an empty cache (disabling the cache releases its entries).
+        NLP.disable_cache()
+        NLP.enable_cache()
+        segmenter = IncrementalSentenceSegmenter(backend=SegmentationBackend.RULES)
+        for chunk in self.chunkings()["words"]:
+            segmenter.feed(chunk)
+        self.assertEqual(NLP.cache_stats()["entries"], 0)
+        segmenter.flush()
+        self.assertLessEqual(NLP.cache_stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import spacy
+
+import banterbot.paths
+from banterbot.utils.keyword_vector_store import KeywordVectorStore
+
+
+class TestKeywordVectorStore(unittest.TestCase):
+    """
+    Checks that `KeywordVectorStore.export` replaces an outdated store, keeps a complete store that appeared at the
+    destination, and never leaves its temporary directories behind.
+    """
+
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.directory = self.root / "vectors" / "model"
+
+        self.model = spacy.blank("en")
+        self.model.meta["name"] = "model"
+        for word in ("hello", "world"):
+            self.model.vocab.set_vector(word, np.arange(1, 5, dtype=np.float32))
+
+    def assert_only_store(self) -> None:
+        """
+        Checks that the destination holds a complete store, and that the export left nothing else behind.
+        """
+        self.assertTrue(KeywordVectorStore.exists(self.directory))
+        self.assertEqual(os.listdir(self.directory.parent), [self.directory.name])
+
+    def test_export(self) -> None:
+        KeywordVectorStore.export(model=self.model, directory=self.directory)
+        self.assert_only_store()
+        self.assertAlmostEqual(KeywordVectorStore(self.directory).similarity("hello", "world"), 1.0, places=3)
+
+    def test_outdated_store(self) -> None:
+        self.directory.mkdir(parents=True)
+        (self.directory / banterbot.paths.vectors_meta).write_text(json.dumps({"version": 0}))
+        KeywordVectorStore.export(model=self.model, directory=self.directory)
+        self.assert_only_store()
+
+    def test_complete_store(self) -> None:
+        KeywordVectorStore.export(model=self.model, directory=self.directory)
+        (self.directory / "marker").touch()
+        KeywordVectorStore.export(model=self.model, directory=self.directory)
+        self.assert_only_store()
+        self.assertTrue((self.directory / "marker").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import time
+import unittest
+
+from banterbot.config import RETRY_LIMIT
+from banterbot.data.enums import ChatCompletionRoles
+from banterbot.models.message import Message
+from banterbot.services.openai_service import OpenAIService
+from banterbot.tests.fake_openai import FakeOpenAITestCase
+from banterbot.utils.fake_openai_server import DEFAULT_RESPONSE
+
+MESSAGES = [Message(role=ChatCompletionRoles.USER, content="Hello there.")]
+
+
+class TestOpenAIService(FakeOpenAITestCase):
+    """
+    Checks that `OpenAIService` returns the complete response of the fake server, both whole and streamed as sentences.
+    """
+
+    server_options = {"tokens_per_second": 1000.0, "time_to_first_token": 0.01}
+
+    def test_prompt(self) -> None:
+        self.assertEqual(self.service().prompt(MESSAGES, split=False), DEFAULT_RESPONSE)
+
+    def test_prompt_stream(self) -> None:
+        handler = self.service().prompt_stream(MESSAGES)
+        sentences = [sentence for block in handler for sentence in block]
+        self.assertEqual("".join(sentences), DEFAULT_RESPONSE)
+        self.assertGreater(len(sentences), 1)
+        self.assertLessEqual(handler.stats.time_to_first_chunk, handler.stats.time_to_first_output)
+        self.assertEqual(self.server.stats["streams"], 1)
+
+
+class TestOpenAIServiceInterrupt(FakeOpenAITestCase):
+    """
+    Checks that interrupting a stream of `OpenAIService` closes its HTTP response, so that the server stops sending it.
+    """
+
+    server_options = {"tokens_per_second": 20.0, "time_to_first_token": 0.01}
+
+    def test_interrupt(self) -> None:
+        before = OpenAIService.cancellation_stats()
+        handler = self.service().prompt_stream(MESSAGES)
+        next(iter(handler))
+        handler.interrupt(kill=True)
+
+        deadline = time.perf_counter() + 5.0
+        while self.server.stats["disconnects"] == 0 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.server.stats["disconnects"], 1)
+        after = OpenAIService.cancellation_stats()
+        self.assertEqual(after["streams"], before["streams"] + 1)
+        self.assertGreater(after["chunks_received"], before["chunks_received"])
+        self.assertGreater(after["bytes_received"], before["bytes_received"])
+        self.assertGreater(after["max_tokens_saved"], before["max_tokens_saved"])
+
+
+class TestOpenAIServiceErrors(FakeOpenAITestCase):
+    """
+    Checks that `OpenAIService` retries failed requests up to `config.RETRY_LIMIT` times before giving up.
+    """
+
+    server_options = {"error_rate": 1.0, "error_statuses": (429,), "retry_after": 0.01}
+
+    def test_retry_limit(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self.service().prompt(MESSAGES)
+        self.assertEqual(self.server.stats["requests"], RETRY_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
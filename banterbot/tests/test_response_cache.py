@@ -0,0 +1,76 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from banterbot.utils.response_cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Checks that the on-disk tier of `ResponseCache` is best effort: malformed entries are misses, failed writes leave
+    the response cached in memory, and concurrent writes and prunes leave only complete entries behind.
+    """
+
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def cache(self, **kwargs) -> ResponseCache:
+        """
+        Creates a `ResponseCache` with an on-disk tier in the temporary directory of the test.
+
+        Args:
+            **kwargs: Additional arguments of the cache.
+
+        Returns:
+            ResponseCache: The cache.
+        """
+        return ResponseCache(disk=True, directory=self.directory, **kwargs)
+
+    def test_disk_hit(self) -> None:
+        self.cache().put("key", "response")
+        cache = self.cache()
+        self.assertEqual(cache.get("key"), "response")
+        self.assertEqual(cache.stats["disk_hits"], 1)
+        self.assertEqual(list(self.directory.glob("*.tmp")), [])
+
+    def test_malformed_entry(self) -> None:
+        for content in ("{", "[]", '{"response": "response"}', '{"timestamp": "now", "response": "response"}'):
+            with self.subTest(content=content):
+                (self.directory / "key.json").write_text(content)
+                cache = self.cache()
+                self.assertIsNone(cache.get("key"))
+                self.assertEqual(cache.stats["misses"], 1)
+
+    def test_failed_write(self) -> None:
+        cache = self.cache()
+        shutil.rmtree(self.directory)
+        with self.assertLogs(level="WARNING"):
+            cache.put("key", "response")
+        self.assertEqual(cache.get("key"), "response")
+
+    def test_concurrent_writes(self) -> None:
+        cache = self.cache(max_entries=1, max_disk_entries=20)
+
+        def write(thread: int) -> None:
+            for item in range(50):
+                cache.put(f"{thread}-{item}", f"response {thread}-{item}")
+
+        threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        paths = list(self.directory.glob("*.json"))
+        self.assertLessEqual(len(paths), 20)
+        self.assertEqual(list(self.directory.glob("*.tmp")), [])
+        for path in paths:
+            self.assertEqual(json.loads(path.read_text())["response"], f"response {path.stem}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from banterbot.tests.corpora import SENTENCES
+from banterbot.utils.rule_sentence_segmenter import RuleSentenceSegmenter
+
+
+class TestRuleSentenceSegmenter(unittest.TestCase):
+    """
+    Checks the rule-based sentence segmenter against the reference sentences of `corpora.SENTENCES`. The agreement with
+    the spaCy `senter` pipeline is measured by `benchmarks/sentence_segmentation.py`, since it needs the spaCy model.
+    """
+
+    # The minimum fraction of texts that must be split exactly into their reference sentences.
+    min_agreement = 0.95
+
+    def test_agreement(self) -> None:
+        matches = sum(RuleSentenceSegmenter.segment("".join(sentences)) == tuple(sentences) for sentences in SENTENCES)
+        self.assertGreaterEqual(matches / len(SENTENCES), self.min_agreement)
+
+    def test_whitespace_preserved(self) -> None:
+        text = " ".join("".join(sentences) for sentences in SENTENCES)
+        self.assertEqual("".join(RuleSentenceSegmenter.segment(text)), text)
+
+    def test_whitespace_stripped(self) -> None:
+        sentences = RuleSentenceSegmenter.segment("  Hello there.  How are you?  \n", whitespace=False)
+        self.assertEqual(sentences, ("Hello there.", "How are you?"))
+
+    def test_abbreviations(self) -> None:
+        sentences = RuleSentenceSegmenter.segment("Mr. J. Smith left at 5 p.m. today. Bye.")
+        self.assertEqual(sentences, ("Mr. J. Smith left at 5 p.m. today. ", "Bye."))
+
+
+if __name__ == "__main__":
+    unittest.main()
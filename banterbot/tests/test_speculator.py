@@ -0,0 +1,109 @@
+import time
+import unittest
+from typing import Optional
+
+from banterbot.extensions.speculator import Speculator
+from banterbot.handlers.stream_handler import StreamHandler
+from banterbot.managers.stream_manager import StreamManager
+from banterbot.models.message import Message
+
+
+class SlowService:
+    """
+    A stand-in for `OpenAIService` whose method `prompt_stream` takes a while to return, like a request waiting for the
+    headers of its response.
+    """
+
+    def __init__(self, delay: float) -> None:
+        """
+        Initializes a `SlowService` instance.
+
+        Args:
+            delay (float): The number of seconds method `prompt_stream` takes to return.
+        """
+        self._delay = delay
+        self._manager = StreamManager()
+        self._manager.connect_processor(lambda log, index, shared_data: log[index].value)
+        self.handlers: list[StreamHandler] = []
+
+    def prompt_stream(self, messages: list[Message], init_time: Optional[int] = None) -> StreamHandler:
+        """
+        Returns a short stream after a delay.
+
+        Args:
+            messages (list[Message]): The messages of the request, which are ignored.
+            init_time (Optional[int]): The time at which the stream was initialized, which is ignored.
+
+        Returns:
+            StreamHandler: The stream.
+        """
+        time.sleep(self._delay)
+        handler = self._manager.stream(iter(["Hello.", "How are you?"]))
+        self.handlers.append(handler)
+        return handler
+
+
+class TestSpeculator(unittest.TestCase):
+    """
+    Checks the end of a voice turn while its speculative request is still being sent.
+    """
+
+    transcript = "what is the weather like today"
+
+    def speculate(self, delay: float, resolve_timeout: float) -> tuple[Speculator, SlowService]:
+        """
+        Starts a turn whose partial transcript is speculated on, and waits until the request is being sent.
+
+        Args:
+            delay (float): The number of seconds the request takes to return.
+            resolve_timeout (float): The maximum number of seconds method `resolve` waits for the request.
+
+        Returns:
+            tuple[Speculator, SlowService]: The speculator and its service.
+        """
+        service = SlowService(delay=delay)
+        speculator = Speculator(openai_service=service, stable_time=0.01, min_words=1, resolve_timeout=resolve_timeout)
+        speculator.start(context=[], init_time=time.perf_counter_ns())
+        speculator.update(self.transcript)
+        while speculator.stats["speculations"] == 0:
+            time.sleep(0.005)
+        return speculator, service
+
+    @staticmethod
+    def wait_for_request(speculator: Speculator) -> None:
+        """
+        Waits until the speculative request has returned, and its stream has been kept or interrupted.
+
+        Args:
+            speculator (Speculator): The speculator.
+        """
+        with speculator._condition:
+            speculator._condition.wait_for(lambda: speculator._pending is None, timeout=5.0)
+
+    def test_resolve_waits_for_request(self) -> None:
+        speculator, service = self.speculate(delay=0.5, resolve_timeout=2.0)
+        handler = speculator.resolve("What is the weather like today?")
+        self.assertIs(handler, service.handlers[0])
+        self.assertEqual(list(handler), ["Hello.", "How are you?"])
+        self.assertEqual(speculator.stats["hits"], 1)
+        self.assertEqual(speculator.stats["misses"], 0)
+
+    def test_late_request_is_interrupted(self) -> None:
+        speculator, service = self.speculate(delay=0.5, resolve_timeout=0.05)
+        self.assertIsNone(speculator.resolve(self.transcript))
+        self.assertEqual(speculator.stats["misses"], 1)
+        self.wait_for_request(speculator)
+        self.assertTrue(service.handlers[0]._kill_event.is_set())
+        self.assertIsNone(speculator._handler)
+
+    def test_other_transcript(self) -> None:
+        speculator, service = self.speculate(delay=0.5, resolve_timeout=2.0)
+        start = time.perf_counter()
+        self.assertIsNone(speculator.resolve("something else entirely"))
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.wait_for_request(speculator)
+        self.assertTrue(service.handlers[0]._kill_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
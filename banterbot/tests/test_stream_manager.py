@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+from collections.abc import Iterator
+
+from banterbot.managers.stream_manager import StreamManager
+
+
+def source(items: int, delay: float = 0.0) -> Iterator[int]:
+    """
+    Yields consecutive integers with a delay before each, like the chunks of a streamed response.
+
+    Args:
+        items (int): The number of items.
+        delay (float): The number of seconds to wait before each item.
+
+    Yields:
+        int: The items.
+    """
+    for item in range(items):
+        time.sleep(delay)
+        yield item
+
+
+class TestStreamManager(unittest.TestCase):
+    """
+    Checks that both modes of `StreamManager` deliver every item of concurrent streams and stop interrupted streams,
+    and that the pooled mode runs them on a bounded number of threads (see `benchmarks/stream_manager.py`).
+    """
+
+    def manager(self, pooled: bool) -> StreamManager:
+        """
+        Creates a `StreamManager` that outputs the items of its streams unchanged.
+
+        Args:
+            pooled (bool): Whether the streams are run on the shared worker pools.
+
+        Returns:
+            StreamManager: The stream manager.
+        """
+        manager = StreamManager(pooled=pooled)
+        manager.connect_processor(lambda log, index, shared_data: log[index].value)
+        return manager
+
+    def test_delivery(self) -> None:
+        for pooled in (False, True):
+            with self.subTest(pooled=pooled):
+                manager = self.manager(pooled=pooled)
+                handlers = [manager.stream(source(items=50)) for _ in range(100)]
+                for handler in handlers:
+                    self.assertEqual(list(handler), list(range(50)))
+
+    def test_interrupt(self) -> None:
+        for pooled in (False, True):
+            with self.subTest(pooled=pooled):
+                closed = threading.Event()
+                handler = self.manager(pooled=pooled).stream(source(items=10**6, delay=0.001), close_stream=closed.set)
+                items = iter(handler)
+                next(items)
+                handler.interrupt(kill=True)
+                start = time.perf_counter()
+                list(items)
+                self.assertLess(time.perf_counter() - start, 1.0)
+                self.assertTrue(closed.wait(timeout=1.0))
+
+    def test_pooled_threads(self) -> None:
+        manager = self.manager(pooled=True)
+        baseline = threading.active_count()
+        handlers = [manager.stream(source(items=20, delay=0.001)) for _ in range(200)]
+        peak = threading.active_count()
+        for handler in handlers:
+            list(handler)
+        self.assertLess(peak - baseline, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
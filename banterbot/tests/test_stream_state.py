@@ -0,0 +1,85 @@
+import time
+import unittest
+from collections.abc import Iterator
+
+from banterbot.managers.stream_manager import StreamManager
+from banterbot.models.openai_stream_state import OpenAIStreamState
+from banterbot.models.stream_state import StreamState
+
+
+class ExampleStreamState(StreamState):
+    """
+    A state with a single field, counting the items processed.
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        """
+        Initializes the state with a count of zero.
+        """
+        super().__init__()
+        self.count = 0
+
+
+class TestStreamState(unittest.TestCase):
+    """
+    Checks the attribute and key access of `StreamState`, and its use as the shared data of a stream (see
+    `benchmarks/stream_state.py` for the comparison with the dict form).
+    """
+
+    def test_fields(self) -> None:
+        state = OpenAIStreamState(init_time=1)
+        self.assertFalse(hasattr(state, "__dict__"))
+        self.assertEqual(state._fields, frozenset({"interrupt", "init_time", "segmenter"}))
+        self.assertEqual(state["init_time"], 1)
+        state["interrupt"] = 2
+        self.assertEqual(state.interrupt, 2)
+        self.assertIn("segmenter", state)
+        self.assertNotIn("other", state)
+        self.assertIsNone(state.get("other"))
+        with self.assertRaises(KeyError):
+            state["other"] = 3
+        with self.assertRaises(AttributeError):
+            state.other = 3
+
+    def test_stream(self) -> None:
+        def process(log, index, shared_data: ExampleStreamState) -> int:
+            shared_data.count += 1
+            return log[index].value
+
+        manager = StreamManager()
+        manager.connect_processor(process)
+        state = ExampleStreamState()
+        self.assertEqual(list(manager.stream(range(100), init_shared_data=state)), list(range(100)))
+        self.assertEqual(state.count, 100)
+
+    def test_interrupt(self) -> None:
+        def source() -> Iterator[int]:
+            item = 0
+            while True:
+                time.sleep(0.001)
+                yield item
+                item += 1
+
+        manager = StreamManager()
+        manager.connect_processor(lambda log, index, shared_data: log[index].value)
+        state = ExampleStreamState()
+        handler = manager.stream(source(), init_shared_data=state)
+        items = iter(handler)
+        next(items)
+        handler.interrupt(kill=True)
+        list(items)
+        self.assertGreater(state.interrupt, 0)
+
+    def test_dict(self) -> None:
+        manager = StreamManager()
+        manager.connect_processor(lambda log, index, shared_data: (log[index].value, shared_data["key"]))
+        data = {"key": [1]}
+        self.assertEqual(list(manager.stream(range(2), init_shared_data=data)), [(0, [1]), (1, [1])])
+        with self.assertRaises(ValueError):
+            manager.stream(range(2), init_shared_data={"interrupt": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
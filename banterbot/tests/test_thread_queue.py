@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+
+from banterbot.utils.thread_queue import ThreadQueue
+
+
+class TestThreadQueue(unittest.TestCase):
+    """
+    Checks the order and skip rules of `ThreadQueue`, and that its tasks run on a single dispatcher thread (see
+    `benchmarks/thread_queue.py` for its throughput and latency).
+    """
+
+    def test_skip_rule(self) -> None:
+        queue = ThreadQueue()
+        ran = []
+        started, release = threading.Event(), threading.Event()
+        queue.add_task(lambda: (started.set(), release.wait(timeout=5.0), ran.append("first")))
+        started.wait(timeout=5.0)
+        for name in ("a", "b", "c"):
+            queue.add_task(lambda name=name: ran.append(name), unskippable=name == "b")
+        queue.add_task(lambda: ran.append("last"))
+        release.set()
+        self.assertTrue(queue.join(timeout=5.0))
+        self.assertEqual(ran, ["first", "b", "last"])
+        self.assertFalse(queue.is_alive())
+
+    def test_bursts(self) -> None:
+        queue = ThreadQueue()
+        ran = []
+        threads = set()
+
+        def task(name: tuple) -> None:
+            ran.append(name)
+            threads.add(threading.get_ident())
+            time.sleep(0.001)
+
+        for burst in range(20):
+            for sentence in range(5):
+                queue.add_task(lambda name=(burst, sentence): task(name), unskippable=True)
+            for response in range(10):
+                queue.add_task(lambda name=(burst, "respond", response): task(name))
+        self.assertTrue(queue.join(timeout=10.0))
+
+        unskippable = [name for name in ran if len(name) == 2]
+        self.assertEqual(unskippable, [(burst, sentence) for burst in range(20) for sentence in range(5)])
+        self.assertEqual(ran[-1], (19, "respond", 9))
+        self.assertEqual(len(threads), 1)
+        self.assertEqual(len(queue._tasks), 0)
+
+    def test_exception(self) -> None:
+        queue = ThreadQueue()
+        ran = []
+        with self.assertLogs(level="ERROR"):
+            queue.add_task(lambda: 1 / 0, unskippable=True)
+            queue.add_task(lambda: ran.append(True))
+            self.assertTrue(queue.join(timeout=5.0))
+        self.assertEqual(ran, [True])
+
+    def test_thread_task(self) -> None:
+        queue = ThreadQueue()
+        ran = []
+        queue.add_task(threading.Thread(target=lambda: ran.append(True)))
+        self.assertTrue(queue.join(timeout=5.0))
+        self.assertEqual(ran, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,75 @@
-from banterbot.utils.closeable_queue import CloseableQueue
-from banterbot.utils.indexed_event import IndexedEvent
-from banterbot.utils.nlp import NLP
-from banterbot.utils.thread_queue import ThreadQueue
+from typing import TYPE_CHECKING
 
-__all__ = ["CloseableQueue", "IndexedEvent", "NLP", "ThreadQueue"]
+from banterbot.utils.lazy_exports import LazyExports
+
+if TYPE_CHECKING:
+    from banterbot.utils.closeable_queue import CloseableQueue
+    from banterbot.utils.context_window import ContextWindow
+    from banterbot.utils.counting_event import CountingEvent
+    from banterbot.utils.fake_openai_server import FakeOpenAIServer
+    from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+    from banterbot.utils.indexed_event import IndexedEvent
+    from banterbot.utils.keyword_vector_store import KeywordVectorStore
+    from banterbot.utils.memo_cache import MemoCache
+    from banterbot.utils.nlp import NLP
+    from banterbot.utils.openai_request import OpenAIRequest
+    from banterbot.utils.rate_limiter import RateLimiter
+    from banterbot.utils.response_cache import ResponseCache
+    from banterbot.utils.rule_sentence_segmenter import RuleSentenceSegmenter
+    from banterbot.utils.stream_gauge_sampler import StreamGaugeSampler
+    from banterbot.utils.stream_log import StreamLog
+    from banterbot.utils.stream_recorder import StreamRecorder
+    from banterbot.utils.stream_replay import StreamReplay
+    from banterbot.utils.stream_stats_aggregator import StreamStatsAggregator
+    from banterbot.utils.thread_queue import ThreadQueue
+
+__all__ = [
+    "CloseableQueue",
+    "ContextWindow",
+    "CountingEvent",
+    "FakeOpenAIServer",
+    "IncrementalSentenceSegmenter",
+    "IndexedEvent",
+    "KeywordVectorStore",
+    "LazyExports",
+    "MemoCache",
+    "NLP",
+    "OpenAIRequest",
+    "RateLimiter",
+    "ResponseCache",
+    "RuleSentenceSegmenter",
+    "StreamGaugeSampler",
+    "StreamLog",
+    "StreamRecorder",
+    "StreamReplay",
+    "StreamStatsAggregator",
+    "ThreadQueue",
+]
+
+# The exported names are only imported once first accessed, so that importing the package stays fast.
+_exports = LazyExports(
+    __name__,
+    {
+        "CloseableQueue": "banterbot.utils.closeable_queue",
+        "ContextWindow": "banterbot.utils.context_window",
+        "CountingEvent": "banterbot.utils.counting_event",
+        "FakeOpenAIServer": "banterbot.utils.fake_openai_server",
+        "IncrementalSentenceSegmenter": "banterbot.utils.incremental_segmenter",
+        "IndexedEvent": "banterbot.utils.indexed_event",
+        "KeywordVectorStore": "banterbot.utils.keyword_vector_store",
+        "MemoCache": "banterbot.utils.memo_cache",
+        "NLP": "banterbot.utils.nlp",
+        "OpenAIRequest": "banterbot.utils.openai_request",
+        "RateLimiter": "banterbot.utils.rate_limiter",
+        "ResponseCache": "banterbot.utils.response_cache",
+        "RuleSentenceSegmenter": "banterbot.utils.rule_sentence_segmenter",
+        "StreamGaugeSampler": "banterbot.utils.stream_gauge_sampler",
+        "StreamLog": "banterbot.utils.stream_log",
+        "StreamRecorder": "banterbot.utils.stream_recorder",
+        "StreamReplay": "banterbot.utils.stream_replay",
+        "StreamStatsAggregator": "banterbot.utils.stream_stats_aggregator",
+        "ThreadQueue": "banterbot.utils.thread_queue",
+    },
+)
+__getattr__ = _exports.resolve
+__dir__ = _exports.dir
@@ -1,10 +1,13 @@
 import queue
+import threading
+import time
+from collections import deque
 from collections.abc import Generator
 from typing import Any, Optional
 
 from typing_extensions import Self
 
-from banterbot.utils.indexed_event import IndexedEvent
+from banterbot.utils.counting_event import CountingEvent
 
 
 class CloseableQueue:
@@ -21,49 +24,218 @@ class CloseableQueue:
     If a `for` loop is not used by the consumer thread, then the consumer thread can also use a `while` loop to consume
     items from the queue. In this case, the `while` loop's condition should be `while not queue.closed()` to ensure that
     the consumer thread exits when the queue is empty and closed.
+
+    If `maxsize` is positive, the queue is bounded and blocking puts wait for the consumer to make room, which keeps the
+    memory of a fast producer bounded when its consumer falls behind. A blocked put gives up (discarding its item) as
+    soon as the queue is closed, killed, or reset, so that producers are never stuck on an abandoned queue. Consumers
+    can drain many items at once with methods `get_batch` and `iter_batches`.
+
+    The items are held in a deque guarded by a single lock, with conditions for puts waiting for room and gets waiting
+    for items, which lets puts wait for a close or reset without polling. Methods `get` and `put` raise `queue.Empty`
+    and `queue.Full` like those of `queue.Queue`, but the queue does not track unfinished tasks.
     """
 
     def __init__(self, maxsize: int = 0) -> None:
+        """
+        Initializes an empty `CloseableQueue` instance.
+
+        Args:
+            maxsize (int): The maximum number of items in the queue, or zero for an unbounded queue.
+        """
         self._maxsize = maxsize
-        self.reset()
+        self._items: deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._not_empty = threading.Condition(self._lock)
+        self._counting_event = CountingEvent()
+        self._closed = False
+        self._killed = False
+
+        # Incremented on every reset, so that puts blocked before a reset do not leak items into the next use.
+        self._generation = 0
+
+        # The total number of nanoseconds the consumer has spent waiting for items.
+        self._wait_time = 0
 
     def close(self) -> None:
-        self._closed = True
-        self._indexed_event.increment()
+        """
+        Closes the queue: the consumer stops once the remaining items are consumed, and blocked puts give up.
+        """
+        with self._lock:
+            self._closed = True
+            self._not_full.notify_all()
+        self._counting_event.increment()
 
     def kill(self) -> None:
-        self._killed = True
-        self._closed = True
-        self._indexed_event.increment()
-
-    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
-        self._queue.put(item, block, timeout)
-        self._indexed_event.increment()
+        """
+        Closes the queue and stops the consumer without consuming the remaining items.
+        """
+        with self._lock:
+            self._killed = True
+            self._closed = True
+            self._not_full.notify_all()
+        self._counting_event.increment()
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Puts an item into the queue. If the queue is bounded and full, a blocking put waits until there is room for the
+        item, the timeout expires, or the queue is closed, killed, or reset.
+
+        Args:
+            item (Any): The item to put into the queue.
+            block (bool): Whether to wait for room in the queue if it is full.
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            bool: True if the item was put into the queue, False if it was discarded because the queue was closed,
+            killed, or reset while waiting.
+
+        Raises:
+            queue.Full: If the queue is full and the put is non-blocking or timed out.
+        """
+        with self._not_full:
+            if self._maxsize > 0 and len(self._items) >= self._maxsize:
+                if not block:
+                    raise queue.Full
+
+                # Compare generations under the lock, so that a reset can never let a stale item through.
+                generation = self._generation
+                if not self._not_full.wait_for(
+                    lambda: self._generation != generation or self._closed or len(self._items) < self._maxsize,
+                    timeout=timeout,
+                ):
+                    raise queue.Full
+                if self._generation != generation or len(self._items) >= self._maxsize:
+                    return False
+
+            self._items.append(item)
+            self._not_empty.notify()
+        self._counting_event.increment()
+        return True
 
     def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
-        return self._queue.get(block, timeout)
+        """
+        Removes and returns the next item of the queue.
+
+        Args:
+            block (bool): Whether to wait for an item if the queue is empty.
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            Any: The item.
+
+        Raises:
+            queue.Empty: If the queue is empty and the get is non-blocking or timed out.
+        """
+        with self._not_empty:
+            if not (self._items or block and self._not_empty.wait_for(lambda: self._items, timeout=timeout)):
+                raise queue.Empty
+            item = self._items.popleft()
+            self._not_full.notify()
+        return item
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    @property
+    def wait_time(self) -> int:
+        """
+        The total number of nanoseconds the consumer has spent waiting for items while iterating over the queue (or in
+        method `get_batch`), which is high when the producer is the bottleneck.
+
+        Returns:
+            int: The total waiting time in nanoseconds.
+        """
+        return self._wait_time
+
+    def get_batch(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> list[Any]:
+        """
+        Blocks until at least one item is available, then removes and returns up to `max_items` items at once.
+
+        Args:
+            max_items (Optional[int]): The maximum number of items to return; None to return every available item.
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            list[Any]: The items, in order, which is empty if the wait timed out or the queue is finished or killed.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._killed:
+            if batch := self._drain(max_items):
+                return batch
+            if self.finished():
+                break
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            # Any put or close since the previous drain wakes this wait up immediately.
+            start = time.perf_counter_ns()
+            self._counting_event.take_all(timeout=remaining)
+            self._wait_time += time.perf_counter_ns() - start
+        return []
+
+    def iter_batches(self, max_items: Optional[int] = None) -> Generator[list[Any], None, None]:
+        """
+        Iterates over the items of the queue in batches of up to `max_items` items, one batch per wake-up of the
+        consumer, until the queue is finished or killed. Resets the queue once the iteration is complete.
+
+        Args:
+            max_items (Optional[int]): The maximum number of items per batch; None for no limit.
+
+        Yields:
+            Generator[list[Any], None, None]: The batches of items.
+        """
+        while batch := self.get_batch(max_items):
+            yield batch
+        self.reset()
 
     def finished(self) -> bool:
-        return self._closed and self._queue.empty()
+        return self._closed and not self._items
 
     def reset(self) -> None:
-        self._queue = queue.Queue(maxsize=self._maxsize)
+        """
+        Reopens the queue for reuse, discarding any remaining items. The underlying deque and event are reused rather
+        than reallocated, and any put blocked on the previous use of the queue gives up.
+        """
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+            self._not_full.notify_all()
+        self._counting_event.clear()
         self._closed = False
         self._killed = False
-        self._indexed_event = IndexedEvent()
+
+    def _drain(self, max_items: Optional[int]) -> list[Any]:
+        """
+        Removes and returns up to `max_items` items from the queue without blocking.
+
+        Args:
+            max_items (Optional[int]): The maximum number of items to return; None for no limit.
+
+        Returns:
+            list[Any]: The items, in order.
+        """
+        with self._lock:
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            if count:
+                self._not_full.notify_all()
+        return batch
 
     def __iter__(self) -> Generator[Any, None, None]:
         while not self.finished():
-            self._indexed_event.wait()
-            self._indexed_event.decrement()
+            # Claim every signal received since the last wake-up, then drain all items currently in the queue.
+            start = time.perf_counter_ns()
+            self._counting_event.take_all()
+            self._wait_time += time.perf_counter_ns() - start
+            while not self._killed and self._items:
+                yield self.get()
             if self._killed:
                 break
-            elif not self._queue.empty():
-                yield self._queue.get()
         self.reset()
 
     def __enter__(self) -> Self:
         return self
 
-    def __exit__(self) -> None:
+    def __exit__(self, *args) -> None:
         self.close()
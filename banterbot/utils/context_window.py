@@ -0,0 +1,128 @@
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterator
+
+from banterbot.config import CONTEXT_WINDOW_FRACTION
+from banterbot.models.message import Message
+from banterbot.models.openai_model import OpenAIModel
+
+
+class ContextWindow:
+    """
+    A token-budgeted container for the messages of a conversation. The number of tokens in each message is counted once
+    on insertion and a running total is kept, so that the size of the conversation is known at all times without
+    re-encoding any messages.
+
+    Whenever the total exceeds the budget, a configurable fraction of the model's maximum number of tokens, the oldest
+    turns are evicted in amortized constant time. Pinned messages (such as the initial system prompt) and the most
+    recent turn are never evicted. Iterating over an instance yields the pinned messages followed by the retained turns,
+    so it can be passed anywhere a list of messages is expected.
+    """
+
+    def __init__(self, model: OpenAIModel, fraction: float = CONTEXT_WINDOW_FRACTION) -> None:
+        """
+        Initializes an empty `ContextWindow` for the specified model.
+
+        Args:
+            model (OpenAIModel): The model whose tokenizer and maximum number of tokens should be used.
+            fraction (float): The fraction of the model's maximum number of tokens that the messages may occupy.
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Argument `fraction` must be in the range (0, 1]. Got {fraction}.")
+
+        self._model = model
+        self._budget = int(fraction * model.max_tokens)
+        self._lock = threading.Lock()
+
+        # Messages paired with their token counts: pinned messages are never evicted.
+        self._pinned: list[tuple[Message, int]] = []
+        self._turns: deque[tuple[Message, int]] = deque()
+        self._total = 0
+        self._evicted = 0
+
+    def append(self, message: Message, pinned: bool = False) -> None:
+        """
+        Appends a message to the conversation, evicting the oldest turns if the token budget is exceeded.
+
+        Args:
+            message (Message): The message to append.
+            pinned (bool): If True, the message is never evicted.
+        """
+        tokens = message.count_tokens(model=self._model)
+        with self._lock:
+            (self._pinned if pinned else self._turns).append((message, tokens))
+            self._total += tokens
+
+            while self._total > self._budget and len(self._turns) > 1:
+                _, evicted_tokens = self._turns.popleft()
+                self._total -= evicted_tokens
+                self._evicted += 1
+                logging.debug(f"ContextWindow evicted a message of {evicted_tokens} tokens")
+
+    def clear(self) -> None:
+        """
+        Removes all unpinned messages from the conversation.
+        """
+        with self._lock:
+            self._total -= sum(tokens for _, tokens in self._turns)
+            self._turns.clear()
+
+    @property
+    def budget(self) -> int:
+        """
+        The maximum number of tokens the messages may occupy.
+
+        Returns:
+            int: The token budget.
+        """
+        return self._budget
+
+    @property
+    def evicted(self) -> int:
+        """
+        The number of messages that have been evicted so far.
+
+        Returns:
+            int: The number of evicted messages.
+        """
+        return self._evicted
+
+    @property
+    def messages(self) -> list[Message]:
+        """
+        A snapshot of the messages currently in the window, with pinned messages first.
+
+        Returns:
+            list[Message]: The messages.
+        """
+        with self._lock:
+            return [message for message, _ in self._pinned] + [message for message, _ in self._turns]
+
+    @property
+    def total_tokens(self) -> int:
+        """
+        The total number of tokens in the messages currently in the window.
+
+        Returns:
+            int: The number of tokens.
+        """
+        return self._total
+
+    def __iter__(self) -> Iterator[Message]:
+        """
+        Iterates over a snapshot of the messages, such that the window may be safely appended to during iteration.
+
+        Returns:
+            Iterator[Message]: An iterator over the messages.
+        """
+        return iter(self.messages)
+
+    def __len__(self) -> int:
+        """
+        The number of messages currently in the window.
+
+        Returns:
+            int: The number of messages.
+        """
+        return len(self._pinned) + len(self._turns)
@@ -0,0 +1,136 @@
+import threading
+from typing import Optional
+
+
+class CountingEvent:
+    """
+    A thread synchronization primitive that counts the items made available by one or more producers to a consumer,
+    built on a `threading.Condition` so that every update of the counter is atomic. It serves the same purpose as class
+    `IndexedEvent`, but without its races between concurrent increments and decrements.
+
+    Besides waiting for a single item, a consumer can wait for a given number of items with method `wait_for`, or
+    claim every available item at once with method `take_all`, so that many items can be drained per wake-up.
+    """
+
+    def __init__(self, initial_counter: int = 0) -> None:
+        """
+        Initializes the CountingEvent with an optional initial counter value, which represents the number of items
+        initially available for processing.
+
+        Args:
+            initial_counter (int): The initial count of items available for processing. Must be non-negative.
+
+        Raises:
+            ValueError: If the initial counter is set to a negative value.
+        """
+        if initial_counter < 0:
+            raise ValueError(f"Argument `initial_counter` must be non-negative. Got {initial_counter}.")
+        self._condition = threading.Condition(threading.Lock())
+        self._counter = initial_counter
+
+    @property
+    def counter(self) -> int:
+        """
+        Retrieves the current value of the counter, indicating the number of items available for processing.
+
+        Returns:
+            int: The current number of unprocessed items.
+        """
+        return self._counter
+
+    def increment(self, N: int = 1) -> None:
+        """
+        Increments the counter by a specified amount, indicating that new items are available, and wakes up any waiting
+        consumers.
+
+        Args:
+            N (int): The number of new items added. Must be non-negative.
+        """
+        with self._condition:
+            self._counter += N
+            self._condition.notify_all()
+
+    def decrement(self, N: int = 1) -> None:
+        """
+        Decrements the counter by a specified amount, indicating that items have been claimed by a consumer.
+
+        Args:
+            N (int): The amount to decrement the counter by. Must not exceed the counter.
+
+        Raises:
+            ValueError: If N is greater than the counter.
+        """
+        with self._condition:
+            if N > self._counter:
+                raise ValueError(f"Cannot decrement the counter of a CountingEvent ({self._counter}) by {N}.")
+            self._counter -= N
+
+    def set(self, N: int = 1) -> None:
+        """
+        Directly sets the counter to a specified value, indicating the exact number of items available.
+
+        Args:
+            N (int): The number of items available. Must be non-negative.
+        """
+        with self._condition:
+            self._counter = N
+            self._condition.notify_all()
+
+    def clear(self) -> None:
+        """
+        Resets the counter, signifying that no items are currently available for processing.
+        """
+        with self._condition:
+            self._counter = 0
+
+    def is_set(self) -> bool:
+        """
+        Checks if at least one item is available for processing.
+
+        Returns:
+            bool: True if items are available, False otherwise.
+        """
+        return self._counter > 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until at least one item is available, without claiming it.
+
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            bool: True if an item is available, False if the wait timed out.
+        """
+        return self.wait_for(n=1, timeout=timeout)
+
+    def wait_for(self, n: int, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until at least `n` items are available, without claiming them.
+
+        Args:
+            n (int): The number of items to wait for.
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            bool: True if `n` items are available, False if the wait timed out.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._counter >= n, timeout=timeout)
+
+    def take_all(self, timeout: Optional[float] = None) -> int:
+        """
+        Blocks until at least one item is available, then atomically claims every available item.
+
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            int: The number of items claimed, which is zero if the wait timed out.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._counter > 0, timeout=timeout):
+                return 0
+            count = self._counter
+            self._counter = 0
+            return count
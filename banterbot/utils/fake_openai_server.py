@@ -0,0 +1,349 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+
+from typing_extensions import Self
+
+from banterbot import config
+
+# The response returned by default by a `FakeOpenAIServer`, long enough to span several sentences.
+DEFAULT_RESPONSE = (
+    "This is a response from a local stand-in for the OpenAI ChatCompletion API. It is streamed one chunk at a time, "
+    "at a configurable rate, so that the latency and throughput of the streaming code can be measured. The content "
+    "is arbitrary, but it does contain several sentences! Does it not? It certainly does."
+)
+
+
+class FakeOpenAIServer:
+    """
+    A local HTTP server that imitates the OpenAI ChatCompletion API, for benchmarking and testing the streaming code
+    offline. It supports regular and streamed (server-sent events) ChatCompletion requests, as well as the model
+    metadata endpoints, in the formats expected by the `openai` client.
+
+    Responses are split into tokens (words with their leading whitespace), which are sent in chunks at a configurable
+    rate after a configurable time-to-first-token, with optional random jitter. Rate limit (429) and server (5xx)
+    errors can be injected at random; all randomness is seeded so that runs are reproducible. Responses are either
+    fixed, taken in turn from a script, or generated by a callable from the messages of the request.
+
+    Example:
+        with FakeOpenAIServer(tokens_per_second=100.0) as server:
+            OpenAIService.configure_client(base_url=server.base_url)
+            ...
+    """
+
+    # Compile a regex pattern that splits a response into tokens, each with its leading whitespace.
+    _token_pattern = re.compile(r"\s*\S+|\s+")
+
+    def __init__(
+        self,
+        response: Union[str, list[str], Callable[[list[dict[str, str]]], str]] = DEFAULT_RESPONSE,
+        tokens_per_second: float = 50.0,
+        time_to_first_token: float = 0.2,
+        chunk_size: int = 1,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: tuple[int, ...] = (429, 500, 503),
+        retry_after: float = 0.1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = config.SEED,
+    ) -> None:
+        """
+        Initializes a `FakeOpenAIServer` instance; the server is not started until method `start` is called.
+
+        Args:
+            response (Union[str, list[str], Callable[[list[dict[str, str]]], str]]): The content of every response; a
+            script of responses that are returned in turn (cycling once exhausted); or a callable that generates the
+            response from the messages of the request.
+
+            tokens_per_second (float): The rate at which tokens are streamed.
+            time_to_first_token (float): The number of seconds to wait before sending the first chunk of a response.
+            chunk_size (int): The number of tokens per streamed chunk.
+            jitter (float): The maximum relative deviation of each delay, in the range [0, 1].
+            error_rate (float): The probability that a ChatCompletion request fails with an injected error.
+            error_statuses (tuple[int, ...]): The HTTP status codes from which injected errors are drawn.
+            retry_after (float): The number of seconds sent in the `retry-after-ms` header of injected 429 errors.
+            host (str): The host name to bind the server to.
+            port (int): The port to bind the server to; if zero, a free port is selected.
+            seed (int): The seed of the random number generator used for jitter and injected errors.
+        """
+        if tokens_per_second <= 0 or chunk_size < 1:
+            raise ValueError("Arguments `tokens_per_second` and `chunk_size` must be positive.")
+        if not 0 <= jitter <= 1 or not 0 <= error_rate <= 1:
+            raise ValueError("Arguments `jitter` and `error_rate` must be in the range [0, 1].")
+
+        self._response = response
+        self._tokens_per_second = tokens_per_second
+        self._time_to_first_token = time_to_first_token
+        self._chunk_size = chunk_size
+        self._jitter = jitter
+        self._error_rate = error_rate
+        self._error_statuses = error_statuses
+        self._retry_after = retry_after
+        self._address = (host, port)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._script_index = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset_stats()
+
+    def start(self) -> Self:
+        """
+        Starts serving requests in a background thread.
+
+        Returns:
+            FakeOpenAIServer: The current instance, for chaining.
+        """
+        if self._server is not None:
+            return self
+
+        self._server = ThreadingHTTPServer(self._address, self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.debug(f"FakeOpenAIServer listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server and closes its socket.
+        """
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+        logging.debug(f"FakeOpenAIServer stopped")
+
+    def reset_stats(self) -> None:
+        """
+        Resets the request counters.
+        """
+        with self._lock:
+            self._stats = {"requests": 0, "errors": 0, "streams": 0, "disconnects": 0, "chunks": 0}
+
+    @property
+    def base_url(self) -> str:
+        """
+        The base URL of the server, to be passed to `OpenAIService.configure_client`.
+
+        Returns:
+            str: The base URL, including the `/v1` prefix.
+        """
+        if self._server is None:
+            raise RuntimeError("FakeOpenAIServer has not been started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        The number of ChatCompletion requests received, injected errors, streams started, streams disconnected by the
+        client before completion, and chunks sent.
+
+        Returns:
+            dict[str, int]: The request counters.
+        """
+        with self._lock:
+            return self._stats.copy()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _count(self, key: str, value: int = 1) -> None:
+        """
+        Increments one of the request counters.
+
+        Args:
+            key (str): The name of the counter.
+            value (int): The amount to increment it by.
+        """
+        with self._lock:
+            self._stats[key] += value
+
+    def _next_response(self, messages: list[dict[str, str]]) -> str:
+        """
+        Selects the content of the next response.
+
+        Args:
+            messages (list[dict[str, str]]): The messages of the request.
+
+        Returns:
+            str: The content of the response.
+        """
+        if isinstance(self._response, str):
+            return self._response
+        if callable(self._response):
+            return self._response(messages)
+        with self._lock:
+            response = self._response[self._script_index % len(self._response)]
+            self._script_index += 1
+        return response
+
+    def _delay(self, seconds: float) -> float:
+        """
+        Applies the configured random jitter to a delay.
+
+        Args:
+            seconds (float): The nominal delay.
+
+        Returns:
+            float: The delay with jitter applied.
+        """
+        if self._jitter == 0:
+            return seconds
+        with self._lock:
+            return seconds * (1 + self._random.uniform(-self._jitter, self._jitter))
+
+    def _injected_error(self) -> Optional[int]:
+        """
+        Randomly decides whether the current request should fail.
+
+        Returns:
+            Optional[int]: The HTTP status code of the injected error, or None if the request should succeed.
+        """
+        if self._error_rate == 0:
+            return None
+        with self._lock:
+            if self._random.random() < self._error_rate:
+                return self._random.choice(self._error_statuses)
+        return None
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Creates the request handler class bound to the current instance.
+
+        Returns:
+            type[BaseHTTPRequestHandler]: The request handler class.
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 is required for connections to be kept alive, as they would be by the OpenAI API.
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                logging.debug(f"FakeOpenAIServer {format % args}")
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [self._model("fake")]})
+                elif "/models/" in self.path:
+                    self._send_json(200, self._model(self.path.rsplit("/", 1)[-1]))
+                else:
+                    self._send_error(404, "Not found")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("content-length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_error(400, "Invalid JSON body")
+                    return
+
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_error(404, "Not found")
+                    return
+
+                server._count("requests")
+                if (status := server._injected_error()) is not None:
+                    server._count("errors")
+                    headers = {"retry-after-ms": str(int(server._retry_after * 1000))} if status == 429 else {}
+                    self._send_error(status, "Injected error", headers=headers)
+                    return
+
+                content = server._next_response(body.get("messages", []))
+                tokens = server._token_pattern.findall(content)
+                if body.get("max_tokens"):
+                    tokens = tokens[: body["max_tokens"]]
+
+                time.sleep(server._delay(server._time_to_first_token))
+                if body.get("stream"):
+                    self._stream(body.get("model", "fake"), tokens)
+                else:
+                    completion = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "fake"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": "".join(tokens)},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+                    }
+                    self._send_json(200, completion)
+
+            def _stream(self, model: str, tokens: list[str]) -> None:
+                self.send_response(200)
+                self.send_header("content-type", "text/event-stream")
+                self.send_header("transfer-encoding", "chunked")
+                self.end_headers()
+                server._count("streams")
+
+                created = int(time.time())
+                step = server._chunk_size
+                try:
+                    for i in range(0, len(tokens), step):
+                        if i > 0:
+                            time.sleep(server._delay(step / server._tokens_per_second))
+                        self._send_event(self._chunk(model, created, {"content": "".join(tokens[i : i + step])}))
+                        server._count("chunks")
+                    self._send_event(self._chunk(model, created, {}, finish_reason="stop"))
+                    self._send_event("[DONE]")
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    server._count("disconnects")
+                    self.close_connection = True
+
+            def _send_event(self, data: Union[dict, str]) -> None:
+                payload = f"data: {data if isinstance(data, str) else json.dumps(data)}\n\n".encode(config.ENCODING)
+                self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, data: dict, headers: Optional[dict[str, str]] = None) -> None:
+                payload = json.dumps(data).encode(config.ENCODING)
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_error(self, status: int, message: str, headers: Optional[dict[str, str]] = None) -> None:
+                self._send_json(status, {"error": {"message": message, "type": "fake_error", "code": status}}, headers)
+
+            @staticmethod
+            def _chunk(model: str, created: int, delta: dict, finish_reason: Optional[str] = None) -> dict:
+                return {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+
+            @staticmethod
+            def _model(name: str) -> dict:
+                return {"id": name, "object": "model", "created": 0, "owned_by": "banterbot"}
+
+        return Handler
@@ -0,0 +1,122 @@
+import logging
+import re
+from typing import Optional
+
+from banterbot.config import SEGMENTATION_LOOKAHEAD, SENTENCE_DELIM
+from banterbot.data.enums import SegmentationBackend
+from banterbot.utils.nlp import NLP
+
+
+class IncrementalSentenceSegmenter:
+    """
+    Splits a stream of text chunks into sentences while keeping its scan state between chunks. Rather than running the
+    spaCy sentence segmentation model on the entire unfinished buffer for every chunk, a cheap scan of each new chunk
+    records the positions of characters that could end a sentence (see `config.SENTENCE_DELIM`). The model is only
+    invoked while at least one of these potential boundaries is pending, i.e., has text following it but has not yet
+    been followed by `config.SEGMENTATION_LOOKAHEAD` words.
+
+    The sentences always add up to the text of the stream. With the rule-based backend, whose boundaries always follow
+    one of the delimiter characters, they also match those of repeatedly calling `NLP.segment_sentences` on the
+    accumulated buffer. The spaCy model may place boundaries elsewhere (e.g., between two sentences that lack terminal
+    punctuation): these are only found the next time the model is invoked, at the latest by the full segmentation of
+    the remaining buffer in method `flush`, so they can be reported later than, or differ from, those of repeated
+    segmentation. This gap is accepted in exchange for not running the model on every chunk: the tests require at least
+    90% of the sentences of repeated segmentation to be reproduced on the reference corpus, and the gap is reported by
+    `benchmarks/sentence_segmentation.py`.
+    """
+
+    # Compile a regex pattern that matches any character that could potentially end a sentence.
+    _delimiter_pattern = re.compile("[" + re.escape("".join(SENTENCE_DELIM)) + "]")
+
+    # Compile a regex pattern that matches individual words.
+    _word_pattern = re.compile(r"\S+")
+
+    def __init__(self, lookahead: int = SEGMENTATION_LOOKAHEAD, backend: Optional[SegmentationBackend] = None) -> None:
+        """
+        Initializes an empty segmenter.
+
+        Args:
+            lookahead (int): The number of words following a potential boundary after which it is no longer pending.
+            backend (Optional[SegmentationBackend]): The backend of sentence segmentation; None for the default backend
+            of class `NLP`.
+        """
+        self._lookahead = lookahead
+        self._backend = backend
+        self._text = ""
+        self._scanned = 0
+        self._candidates: list[int] = []
+
+    @property
+    def text(self) -> str:
+        """
+        The unfinished text that has not yet been returned as part of a complete sentence.
+
+        Returns:
+            str: The buffered text.
+        """
+        return self._text
+
+    def feed(self, string: str) -> tuple[str, ...]:
+        """
+        Appends a chunk of text to the buffer and returns any sentences that have been completed as a result.
+
+        Args:
+            string (str): The next chunk of text in the stream.
+
+        Returns:
+            tuple[str, ...]: The completed sentences, with whitespace preserved; empty if no sentence was completed.
+        """
+        self._text += string
+
+        # Scan only the newly appended text for potential sentence boundaries.
+        for match in self._delimiter_pattern.finditer(self._text, self._scanned):
+            self._candidates.append(match.start())
+        self._scanned = len(self._text)
+
+        # Discard boundaries that have been followed by enough words to be considered resolved.
+        self._candidates = [index for index in self._candidates if not self._resolved(index)]
+
+        # Only invoke the model if a pending boundary is followed by some text.
+        if not any(self._text[index + 1 :].strip() for index in self._candidates):
+            return tuple()
+
+        # The buffer is only segmented once at this length, so its result is not cached.
+        sentences = NLP.segment_sentences(self._text, backend=self._backend, cache=False)
+
+        # If more than one sentence is available, all but the last one are complete.
+        if len(sentences) > 1:
+            offset = len(self._text) - len(sentences[-1])
+            self._text = sentences[-1]
+            self._scanned -= offset
+            self._candidates = [index - offset for index in self._candidates if index >= offset]
+            logging.debug(f"IncrementalSentenceSegmenter completed sentences: {sentences[:-1]}")
+            return sentences[:-1]
+
+        return tuple()
+
+    def flush(self) -> tuple[str, ...]:
+        """
+        Segments whatever text remains in the buffer in full, including any boundaries that do not follow a delimiter
+        character, to be called once the stream has been exhausted.
+
+        Returns:
+            tuple[str, ...]: The remaining sentences, with whitespace preserved.
+        """
+        return NLP.segment_sentences(self._text, backend=self._backend)
+
+    def _resolved(self, index: int) -> bool:
+        """
+        Checks whether a potential boundary has been followed by enough words to no longer be considered pending.
+
+        Args:
+            index (int): The position of the potential boundary in the buffer.
+
+        Returns:
+            bool: True if the boundary is resolved, False otherwise.
+        """
+        count = 0
+        for _ in self._word_pattern.finditer(self._text, index + 1):
+            count += 1
+            if count > self._lookahead:
+                return True
+        return False
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from typing_extensions import Self
+
+import banterbot.paths
+from banterbot import config
+from banterbot.config import KEYWORD_VECTOR_EXPORT_CHUNK
+from banterbot.data.enums import SpaCyLangModel
+
+
+class KeywordVectorStore:
+    """
+    A compact, read-only store of the word vectors of a spaCy model, used to compute the similarity of short keywords
+    (as in `Doc.similarity`) without loading the model itself, which takes hundreds of megabytes of RAM and seconds to
+    load in the case of `en_core_web_lg`.
+
+    The vectors are exported once from the model to the BanterBot filesystem, as L2-normalized float16 rows in a NumPy
+    file, along with their original norms and a sorted index of 64-bit hashes of the words. All files are opened with
+    `np.memmap`, so that only the pages of the words actually looked up are ever read into memory, and they are shared
+    between processes by the operating system.
+    """
+
+    # The version of the file format, written to the metadata of every store.
+    version = 1
+
+    # Compile a regex pattern that splits keywords into tokens, approximating the spaCy tokenizer on short phrases.
+    _token_pattern = re.compile(r"\w+|[^\w\s]")
+
+    _instance: Optional[Self] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> Self:
+        """
+        Returns the process-wide store of the vectors of `en_core_web_lg`, exporting them first if needed. This is the
+        only case in which the spaCy model is loaded.
+
+        Returns:
+            KeywordVectorStore: The process-wide instance.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                name = SpaCyLangModel.EN_CORE_WEB_LG.value
+                directory = banterbot.paths.vectors / name
+                if not cls.exists(directory):
+                    # Imported here, so that spaCy is not imported at all once the vectors have been exported.
+                    from banterbot.utils.nlp import NLP
+
+                    cls.export(model=NLP.model(SpaCyLangModel.EN_CORE_WEB_LG), directory=directory)
+                cls._instance = cls(directory=directory)
+            return cls._instance
+
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        """
+        Checks whether a directory contains a complete store in the current format.
+
+        Args:
+            directory (Path): The directory of the store.
+
+        Returns:
+            bool: Whether the store can be opened.
+        """
+        try:
+            with open(directory / banterbot.paths.vectors_meta, "r", encoding=config.ENCODING) as fs:
+                return json.load(fs)["version"] == cls.version
+        except (OSError, ValueError, KeyError):
+            return False
+
+    @classmethod
+    def export(cls, model: Any, directory: Path) -> None:
+        """
+        Exports the word vectors of a spaCy model to a new store. The files are written to a uniquely named temporary
+        directory that is renamed once complete, so that an interrupted export never leaves a partial store behind, and
+        concurrent exports (for instance by several processes starting at once) never write to the same files. If a
+        complete store appears at the destination during the export, it is kept and the new one is discarded, since it
+        may already be open in another process.
+
+        Args:
+            model (spacy.language.Language): The spaCy model, which must have word vectors.
+            directory (Path): The directory of the store.
+        """
+        logging.info(f"KeywordVectorStore exporting the vectors of `{model.meta['name']}`, which only happens once.")
+        vectors = model.vocab.vectors
+        strings = model.vocab.strings
+
+        # Hash every word of the vocabulary that has a vector, and sort the words by hash for binary search.
+        keys, rows = [], []
+        for key, row in vectors.key2row.items():
+            if key in strings:
+                keys.append(cls._hash(strings[key]))
+                rows.append(row)
+        keys = np.array(keys, dtype=np.uint64)
+        rows = np.array(rows, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        keys, rows = keys[order], rows[order]
+        unique = np.concatenate(([True], keys[1:] != keys[:-1])) if len(keys) else np.zeros(0, dtype=bool)
+        keys, rows = keys[unique], rows[unique]
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        temporary = Path(tempfile.mkdtemp(prefix=f"{directory.name}.", suffix=".tmp", dir=directory.parent))
+        # A unique name for an outdated or incomplete store at the destination, which is moved aside to be replaced.
+        stale = temporary.with_name(f"{temporary.name}.old")
+        try:
+            data = np.asarray(vectors.data)
+            units = np.lib.format.open_memmap(
+                temporary / banterbot.paths.vectors_units, mode="w+", dtype=np.float16, shape=(len(keys), data.shape[1])
+            )
+            norms = np.lib.format.open_memmap(
+                temporary / banterbot.paths.vectors_norms, mode="w+", dtype=np.float32, shape=(len(keys),)
+            )
+            # Normalize the vectors in chunks, so that the export does not need a second copy of the whole table in
+            # memory.
+            for start in range(0, len(keys), KEYWORD_VECTOR_EXPORT_CHUNK):
+                chunk = data[rows[start : start + KEYWORD_VECTOR_EXPORT_CHUNK]].astype(np.float32)
+                chunk_norms = np.linalg.norm(chunk, axis=1)
+                norms[start : start + len(chunk)] = chunk_norms
+                units[start : start + len(chunk)] = chunk / np.where(chunk_norms > 0, chunk_norms, 1.0)[:, None]
+            units.flush()
+            norms.flush()
+            del units, norms
+            np.save(temporary / banterbot.paths.vectors_keys, keys)
+
+            meta = {"version": cls.version, "model": model.meta["name"], "model_version": model.meta["version"]}
+            with open(temporary / banterbot.paths.vectors_meta, "w", encoding=config.ENCODING) as fs:
+                json.dump(meta | {"words": len(keys), "dimensions": data.shape[1]}, fs)
+
+            if cls.exists(directory):
+                logging.info(f"KeywordVectorStore kept the store exported concurrently to `{directory}`.")
+                return
+
+            # Move an outdated or incomplete store aside, since a directory can only be renamed to a missing destination
+            # on every platform.
+            try:
+                os.replace(directory, stale)
+            except FileNotFoundError:
+                pass
+            try:
+                os.replace(temporary, directory)
+            except OSError:
+                if not cls.exists(directory):
+                    raise
+                logging.info(f"KeywordVectorStore kept the store exported concurrently to `{directory}`.")
+                return
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+            shutil.rmtree(stale, ignore_errors=True)
+
+        logging.info(f"KeywordVectorStore exported {len(keys)} word vectors to `{directory}`.")
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Opens an exported store, memory-mapping its files.
+
+        Args:
+            directory (Path): The directory of the store.
+        """
+        logging.debug(f"KeywordVectorStore opening `{directory}`")
+        self._directory = Path(directory)
+        self._keys = np.load(self._directory / banterbot.paths.vectors_keys, mmap_mode="r")
+        self._units = np.load(self._directory / banterbot.paths.vectors_units, mmap_mode="r")
+        self._norms = np.load(self._directory / banterbot.paths.vectors_norms, mmap_mode="r")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of words in the store.
+
+        Returns:
+            int: The number of words.
+        """
+        return len(self._keys)
+
+    @property
+    def dimensions(self) -> int:
+        """
+        The number of dimensions of the word vectors.
+
+        Returns:
+            int: The number of dimensions.
+        """
+        return self._units.shape[1]
+
+    def vector(self, keyword: str) -> np.ndarray:
+        """
+        Computes the L2-normalized vector of a keyword: the average of the vectors of its tokens, with a zero vector for
+        each token without one (as in `Doc.vector`), normalized.
+
+        Args:
+            keyword (str): The keyword.
+
+        Returns:
+            np.ndarray: The normalized float32 vector, or a zero vector if none of the tokens have vectors.
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in self._token_pattern.findall(keyword):
+            if (row := self._row(token)) is not None:
+                vector += self._norms[row] * self._units[row].astype(np.float32)
+        if (norm := np.linalg.norm(vector)) > 0:
+            vector /= norm
+        return vector
+
+    def vectors(self, keywords: Iterable[str]) -> np.ndarray:
+        """
+        Computes the L2-normalized vectors of several keywords (see method `vector`).
+
+        Args:
+            keywords (Iterable[str]): The keywords.
+
+        Returns:
+            np.ndarray: The normalized float32 vectors, one row per keyword.
+        """
+        return np.array([self.vector(keyword) for keyword in keywords], dtype=np.float32).reshape(-1, self.dimensions)
+
+    def similarity(self, keyword_a: str, keyword_b: str) -> float:
+        """
+        Computes the cosine similarity of two keywords, as `Doc.similarity` would with the original spaCy model.
+
+        Args:
+            keyword_a (str): The first keyword.
+            keyword_b (str): The second keyword.
+
+        Returns:
+            float: The cosine similarity, or 0.0 if either keyword has no vector.
+        """
+        return float(np.dot(self.vector(keyword_a), self.vector(keyword_b)))
+
+    def _row(self, word: str) -> Optional[int]:
+        """
+        Looks up the row of a word by binary search in the sorted hash index.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            Optional[int]: The row of the word, or None if it has no vector.
+        """
+        key = self._hash(word)
+        row = int(np.searchsorted(self._keys, np.uint64(key)))
+        if row < len(self._keys) and int(self._keys[row]) == key:
+            return row
+        return None
+
+    @staticmethod
+    def _hash(word: str) -> int:
+        """
+        Computes the stable 64-bit hash of a word used in the index of the store.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            int: The hash of the word.
+        """
+        return int.from_bytes(hashlib.blake2b(word.encode(config.ENCODING), digest_size=8).digest(), "little")
@@ -0,0 +1,60 @@
+import importlib
+import sys
+from typing import Any
+
+
+class LazyExports:
+    """
+    Resolves the names exported by a package on first access, through the module-level `__getattr__` and `__dir__`
+    hooks of PEP 562, instead of importing every submodule when the package is imported. This keeps `import banterbot`
+    fast and free of heavy dependencies (e.g., spaCy, the Azure Speech SDK, or tkinter), which are only imported once a
+    name that needs them is used.
+
+    Usage, at the end of the `__init__.py` of a package:
+
+        _exports = LazyExports(__name__, {"Name": "package.module", ...})
+        __getattr__ = _exports.resolve
+        __dir__ = _exports.dir
+    """
+
+    def __init__(self, package: str, exports: dict[str, str]) -> None:
+        """
+        Initializes a `LazyExports` instance for a package.
+
+        Args:
+            package (str): The name of the package (i.e., its `__name__`).
+            exports (dict[str, str]): The module of each exported name, either as `module` when the name is defined
+            under the same name in the module, or as `module:attribute` otherwise.
+        """
+        self._package = package
+        self._exports = exports
+
+    def resolve(self, name: str) -> Any:
+        """
+        Imports the module of an exported name and returns the exported object, which is also stored in the package so
+        that later accesses bypass this method.
+
+        Args:
+            name (str): The exported name.
+
+        Returns:
+            Any: The exported object.
+
+        Raises:
+            AttributeError: If the name is not exported by the package.
+        """
+        if name not in self._exports:
+            raise AttributeError(f"module {self._package!r} has no attribute {name!r}")
+        module, _, attribute = self._exports[name].partition(":")
+        value = getattr(importlib.import_module(module), attribute or name)
+        setattr(sys.modules[self._package], name, value)
+        return value
+
+    def dir(self) -> list[str]:
+        """
+        Lists the attributes of the package, including the exported names that have not been resolved yet.
+
+        Returns:
+            list[str]: The names of the attributes.
+        """
+        return sorted(set(vars(sys.modules[self._package])) | set(self._exports))
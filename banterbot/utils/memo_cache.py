@@ -0,0 +1,172 @@
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+
+class MemoCache:
+    """
+    A thread-safe LRU cache for the results of pure functions, bounded by the approximate number of bytes held by its
+    entries rather than by their number, so that a few very long strings cannot blow up its memory use. It counts hits,
+    misses and evictions, and can be disabled, in which case every lookup misses without being counted.
+
+    Results are shared between callers, so they must be immutable (e.g., tuples of strings).
+    """
+
+    def __init__(self, max_bytes: int, enabled: bool = True) -> None:
+        """
+        Initializes an empty `MemoCache` instance.
+
+        Args:
+            max_bytes (int): The maximum approximate number of bytes held by the entries of the cache.
+            enabled (bool): Whether the cache is initially enabled.
+        """
+        logging.debug(f"MemoCache initialized")
+        self._max_bytes = max_bytes
+        self._enabled = enabled
+        self._lock = threading.Lock()
+
+        # The entries, mapping keys to tuples of the form (value, size), in order of least recent use.
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether the cache is enabled.
+
+        Returns:
+            bool: True if the cache is enabled, False otherwise.
+        """
+        return self._enabled
+
+    def enable(self, max_bytes: Optional[int] = None) -> None:
+        """
+        Enables the cache, optionally changing its maximum size.
+
+        Args:
+            max_bytes (Optional[int]): The new maximum approximate number of bytes held by the entries of the cache;
+            None to keep the current one.
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self._max_bytes = max_bytes
+                self._evict()
+            self._enabled = True
+
+    def disable(self) -> None:
+        """
+        Disables the cache and releases its entries.
+        """
+        with self._lock:
+            self._enabled = False
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retrieves a value from the cache.
+
+        Args:
+            key (Hashable): The key of the value, typically the arguments of the memoized call.
+
+        Returns:
+            Optional[Any]: The cached value, or None if it is missing or the cache is disabled.
+        """
+        if not self._enabled:
+            return None
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """
+        Adds a value to the cache, evicting the least recently used entries if the cache exceeds its maximum size.
+        Values larger than the whole cache are not added.
+
+        Args:
+            key (Hashable): The key of the value, typically the arguments of the memoized call.
+            value (Any): The value, which must not be None.
+            size (Optional[int]): The approximate number of bytes held by the entry; estimated from the key and value
+            (see method `sizeof`) if None.
+        """
+        if not self._enabled:
+            return
+        if size is None:
+            size = self.sizeof(key) + self.sizeof(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if (entry := self._entries.pop(key, None)) is not None:
+                self._bytes -= entry[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """
+        The hit, miss and eviction counters of the cache, its hit rate, and its current number of entries and bytes.
+
+        Returns:
+            dict[str, Any]: The cache statistics.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else None,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    @staticmethod
+    def sizeof(value: Any) -> int:
+        """
+        Estimates the number of bytes held by a key or value, including the items of a tuple (one level deep, which
+        covers the tuples of strings returned by class `NLP`).
+
+        Args:
+            value (Any): The key or value.
+
+        Returns:
+            int: The approximate number of bytes.
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, tuple):
+            size += sum(sys.getsizeof(item) for item in value)
+        return size
+
+    def _evict(self) -> None:
+        """
+        Evicts the least recently used entries until the cache no longer exceeds its maximum size. Must be called while
+        holding the lock.
+        """
+        while self._bytes > self._max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
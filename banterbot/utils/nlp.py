@@ -1,10 +1,17 @@
+import functools
 import logging
+import multiprocessing
 import re
-from typing import Generator
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any, Generator, Optional
 
 import spacy
 
-from banterbot.data.enums import SpaCyLangModel
+from banterbot.config import NLP_BATCH_SIZE, NLP_CACHE_ENABLED, NLP_CACHE_MAX_BYTES, NLP_N_PROCESS, SEGMENTATION_BACKEND
+from banterbot.data.enums import SegmentationBackend, SpaCyLangModel
+from banterbot.utils.memo_cache import MemoCache
+from banterbot.utils.rule_sentence_segmenter import RuleSentenceSegmenter
 
 
 class NLP:
@@ -26,6 +33,68 @@ class NLP:
         SpaCyLangModel.EN_CORE_WEB_LG: None,
     }
 
+    # Whether the installed models have been checked yet, which is deferred to the first model load.
+    _models_checked = False
+    _models_checked_lock = threading.Lock()
+
+    # The backend used by method `segment_sentences` when none is specified.
+    _segmentation_backend = SegmentationBackend(SEGMENTATION_BACKEND)
+
+    @classmethod
+    def set_segmentation_backend(cls, backend: SegmentationBackend) -> None:
+        """
+        Sets the backend used by method `segment_sentences` when none is specified, for the whole process.
+
+        Args:
+            backend (SegmentationBackend): The default backend of sentence segmentation.
+        """
+        logging.debug(f"NLP set segmentation backend: `{backend.value}`")
+        cls._segmentation_backend = backend
+
+    @classmethod
+    def segmentation_backend(cls) -> SegmentationBackend:
+        """
+        Returns the backend used by method `segment_sentences` when none is specified.
+
+        Returns:
+            SegmentationBackend: The default backend of sentence segmentation.
+        """
+        return cls._segmentation_backend
+
+    # The memoized results of methods `segment_sentences`, `segment_words` and `extract_keywords`, which are often
+    # called repeatedly on the same strings (e.g., when a stream is flushed, or a transcript is segmented again).
+    _cache = MemoCache(max_bytes=NLP_CACHE_MAX_BYTES, enabled=NLP_CACHE_ENABLED)
+
+    @classmethod
+    def enable_cache(cls, max_bytes: Optional[int] = None) -> None:
+        """
+        Enables the memoization of segmentation and keyword extraction results, for the whole process.
+
+        Args:
+            max_bytes (Optional[int]): The new maximum approximate number of bytes held by the cache; None to keep the
+            current one.
+        """
+        cls._cache.enable(max_bytes=max_bytes)
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        """
+        Disables the memoization of segmentation and keyword extraction results, for the whole process, and releases
+        the cached results.
+        """
+        cls._cache.disable()
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, Any]:
+        """
+        Returns the statistics of the memoization of segmentation and keyword extraction results, including its hit
+        rate (see property `MemoCache.stats`).
+
+        Returns:
+            dict[str, Any]: The cache statistics.
+        """
+        return cls._cache.stats
+
     @classmethod
     def install_upgrade_all_models(cls) -> None:
         """
@@ -35,6 +104,7 @@ class NLP:
         for model in SpaCyLangModel:
             if model.value not in installed:
                 cls._download_model(model.value)
+        cls._models_checked = True
 
     @classmethod
     def load_all_models(cls) -> None:
@@ -93,21 +163,70 @@ class NLP:
         return cls._models[name]
 
     @classmethod
-    def segment_sentences(cls, string: str, whitespace: bool = True) -> tuple[str, ...]:
+    def segment_sentences(
+        cls, string: str, whitespace: bool = True, backend: Optional[SegmentationBackend] = None, cache: bool = True
+    ) -> tuple[str, ...]:
         """
-        Splits a text string into individual sentences using a specialized spaCy model. The model is a lightweight
-        version of `en_core_web_sm` designed specifically for sentence segmentation.
+        Splits a text string into individual sentences. By default, this uses a specialized spaCy model, which is a
+        lightweight version of `en_core_web_sm` designed specifically for sentence segmentation; the rule-based backend
+        (see class `RuleSentenceSegmenter`) is much faster and needs no model, but is less accurate on unusual text.
 
         Args:
             string (str): The input text string.
             whitespace (str): If True, keep whitespace at the beginning/end of sentences; if False, strip it.
+            backend (Optional[SegmentationBackend]): The backend of sentence segmentation; None for the default backend
+            (see method `set_segmentation_backend`).
+            cache (bool): Whether the result may be looked up in, and added to, the memoization cache; False for strings
+            that are unlikely to be segmented again (e.g., the growing buffer of a stream).
 
         Returns:
             tuple[str, ...]: A tuple of individual sentences as strings.
         """
-        return tuple(
-            sentence.text_with_ws if whitespace else sentence.text for sentence in cls.model("senter")(string).sents
-        )
+        backend = backend or cls._segmentation_backend
+        key = ("sentences", backend, whitespace, string)
+        if cache and (sentences := cls._cache.get(key)) is not None:
+            return sentences
+
+        if backend == SegmentationBackend.RULES:
+            sentences = RuleSentenceSegmenter.segment(string=string, whitespace=whitespace)
+        else:
+            sentences = cls._sentences(doc=cls.model("senter")(string), whitespace=whitespace)
+        if cache:
+            cls._cache.put(key, sentences)
+        return sentences
+
+    @classmethod
+    def segment_sentences_many(
+        cls,
+        strings: Iterable[str],
+        whitespace: bool = True,
+        batch_size: int = NLP_BATCH_SIZE,
+        n_process: int = NLP_N_PROCESS,
+        backend: Optional[SegmentationBackend] = None,
+    ) -> Generator[tuple[str, ...], None, None]:
+        """
+        Splits many text strings into individual sentences (see method `segment_sentences`), processing them in batches
+        and optionally in several worker processes. The strings are consumed lazily, so that memory use does not grow
+        with their number.
+
+        Args:
+            strings (Iterable[str]): The input text strings.
+            whitespace (str): If True, keep whitespace at the beginning/end of sentences; if False, strip it.
+            batch_size (int): The number of strings processed together (by a worker process, if any).
+            n_process (int): The number of worker processes, or -1 for one per CPU; 1 to process in this process.
+            backend (Optional[SegmentationBackend]): The backend of sentence segmentation; None for the default backend
+            (see method `set_segmentation_backend`).
+
+        Yields:
+            Generator[tuple[str, ...], None, None]: The sentences of each input string, in order.
+        """
+        if (backend or cls._segmentation_backend) == SegmentationBackend.RULES:
+            func = functools.partial(RuleSentenceSegmenter.segment, whitespace=whitespace)
+            yield from cls._map(func=func, strings=strings, batch_size=batch_size, n_process=n_process)
+        else:
+            docs = cls.model("senter").pipe(strings, batch_size=batch_size, n_process=n_process)
+            for doc in docs:
+                yield cls._sentences(doc=doc, whitespace=whitespace)
 
     @classmethod
     def segment_words(cls, string: str, whitespace: bool = True) -> tuple[str, ...]:
@@ -122,13 +241,38 @@ class NLP:
         Returns:
             tuple[str, ...]: A tuple of individual words as strings.
         """
-        words = []
-        for word in cls.model("splitter")(string):
-            words.append(word.text)
-            if whitespace and word.whitespace_:
-                words.append(word.whitespace_)
+        key = ("words", whitespace, string)
+        if (words := cls._cache.get(key)) is not None:
+            return words
 
-        return tuple(words)
+        words = cls._words(doc=cls.model("splitter")(string), whitespace=whitespace)
+        cls._cache.put(key, words)
+        return words
+
+    @classmethod
+    def segment_words_many(
+        cls,
+        strings: Iterable[str],
+        whitespace: bool = True,
+        batch_size: int = NLP_BATCH_SIZE,
+        n_process: int = NLP_N_PROCESS,
+    ) -> Generator[tuple[str, ...], None, None]:
+        """
+        Splits many text strings into individual words (see method `segment_words`), processing them in batches and
+        optionally in several worker processes. The strings are consumed lazily, so that memory use does not grow with
+        their number.
+
+        Args:
+            strings (Iterable[str]): The input text strings.
+            whitespace (str): If True, include whitespace characters between words; if False, omit it.
+            batch_size (int): The number of strings processed together (by a worker process, if any).
+            n_process (int): The number of worker processes, or -1 for one per CPU; 1 to process in this process.
+
+        Yields:
+            Generator[tuple[str, ...], None, None]: The words of each input string, in order.
+        """
+        for doc in cls.model("splitter").pipe(strings, batch_size=batch_size, n_process=n_process):
+            yield cls._words(doc=doc, whitespace=whitespace)
 
     @classmethod
     def extract_keywords(cls, strings: list[str]) -> tuple[tuple[str, ...]]:
@@ -141,21 +285,113 @@ class NLP:
         Returns:
             tuple[str, ...]: A tuple of extracted keywords as strings.
         """
-        docs = cls.model(SpaCyLangModel.EN_CORE_WEB_MD).pipe(strings)
-        return tuple(tuple(str(entity) for entity in doc.ents) for doc in docs)
+        keys = [("keywords", string) for string in strings]
+        keywords = [cls._cache.get(key) for key in keys]
+
+        # Only the strings whose keywords are not cached are processed, together in a single batch.
+        misses = [n for n, value in enumerate(keywords) if value is None]
+        for n, value in zip(misses, cls.extract_keywords_many(strings[n] for n in misses)):
+            keywords[n] = value
+            cls._cache.put(keys[n], value)
+
+        return tuple(keywords)
 
     @classmethod
-    def tokenize(cls, strings: list[str]) -> Generator[spacy.tokens.doc.Doc, None, None]:
+    def extract_keywords_many(
+        cls, strings: Iterable[str], batch_size: int = NLP_BATCH_SIZE, n_process: int = NLP_N_PROCESS
+    ) -> Generator[tuple[str, ...], None, None]:
+        """
+        Extracts keywords from many text strings using the `en_core_web_md` spaCy model, processing them in batches and
+        optionally in several worker processes. The strings are consumed lazily, so that memory use does not grow with
+        their number.
+
+        Args:
+            strings (Iterable[str]): The input text strings.
+            batch_size (int): The number of strings processed together (by a worker process, if any).
+            n_process (int): The number of worker processes, or -1 for one per CPU; 1 to process in this process.
+
+        Yields:
+            Generator[tuple[str, ...], None, None]: The keywords of each input string, in order.
+        """
+        docs = cls.model(SpaCyLangModel.EN_CORE_WEB_MD).pipe(strings, batch_size=batch_size, n_process=n_process)
+        for doc in docs:
+            yield tuple(str(entity) for entity in doc.ents)
+
+    @classmethod
+    def tokenize(
+        cls, strings: Iterable[str], batch_size: int = NLP_BATCH_SIZE, n_process: int = NLP_N_PROCESS
+    ) -> Generator[spacy.tokens.doc.Doc, None, None]:
         """
         Given a string or list of strings, returns tokenized versions of the strings as a generator.
 
         Args:
-            strings (list[str]): A list of strings.
+            strings (Iterable[str]): A list of strings.
+            batch_size (int): The number of strings processed together (by a worker process, if any).
+            n_process (int): The number of worker processes, or -1 for one per CPU; 1 to process in this process.
 
         Returns:
             Generator[spacy.tokens.doc.Doc, None, None]: A stream of `spacy.tokens.doc.Doc` instances.
         """
-        return cls.model(SpaCyLangModel.EN_CORE_WEB_LG).pipe(strings)
+        return cls.model(SpaCyLangModel.EN_CORE_WEB_LG).pipe(strings, batch_size=batch_size, n_process=n_process)
+
+    @staticmethod
+    def _sentences(doc: spacy.tokens.doc.Doc, whitespace: bool) -> tuple[str, ...]:
+        """
+        Extracts the sentences of a document processed by the `senter` model.
+
+        Args:
+            doc (spacy.tokens.doc.Doc): The processed document.
+            whitespace (bool): If True, keep whitespace at the beginning/end of sentences; if False, strip it.
+
+        Returns:
+            tuple[str, ...]: A tuple of individual sentences as strings.
+        """
+        return tuple(sentence.text_with_ws if whitespace else sentence.text for sentence in doc.sents)
+
+    @staticmethod
+    def _words(doc: spacy.tokens.doc.Doc, whitespace: bool) -> tuple[str, ...]:
+        """
+        Extracts the words of a document processed by the `splitter` model.
+
+        Args:
+            doc (spacy.tokens.doc.Doc): The processed document.
+            whitespace (bool): If True, include whitespace characters between words; if False, omit it.
+
+        Returns:
+            tuple[str, ...]: A tuple of individual words as strings.
+        """
+        words = []
+        for word in doc:
+            words.append(word.text)
+            if whitespace and word.whitespace_:
+                words.append(word.whitespace_)
+
+        return tuple(words)
+
+    @staticmethod
+    def _map(
+        func: Callable[[str], Any], strings: Iterable[str], batch_size: int, n_process: int
+    ) -> Generator[Any, None, None]:
+        """
+        Lazily applies a function that needs no spaCy model to many strings, in batches spread over worker processes as
+        in spaCy's `Language.pipe`, so that both kinds of backends scale in the same way.
+
+        Args:
+            func (Callable[[str], Any]): The function to apply, which must be picklable.
+            strings (Iterable[str]): The input text strings.
+            batch_size (int): The number of strings sent to a worker process at once.
+            n_process (int): The number of worker processes, or -1 for one per CPU; 1 to process in this process.
+
+        Yields:
+            Generator[Any, None, None]: The output of the function for each input string, in order.
+        """
+        if n_process == -1:
+            n_process = multiprocessing.cpu_count()
+        if n_process == 1:
+            yield from map(func, strings)
+        else:
+            with multiprocessing.Pool(processes=n_process) as pool:
+                yield from pool.imap(func, strings, chunksize=batch_size)
 
     @classmethod
     def _download_model(cls, name: str) -> None:
@@ -193,6 +429,11 @@ class NLP:
         Returns:
             spacy.language.Language: The loaded spaCy model.
         """
+        # On the first model load, download any missing required models.
+        with cls._models_checked_lock:
+            if not cls._models_checked:
+                cls.install_upgrade_all_models()
+
         # If the model is not available, download it.
         try:
             model = spacy.load(name, **kwargs)
@@ -211,6 +452,3 @@ class NLP:
 
         return model
 
-
-# Upon import, NLP downloads any missing required models.
-NLP.install_upgrade_all_models()
@@ -0,0 +1,171 @@
+import datetime
+import importlib.util
+import logging
+from typing import Any, Union
+
+import httpx
+import openai
+
+from banterbot.config import RETRY_LIMIT
+from banterbot.models.message import Message
+from banterbot.models.openai_model import OpenAIModel
+from banterbot.utils.rate_limiter import RateLimiter
+
+
+class OpenAIRequest:
+    """
+    The parts of an OpenAI ChatCompletion request that do not depend on whether it is sent synchronously (as in
+    `OpenAIService`) or asynchronously (as in `AsyncOpenAIService`): the construction of the request and of the HTTP
+    client, the estimation of its tokens for the rate limiter, the handling of responses, and the delays between
+    retries. The services only provide the loop that sends the request and waits, so that both follow the same rules.
+
+    Usage:
+
+        request = OpenAIRequest(service="OpenAIService", rate_limiter=..., model=..., messages=..., stream=...)
+        for attempt in request.attempts():
+            rate_limiter.acquire(tokens=request.tokens)
+            try:
+                return request.parse(client.chat.completions.with_raw_response.create(**request.kwargs))
+            except openai.APIError as error:
+                time.sleep(request.retry_time(attempt=attempt, error=error))
+        raise request.failure()
+    """
+
+    @staticmethod
+    def http_client_options(
+        service: str,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        connect_timeout: float,
+        read_timeout: float,
+        http2: bool,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of an `httpx.Client` or `httpx.AsyncClient` with a persistent connection pool.
+
+        Args:
+            service (str): The name of the calling service, used in log messages.
+            max_connections (int): The maximum number of concurrent connections to the OpenAI API.
+            max_keepalive_connections (int): The maximum number of idle connections kept alive in the pool.
+            keepalive_expiry (float): The number of seconds after which an idle connection is closed.
+            connect_timeout (float): The number of seconds to wait for a connection to be established.
+            read_timeout (float): The number of seconds to wait for data to be received, or to be sent.
+            http2 (bool): Whether HTTP/2 should be used; ignored with a warning if the `h2` package is not installed.
+
+        Returns:
+            dict[str, Any]: The keyword arguments of the HTTP client.
+        """
+        if http2 and importlib.util.find_spec("h2") is None:
+            logging.warning(f"{service} could not enable HTTP/2 since package `h2` is not installed")
+            http2 = False
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(read_timeout, connect=connect_timeout),
+            "http2": http2,
+        }
+
+    def __init__(
+        self,
+        service: str,
+        rate_limiter: RateLimiter,
+        model: OpenAIModel,
+        messages: list[Message],
+        stream: bool,
+        **kwargs,
+    ) -> None:
+        """
+        Initializes an `OpenAIRequest` instance.
+
+        Args:
+            service (str): The name of the calling service, used in log messages.
+
+            rate_limiter (RateLimiter): The rate limiter that is updated from the responses and errors of the request.
+
+            model (OpenAIModel): The OpenAI model to be used.
+
+            messages (list[Message]): A list of messages. Each message should be an instance of the `Message` class,
+            which contains the content and role (user or assistant) of the message.
+
+            stream (bool): Whether the response should be returned as a stream or a complete text.
+
+            **kwargs: Additional parameters for the API request. These can include settings such as temperature, top_p,
+            and frequency_penalty.
+        """
+        self._service = service
+        self._rate_limiter = rate_limiter
+        self._stream = stream
+
+        # The keyword arguments of the ChatCompletion request.
+        self.kwargs = kwargs
+        self.kwargs["model"] = model.model
+        self.kwargs["n"] = 1
+        self.kwargs["stream"] = stream
+        self.kwargs["messages"] = [message() for message in messages]
+
+        # Estimate the number of tokens counted against the rate limit, in the same way as the OpenAI API does.
+        self.tokens = sum(len(message["content"]) for message in self.kwargs["messages"]) // 4
+        self.tokens += self.kwargs.get("max_tokens") or 0
+
+    @staticmethod
+    def attempts() -> range:
+        """
+        The indices of the attempts at sending the request, up to `config.RETRY_LIMIT`.
+
+        Returns:
+            range: The attempt indices, starting at zero.
+        """
+        return range(RETRY_LIMIT)
+
+    def parse(self, raw_response: Any) -> Union[Any, str]:
+        """
+        Updates the rate limiter from the headers of a successful response, and parses it.
+
+        Args:
+            raw_response (openai.APIResponse): The raw response, from `chat.completions.with_raw_response.create`.
+
+        Returns:
+            Union[Any, str]: The response stream if the request is streamed, or the stripped text of the response.
+        """
+        self._rate_limiter.update(raw_response.headers)
+        response = raw_response.parse()
+        return response if self._stream else response.choices[0].message.content.strip()
+
+    def retry_time(self, attempt: int, error: openai.APIError) -> float:
+        """
+        Computes the number of seconds to wait after a failed attempt, from the headers of the error if any. Rate limit
+        errors also pause every other request that shares the rate limiter.
+
+        Args:
+            attempt (int): The index of the failed attempt.
+            error (openai.APIError): The error raised by the attempt.
+
+        Returns:
+            float: The number of seconds to wait before the next attempt.
+        """
+        rate_limited = isinstance(error, openai.RateLimitError)
+        headers = error.response.headers if isinstance(error, openai.APIStatusError) else None
+        retry_time = self._rate_limiter.backoff(attempt=attempt, headers=headers, pause=rate_limited)
+        retry_timestamp = datetime.datetime.now() + datetime.timedelta(seconds=retry_time)
+        retry_timestamp = retry_timestamp.strftime("%H:%M:%S")
+        kind = "Rate Limiting Error" if rate_limited else "API Error"
+        error_message = (
+            f"{self._service} encountered an OpenAI {kind} - Attempt {attempt+1}/{RETRY_LIMIT}. Waiting "
+            f"{retry_time:.2f} seconds until {retry_timestamp} to retry."
+        )
+        logging.info(error_message)
+        return retry_time
+
+    def failure(self) -> RuntimeError:
+        """
+        The error to raise once every attempt has failed.
+
+        Returns:
+            RuntimeError: The error.
+        """
+        return RuntimeError(f"{self._service} encountered too many OpenAI API Errors; exiting program.")
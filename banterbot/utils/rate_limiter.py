@@ -0,0 +1,238 @@
+import asyncio
+import email.utils
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Mapping
+from typing import Optional
+
+from typing_extensions import Self
+
+from banterbot.config import (
+    RATE_LIMIT_REQUESTS_PER_MINUTE,
+    RATE_LIMIT_TOKENS_PER_MINUTE,
+    RETRY_BACKOFF_BASE,
+    RETRY_TIME,
+)
+
+
+class RateLimiter:
+    """
+    A thread-safe token-bucket rate limiter for requests and tokens per minute, meant to be shared by every OpenAI
+    ChatCompletion request in a process (see method `default`).
+
+    Each request reserves capacity from both buckets and is told how long to wait before sending it; since balances
+    are allowed to go negative, concurrent callers are queued in the order they arrive instead of all retrying at once.
+    The limits are adjusted from the `x-ratelimit-*` headers returned by the server, and rate limit errors pause all
+    callers for the duration given by the `Retry-After` header, or an exponential backoff with jitter otherwise.
+    """
+
+    _default: Optional[Self] = None
+    _default_lock = threading.Lock()
+
+    # Compile a regex pattern that matches the durations used in `x-ratelimit-reset-*` headers (e.g., "6m0s", "20ms").
+    _duration_pattern = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+    _duration_units = {"ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+    @classmethod
+    def default(cls) -> Self:
+        """
+        Returns the process-wide instance of `RateLimiter`, initializing it with the limits in `config.py` on first use.
+
+        Returns:
+            RateLimiter: The shared instance.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def __init__(
+        self,
+        requests_per_minute: int = RATE_LIMIT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = RATE_LIMIT_TOKENS_PER_MINUTE,
+    ) -> None:
+        """
+        Initializes a `RateLimiter` instance with full buckets.
+
+        Args:
+            requests_per_minute (int): The maximum number of requests per minute.
+            tokens_per_minute (int): The maximum number of tokens per minute.
+        """
+        self._lock = threading.Lock()
+        self._request_limit = requests_per_minute
+        self._token_limit = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+
+        # The time until which all requests are paused, following a rate limit error.
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserves capacity for one request of the given number of tokens, without blocking.
+
+        Args:
+            tokens (int): The estimated number of tokens used by the request.
+
+        Returns:
+            float: The number of seconds to wait before the request may be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._requests -= 1
+            self._tokens -= min(tokens, self._token_limit)
+            return max(
+                -60.0 * self._requests / self._request_limit,
+                -60.0 * self._tokens / self._token_limit,
+                self._paused_until - now,
+                0.0,
+            )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Reserves capacity for one request of the given number of tokens, blocking the current thread until it may be
+        sent.
+
+        Args:
+            tokens (int): The estimated number of tokens used by the request.
+
+        Returns:
+            float: The number of seconds that were waited.
+        """
+        if (delay := self.reserve(tokens=tokens)) > 0:
+            logging.debug(f"RateLimiter queued request for {delay:.3f} seconds")
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """
+        Reserves capacity for one request of the given number of tokens, suspending the current task until it may be
+        sent.
+
+        Args:
+            tokens (int): The estimated number of tokens used by the request.
+
+        Returns:
+            float: The number of seconds that were waited.
+        """
+        if (delay := self.reserve(tokens=tokens)) > 0:
+            logging.debug(f"RateLimiter queued request for {delay:.3f} seconds")
+            await asyncio.sleep(delay)
+        return delay
+
+    def backoff(self, attempt: int, headers: Optional[Mapping[str, str]] = None, pause: bool = False) -> float:
+        """
+        Computes the number of seconds to wait before retrying a failed request. The server's `Retry-After` header is
+        honoured if present; otherwise, an exponential backoff with full jitter is used, capped at `config.RETRY_TIME`.
+
+        Args:
+            attempt (int): The zero-based index of the failed attempt.
+            headers (Optional[Mapping[str, str]]): The headers of the error response, if any.
+            pause (bool): If True, all requests sharing this instance are paused for the duration (for rate limits).
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+        delay = self._retry_after(headers) if headers is not None else None
+        if delay is None:
+            delay = random.uniform(0, min(RETRY_TIME, RETRY_BACKOFF_BASE * 2**attempt))
+
+        if headers is not None:
+            self.update(headers)
+
+        if pause:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        return delay
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Updates the limits and remaining capacity of the buckets from the `x-ratelimit-*` headers of a response.
+
+        Args:
+            headers (Mapping[str, str]): The headers of a response from the OpenAI API.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            for kind in ("requests", "tokens"):
+                try:
+                    limit = int(headers[f"x-ratelimit-limit-{kind}"])
+                    remaining = int(headers[f"x-ratelimit-remaining-{kind}"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+                if kind == "requests":
+                    self._request_limit = limit
+                    self._requests = min(self._requests, remaining)
+                else:
+                    self._token_limit = limit
+                    self._tokens = min(self._tokens, remaining)
+
+                if remaining <= 0 and (reset := self._parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))):
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def _refill(self, now: float) -> None:
+        """
+        Refills both buckets in proportion to the time elapsed since the last refill. Must be called with the lock held.
+
+        Args:
+            now (float): The current value of `time.monotonic()`.
+        """
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self._request_limit, self._requests + elapsed * self._request_limit / 60.0)
+        self._tokens = min(self._token_limit, self._tokens + elapsed * self._token_limit / 60.0)
+
+    @classmethod
+    def _parse_duration(cls, value: Optional[str]) -> Optional[float]:
+        """
+        Parses a duration of the form used in the `x-ratelimit-reset-*` headers, such as "1s", "6m0s", or "20ms".
+
+        Args:
+            value (Optional[str]): The header value.
+
+        Returns:
+            Optional[float]: The duration in seconds, or None if it could not be parsed.
+        """
+        if not value:
+            return None
+        matches = cls._duration_pattern.findall(value)
+        if not matches:
+            return None
+        return sum(float(number) * cls._duration_units[unit] for number, unit in matches)
+
+    @staticmethod
+    def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Parses the `retry-after-ms` or `retry-after` header of a response, which may be given in seconds or as a date.
+
+        Args:
+            headers (Mapping[str, str]): The headers of the error response.
+
+        Returns:
+            Optional[float]: The number of seconds to wait, or None if no valid header is present.
+        """
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        if (value := headers.get("retry-after")) is None:
+            return None
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        try:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
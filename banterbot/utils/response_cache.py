@@ -0,0 +1,294 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+import banterbot.paths
+from banterbot import config
+
+
+class ResponseCache:
+    """
+    A two-tier cache for deterministic OpenAI ChatCompletion responses, keyed on a hash of the model name, the
+    serialized messages, and the request parameters. The first tier is an in-memory LRU cache; the optional second tier
+    persists responses to disk under the BanterBot filesystem so that they survive between sessions.
+
+    Both tiers are bounded in size, entries expire after a configurable time-to-live, and the number of hits and misses
+    is counted per tier. All operations are thread-safe.
+
+    The on-disk tier may be shared by several processes. Entries are written to a temporary file that then replaces the
+    entry, so that readers never see a partial entry, and the file I/O happens outside the lock of the cache so that a
+    slow disk never blocks the in-memory tier. The on-disk tier is best effort: unreadable or malformed entries are
+    misses, and failures to write or prune entries are logged rather than raised.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = config.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = config.RESPONSE_CACHE_TTL,
+        disk: bool = False,
+        max_disk_entries: int = config.RESPONSE_CACHE_MAX_DISK_ENTRIES,
+        directory: Optional[Path] = None,
+    ) -> None:
+        """
+        Initializes a `ResponseCache` instance.
+
+        Args:
+            max_entries (int): The maximum number of responses in the in-memory tier.
+            ttl (Optional[float]): The number of seconds after which a response expires; None if responses never expire.
+            disk (bool): Whether the on-disk tier should be enabled.
+            max_disk_entries (int): The maximum number of responses in the on-disk tier.
+            directory (Optional[Path]): The directory of the on-disk tier; defaults to a subdirectory of `paths.cache`.
+        """
+        logging.debug(f"ResponseCache initialized")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._disk = disk
+        self._max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+
+        # Held while the on-disk tier is pruned, so that concurrent writes do not prune it more than once.
+        self._prune_lock = threading.Lock()
+
+        # The in-memory tier, mapping keys to tuples of the form (timestamp, response), in order of least recent use.
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if self._disk:
+            self._directory = banterbot.paths.cache / banterbot.paths.response_cache if directory is None else directory
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._disk_entries = sum(1 for _ in self._directory.glob("*.json"))
+
+    @staticmethod
+    def key(model: str, messages: list[dict[str, str]], kwargs: dict[str, Any]) -> str:
+        """
+        Generates a cache key from the parameters of a ChatCompletion request.
+
+        Args:
+            model (str): The name of the OpenAI model.
+            messages (list[dict[str, str]]): The messages, serialized in the format expected by the OpenAI API.
+            kwargs (dict[str, Any]): Any additional parameters of the API request.
+
+        Returns:
+            str: A hexadecimal SHA-256 digest.
+        """
+        data = json.dumps({"model": model, "messages": messages, "kwargs": kwargs}, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode(config.ENCODING)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retrieves a response from the cache, first checking the in-memory tier and then the on-disk tier, if enabled.
+        Responses found on disk are promoted to the in-memory tier.
+
+        Args:
+            key (str): The cache key, as generated by method `key`.
+
+        Returns:
+            Optional[str]: The cached response, or None if it is missing or has expired.
+        """
+        with self._lock:
+            if (entry := self._memory.get(key)) is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self._memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        entry = self._disk_get(key) if self._disk else None
+
+        with self._lock:
+            if entry is not None:
+                self._memory_put(key, entry)
+                self._disk_hits += 1
+                return entry[1]
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Adds a response to the cache, evicting the least recently used entries if a tier exceeds its maximum size. A
+        failure to write the response to disk is logged, and the response remains cached in memory.
+
+        Args:
+            key (str): The cache key, as generated by method `key`.
+            response (str): The response to be cached.
+        """
+        entry = (time.time(), response)
+        with self._lock:
+            self._memory_put(key, entry)
+
+        if self._disk:
+            try:
+                self._disk_put(key, entry)
+            except OSError as error:
+                logging.warning(f"ResponseCache could not write an entry to disk: {error}")
+
+    def clear(self) -> None:
+        """
+        Removes all entries from both tiers of the cache and resets the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._disk_entries = 0
+            self._memory_hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+
+        if self._disk:
+            for path in self._directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        The hit and miss counters of the cache, along with the current number of entries in each tier.
+
+        Returns:
+            dict[str, int]: The cache statistics.
+        """
+        with self._lock:
+            return {
+                "hits": self._memory_hits + self._disk_hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries if self._disk else 0,
+            }
+
+    def _expired(self, timestamp: float) -> bool:
+        """
+        Checks whether an entry created at the given time has expired.
+
+        Args:
+            timestamp (float): The time at which the entry was created.
+
+        Returns:
+            bool: True if the entry has expired, False otherwise.
+        """
+        return self._ttl is not None and time.time() - timestamp > self._ttl
+
+    def _memory_put(self, key: str, entry: tuple[float, str]) -> None:
+        """
+        Adds an entry to the in-memory tier, evicting the least recently used entry if the tier is full.
+
+        Args:
+            key (str): The cache key.
+            entry (tuple[float, str]): The timestamp and response.
+        """
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, str]]:
+        """
+        Reads an entry from the on-disk tier, deleting it if it has expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[tuple[float, str]]: The timestamp and response, or None if missing, malformed, or expired.
+        """
+        path = self._directory / f"{key}.json"
+        try:
+            with open(path, "r", encoding=config.ENCODING) as fs:
+                data = json.load(fs)
+            timestamp, response = float(data["timestamp"]), data["response"]
+            if not isinstance(response, str):
+                raise TypeError("the response of the entry is not a string")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logging.debug(f"ResponseCache ignored a malformed entry on disk: {error}")
+            return None
+
+        try:
+            if self._expired(timestamp):
+                path.unlink()
+                with self._lock:
+                    self._disk_entries -= 1
+                return None
+
+            # Refresh the modification time, which is used to determine the least recently used entries.
+            os.utime(path)
+        except OSError:
+            # The entry was removed by another process or thread: it is still valid for this read.
+            pass
+
+        return timestamp, response
+
+    def _disk_put(self, key: str, entry: tuple[float, str]) -> None:
+        """
+        Writes an entry to the on-disk tier, pruning the least recently used entries if the tier is full. The entry is
+        written to a temporary file in the same directory, which then atomically replaces the entry.
+
+        Args:
+            key (str): The cache key.
+            entry (tuple[float, str]): The timestamp and response.
+
+        Raises:
+            OSError: If the entry could not be written.
+        """
+        path = self._directory / f"{key}.json"
+        descriptor, temporary = tempfile.mkstemp(dir=self._directory, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with open(descriptor, "w", encoding=config.ENCODING) as fs:
+                json.dump({"timestamp": entry[0], "response": entry[1]}, fs)
+            exists = path.exists()
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if not exists:
+                self._disk_entries += 1
+            prune = self._disk_entries > self._max_disk_entries
+
+        # A write during a prune leaves it to the thread already pruning, which checks the size again once it is done.
+        while prune and self._prune_lock.acquire(blocking=False):
+            try:
+                self._disk_prune()
+            finally:
+                self._prune_lock.release()
+            with self._lock:
+                prune = self._disk_entries > self._max_disk_entries
+
+    def _disk_prune(self) -> None:
+        """
+        Removes the least recently used entries of the on-disk tier, along with an extra tenth of the tier, in order to
+        avoid rescanning the directory on every write. Entries removed concurrently by other processes are skipped.
+        """
+        with self._lock:
+            counted = self._disk_entries
+
+        entries = []
+        for path in self._directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        entries.sort()
+        excess = max(len(entries) - int(0.9 * self._max_disk_entries), 0)
+        for _, path in entries[:excess]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as error:
+                logging.warning(f"ResponseCache could not remove an entry from disk: {error}")
+
+        # Keep the entries counted by concurrent writes since the start of the scan.
+        with self._lock:
+            self._disk_entries += len(entries) - excess - counted
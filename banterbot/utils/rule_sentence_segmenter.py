@@ -0,0 +1,91 @@
+import re
+
+from banterbot.config import SENTENCE_ABBREVIATIONS
+
+
+class RuleSentenceSegmenter:
+    """
+    A rule-based sentence segmenter built on precompiled regular expressions, used as the `SegmentationBackend.RULES`
+    backend of method `NLP.segment_sentences`. It needs no model, and is much faster than the spaCy `senter` pipeline,
+    at the cost of some accuracy on unusual text (see `benchmarks/sentence_segmentation.py`).
+
+    A sentence ends at a run of terminal punctuation (optionally followed by closing quotes or brackets) that is
+    followed by whitespace and then by a character that is not lowercase, at full-width terminal punctuation, or at a
+    line break. A single period does not end a sentence after a known abbreviation (see
+    `config.SENTENCE_ABBREVIATIONS`), an initial (e.g., "J. R. R. Tolkien"), or a number that starts the sentence (e.g.,
+    a list item such as "1. ").
+    """
+
+    # Compile a regex pattern that matches potential sentence boundaries, including the whitespace that follows them.
+    _boundary_pattern = re.compile(
+        r"(?P<terminal>[.?!…]+)[\"'”’)\]]*\s+(?=(?P<next>\S))"
+        r"|[。？！]+[\"'”’)\]]*\s*(?=\S)"
+        r"|\n\s*(?=\S)"
+    )
+
+    # Compile a regex pattern that matches the last word before a position, without any leading quotes or brackets.
+    _word_pattern = re.compile(r"[\"'“‘(\[]*(\S*)$")
+
+    _abbreviations = frozenset(SENTENCE_ABBREVIATIONS)
+
+    @classmethod
+    def segment(cls, string: str, whitespace: bool = True) -> tuple[str, ...]:
+        """
+        Splits a text string into individual sentences.
+
+        Args:
+            string (str): The input text string.
+            whitespace (bool): If True, keep whitespace at the beginning/end of sentences, so that the sentences add up
+            to the input string; if False, strip it.
+
+        Returns:
+            tuple[str, ...]: A tuple of individual sentences as strings.
+        """
+        sentences = []
+        start = 0
+        for match in cls._boundary_pattern.finditer(string):
+            if cls._is_boundary(string=string, start=start, match=match):
+                sentences.append(string[start : match.end()])
+                start = match.end()
+        if start < len(string):
+            sentences.append(string[start:])
+
+        if whitespace:
+            return tuple(sentences)
+        return tuple(stripped for sentence in sentences if (stripped := sentence.strip()))
+
+    @classmethod
+    def _is_boundary(cls, string: str, start: int, match: re.Match) -> bool:
+        """
+        Decides whether a potential sentence boundary ends the sentence that begins at a given position.
+
+        Args:
+            string (str): The input text string.
+            start (int): The position of the beginning of the current sentence.
+            match (re.Match): The match of the potential boundary.
+
+        Returns:
+            bool: Whether the current sentence ends at the potential boundary.
+        """
+        # A line break or full-width punctuation ends any sentence that has some content.
+        if (terminal := match["terminal"]) is None:
+            return bool(string[start : match.start()].strip())
+
+        # A sentence cannot begin with a lowercase letter.
+        if match["next"].islower():
+            return False
+
+        if terminal != ".":
+            return True
+
+        word = cls._word_pattern.search(string, start, match.start())[1]
+        if word.lower() in cls._abbreviations:
+            return False
+        # An initial, such as the "J" in "J. Doe".
+        if len(word) == 1 and word.isupper():
+            return False
+        # A number that starts the sentence, such as a list item.
+        if word.isdigit() and not string[start : match.start() - len(word)].strip():
+            return False
+
+        return True
@@ -0,0 +1,169 @@
+import datetime
+import json
+import logging
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Optional, Union
+
+from typing_extensions import Self
+
+from banterbot import config
+from banterbot.config import STREAM_GAUGE_INTERVAL
+from banterbot.handlers.stream_handler import StreamHandler
+from banterbot.paths import gauges
+
+
+class StreamGaugeSampler:
+    """
+    Periodically samples the gauges of the active streams (see method `StreamHandler.gauges`) and appends them to a
+    JSONL file, one line per stream and sample, so that the bottlenecks of streaming under load can be analyzed.
+
+    A process-wide instance can be installed with method `enable`, after which every stream of class `StreamManager` is
+    sampled until it ends. It is disabled by default, in which case the only overhead is a single attribute lookup per
+    stream.
+    """
+
+    _instance: Optional[Self] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def enable(cls, path: Optional[Union[Path, str]] = None, interval: float = STREAM_GAUGE_INTERVAL) -> Self:
+        """
+        Installs and starts a process-wide instance, or returns the existing one.
+
+        Args:
+            path (Optional[Union[Path, str]]): The JSONL file to append samples to; a new timestamped file in the
+            BanterBot filesystem by default.
+            interval (float): The number of seconds between samples.
+
+        Returns:
+            StreamGaugeSampler: The process-wide instance.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(path=path, interval=interval)
+                cls._instance.start()
+            return cls._instance
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Stops and removes the process-wide instance, if any.
+        """
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.stop()
+            cls._instance = None
+
+    @classmethod
+    def instance(cls) -> Optional[Self]:
+        """
+        Returns the process-wide instance.
+
+        Returns:
+            Optional[StreamGaugeSampler]: The process-wide instance, or None if it has not been enabled.
+        """
+        return cls._instance
+
+    def __init__(self, path: Optional[Union[Path, str]] = None, interval: float = STREAM_GAUGE_INTERVAL) -> None:
+        """
+        Initializes a `StreamGaugeSampler` instance that is not sampling any stream yet.
+
+        Args:
+            path (Optional[Union[Path, str]]): The JSONL file to append samples to; a new timestamped file in the
+            BanterBot filesystem by default.
+            interval (float): The number of seconds between samples.
+        """
+        if path is None:
+            path = gauges / f"gauges_{datetime.datetime.now().strftime('%Y%m%dT%H%M%S')}.jsonl"
+        self._path = Path(path)
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # The sampled streams by identifier; handlers are weakly referenced so that sampling never keeps them alive.
+        self._handlers: dict[int, tuple[weakref.ref, Optional[str]]] = {}
+        self._count = 0
+
+    @property
+    def path(self) -> Path:
+        """
+        The JSONL file to which samples are appended.
+
+        Returns:
+            Path: The path of the file.
+        """
+        return self._path
+
+    def add(self, handler: StreamHandler, name: Optional[str] = None) -> int:
+        """
+        Starts sampling a stream, until it ends.
+
+        Args:
+            handler (StreamHandler): The handler of the stream.
+            name (Optional[str]): An optional name for the stream, included in its samples.
+
+        Returns:
+            int: The identifier of the stream in the samples.
+        """
+        with self._lock:
+            identifier = self._count
+            self._count += 1
+            self._handlers[identifier] = (weakref.ref(handler), name)
+        return identifier
+
+    def sample(self) -> list[dict]:
+        """
+        Samples the gauges of every stream once, appends them to the file, and stops sampling the streams that ended.
+
+        Returns:
+            list[dict]: The samples.
+        """
+        timestamp = time.time()
+        samples = []
+        with self._lock:
+            for identifier, (reference, name) in list(self._handlers.items()):
+                if (handler := reference()) is None:
+                    del self._handlers[identifier]
+                    continue
+                gauges = handler.gauges()
+                samples.append({"time": timestamp, "stream": identifier, "name": name} | gauges)
+                # A stream has ended once its processor is done and the consumer has received all of its outputs.
+                if handler.stats.end is not None and gauges["queue_depth"] == 0:
+                    del self._handlers[identifier]
+
+        if samples:
+            with open(self._path, "a", encoding=config.ENCODING) as fs:
+                fs.writelines(json.dumps(sample) + "\n" for sample in samples)
+        return samples
+
+    def start(self) -> None:
+        """
+        Starts sampling in a background thread.
+        """
+        if self._thread is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="StreamGaugeSampler", daemon=True)
+            self._thread.start()
+            logging.debug(f"StreamGaugeSampler writing to `{self._path}`")
+
+    def stop(self) -> None:
+        """
+        Stops sampling, after taking a final sample.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """
+        The loop of the background thread, which samples the streams at regular intervals.
+        """
+        while not self._stop_event.wait(self._interval):
+            self.sample()
+        self.sample()
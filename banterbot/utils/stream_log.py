@@ -0,0 +1,138 @@
+import threading
+from collections import deque
+from collections.abc import Iterator
+
+from banterbot.config import STREAM_LOG_RETAIN
+from banterbot.models.stream_log_entry import StreamLogEntry
+
+
+class StreamLog:
+    """
+    The log of a stream in class `StreamManager`, indexed like a list of `StreamLogEntry` instances. Entries are kept in
+    a ring buffer and released once the consumer of the log (the stream's processor and exception handler) has advanced
+    its read cursor past them, so that long streams use memory proportional to the consumer's lag rather than to their
+    length.
+
+    Indices are never reused: the `n`-th entry appended always has index `n`, and `len` returns the total number of
+    entries appended. Accessing a released entry raises an `IndexError`. For debugging, the `retain` most recent entries
+    behind the cursor can be kept.
+    """
+
+    def __init__(self, retain: int = STREAM_LOG_RETAIN) -> None:
+        """
+        Initializes an empty `StreamLog` instance.
+
+        Args:
+            retain (int): The number of entries behind the read cursor that are retained rather than released.
+        """
+        self._retain = retain
+        self._lock = threading.Lock()
+        self._entries: deque[StreamLogEntry] = deque()
+
+        # The index of the oldest entry that has not been released, and the read cursor of the consumer.
+        self._offset = 0
+        self._cursor = 0
+
+    def append(self, entry: StreamLogEntry) -> None:
+        """
+        Appends an entry to the end of the log.
+
+        Args:
+            entry (StreamLogEntry): The entry to append.
+        """
+        with self._lock:
+            self._entries.append(entry)
+
+    def advance(self, cursor: int) -> None:
+        """
+        Moves the read cursor to the given index, releasing all entries before it (except for the retained ones).
+
+        Args:
+            cursor (int): The index of the next entry to be read; all previous entries will no longer be accessed.
+        """
+        with self._lock:
+            self._cursor = max(self._cursor, cursor)
+            release = min(cursor - self._retain, self._offset + len(self._entries)) - self._offset
+            for _ in range(release):
+                self._entries.popleft()
+            self._offset += max(release, 0)
+
+    @property
+    def cursor(self) -> int:
+        """
+        The index of the next entry to be read by the consumer, i.e., the number of entries it has processed.
+
+        Returns:
+            int: The read cursor.
+        """
+        return self._cursor
+
+    @property
+    def offset(self) -> int:
+        """
+        The index of the oldest entry that has not been released.
+
+        Returns:
+            int: The index of the oldest available entry.
+        """
+        return self._offset
+
+    def __getitem__(self, index: int) -> StreamLogEntry:
+        """
+        Returns the entry at the given index.
+
+        Args:
+            index (int): The index of the entry, which must not have been released; negative indices count from the end.
+
+        Returns:
+            StreamLogEntry: The entry.
+        """
+        with self._lock:
+            return self._entries[self._position(index)]
+
+    def __setitem__(self, index: int, entry: StreamLogEntry) -> None:
+        """
+        Replaces the entry at the given index.
+
+        Args:
+            index (int): The index of the entry, which must not have been released; negative indices count from the end.
+            entry (StreamLogEntry): The new entry.
+        """
+        with self._lock:
+            self._entries[self._position(index)] = entry
+
+    def __iter__(self) -> Iterator[StreamLogEntry]:
+        """
+        Iterates over a snapshot of the entries that have not been released.
+
+        Returns:
+            Iterator[StreamLogEntry]: An iterator over the available entries.
+        """
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        """
+        The total number of entries appended to the log, including the released ones.
+
+        Returns:
+            int: The number of entries.
+        """
+        with self._lock:
+            return self._offset + len(self._entries)
+
+    def _position(self, index: int) -> int:
+        """
+        Converts an index of the log into a position in the ring buffer. Must be called with the lock held.
+
+        Args:
+            index (int): The index of the entry.
+
+        Returns:
+            int: The position of the entry in the ring buffer.
+        """
+        if index < 0:
+            index += self._offset + len(self._entries)
+        if index < self._offset:
+            raise IndexError(f"StreamLog entry {index} has already been released.")
+        return index - self._offset
@@ -0,0 +1,140 @@
+import datetime
+import gzip
+import json
+import logging
+import threading
+import time
+from collections.abc import Generator, Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+from openai.types.chat import ChatCompletionChunk
+
+from banterbot import config
+from banterbot.data.enums import StreamRecordingKind
+from banterbot.models.speech_recognition_input import SpeechRecognitionInput
+from banterbot.models.word import Word
+from banterbot.paths import recordings
+
+
+class StreamRecorder:
+    """
+    Records the items of streams to disk as they are consumed, so that real sessions can be captured once and replayed
+    later with class `StreamReplay` (e.g., in benchmarks and regression tests, without any network access).
+
+    Each stream is saved to its own file in the session directory of the recorder, in a compact format: gzipped JSON
+    lines, the first of which is a header giving the kind of the stream (see enum `StreamRecordingKind`), followed by
+    one line per item with the number of nanoseconds elapsed since the start of the stream and the serialized item.
+    OpenAI ChatCompletion chunks, `SpeechRecognitionInput` instances, and speech synthesis word boundary events are
+    supported.
+    """
+
+    # The version of the file format, written to the header of every recording.
+    version = 1
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """
+        Initializes a `StreamRecorder` instance, creating its session directory.
+
+        Args:
+            directory (Optional[Path]): The directory in which recordings are saved; a new timestamped directory in
+            the BanterBot filesystem by default.
+        """
+        if directory is None:
+            directory = recordings / f"session_{datetime.datetime.now().strftime('%Y%m%dT%H%M%S')}"
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._count = 0
+        logging.debug(f"StreamRecorder initialized in `{self._directory}`")
+
+    @property
+    def directory(self) -> Path:
+        """
+        The directory in which recordings are saved.
+
+        Returns:
+            Path: The session directory.
+        """
+        return self._directory
+
+    def record(self, iterable: Iterable[Any], kind: StreamRecordingKind) -> Generator[Any, None, None]:
+        """
+        Wraps an iterable so that each of its items is recorded as it is consumed, and yielded unchanged. The recording
+        is saved to a new file, which is closed once the iterable is exhausted or the generator is closed.
+
+        Args:
+            iterable (Iterable[Any]): The stream to record.
+            kind (StreamRecordingKind): The kind of items in the stream.
+
+        Yields:
+            Generator[Any, None, None]: The items of the stream.
+        """
+        with self._lock:
+            path = self._directory / f"{self._count:04d}_{kind.value}.jsonl.gz"
+            self._count += 1
+
+        start = time.perf_counter_ns()
+        with gzip.open(path, "wt", encoding=config.ENCODING) as fs:
+            fs.write(json.dumps({"kind": kind.value, "version": self.version}) + "\n")
+            for value in iterable:
+                line = [time.perf_counter_ns() - start, self.encode(kind=kind, value=value)]
+                fs.write(json.dumps(line, separators=(",", ":")) + "\n")
+                yield value
+        logging.debug(f"StreamRecorder saved `{path}`")
+
+    @staticmethod
+    def encode(kind: StreamRecordingKind, value: Any) -> Any:
+        """
+        Serializes an item of a stream to JSON-compatible data. Must be called as the item is consumed, since the
+        timing of word boundary events is saved relative to the current time.
+
+        Args:
+            kind (StreamRecordingKind): The kind of the item.
+            value (Any): The item.
+
+        Returns:
+            Any: The JSON-compatible data.
+        """
+        if kind == StreamRecordingKind.OPENAI:
+            return value.model_dump(exclude_unset=True)
+        elif kind == StreamRecordingKind.SPEECH_RECOGNITION:
+            return value.to_dict()
+        elif kind == StreamRecordingKind.WORD_BOUNDARY:
+            return {
+                "lead": value["time"] - time.perf_counter_ns(),
+                "text": value["word"].text,
+                "offset": value["word"].offset / datetime.timedelta(microseconds=1),
+                "duration": value["word"].duration / datetime.timedelta(microseconds=1),
+            }
+        raise ValueError(f"Unsupported kind of stream for class `StreamRecorder`: {kind}.")
+
+    @staticmethod
+    def decode(kind: StreamRecordingKind, data: Any, speed: Optional[float] = 1.0) -> Any:
+        """
+        Deserializes an item of a stream from the output of method `encode`. Must be called as the item is replayed,
+        since the timing of word boundary events is restored relative to the current time.
+
+        Args:
+            kind (StreamRecordingKind): The kind of the item.
+            data (Any): The JSON-compatible data.
+            speed (Optional[float]): The speed of the replay, by which the timing of word boundary events is scaled;
+            None for maximum speed, in which case words are due immediately.
+
+        Returns:
+            Any: The item.
+        """
+        if kind == StreamRecordingKind.OPENAI:
+            return ChatCompletionChunk.model_validate(data)
+        elif kind == StreamRecordingKind.SPEECH_RECOGNITION:
+            return SpeechRecognitionInput.from_dict(data)
+        elif kind == StreamRecordingKind.WORD_BOUNDARY:
+            return {
+                "time": time.perf_counter_ns() + (0 if speed is None else int(data["lead"] / speed)),
+                "word": Word(
+                    text=data["text"],
+                    offset=datetime.timedelta(microseconds=data["offset"]),
+                    duration=datetime.timedelta(microseconds=data["duration"]),
+                ),
+            }
+        raise ValueError(f"Unsupported kind of stream for class `StreamRecorder`: {kind}.")
@@ -0,0 +1,82 @@
+import gzip
+import json
+import logging
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from banterbot import config
+from banterbot.data.enums import StreamRecordingKind
+from banterbot.utils.stream_recorder import StreamRecorder
+
+
+class StreamReplay:
+    """
+    An iterable that replays a stream recorded by class `StreamRecorder`, yielding the same items with the same timing
+    as the original stream, or a scaled one. It can be passed to `StreamManager.stream` in place of the original stream
+    (with method `close` as `close_stream`), so that the processing of real sessions can be reproduced without network
+    access.
+    """
+
+    def __init__(self, path: Union[Path, str], speed: Optional[float] = 1.0) -> None:
+        """
+        Initializes a `StreamReplay` instance, reading the header of the recording.
+
+        Args:
+            path (Union[Path, str]): The path of the recording.
+            speed (Optional[float]): The speed of the replay relative to the original stream (e.g., 2.0 for twice as
+            fast), or None to replay the items as fast as they are consumed.
+
+        Raises:
+            ValueError: If the speed is not positive, or the recording has an unsupported format version.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Argument `speed` of class `StreamReplay` must be positive or None. Got {speed}.")
+        self._path = Path(path)
+        self._speed = speed
+        self._closed = threading.Event()
+
+        with gzip.open(self._path, "rt", encoding=config.ENCODING) as fs:
+            header = json.loads(fs.readline())
+        if header["version"] != StreamRecorder.version:
+            raise ValueError(f"Unsupported version of recording `{self._path}`: {header['version']}.")
+        self._kind = StreamRecordingKind(header["kind"])
+
+    @property
+    def kind(self) -> StreamRecordingKind:
+        """
+        The kind of items in the recorded stream.
+
+        Returns:
+            StreamRecordingKind: The kind of items.
+        """
+        return self._kind
+
+    def close(self) -> None:
+        """
+        Stops the replay, including any wait for the next item.
+        """
+        self._closed.set()
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        """
+        Replays the recorded items, waiting between them to reproduce the (scaled) timing of the original stream.
+
+        Yields:
+            Generator[Any, None, None]: The recorded items.
+        """
+        logging.debug(f"StreamReplay replaying `{self._path}`")
+        start = time.perf_counter_ns()
+        with gzip.open(self._path, "rt", encoding=config.ENCODING) as fs:
+            fs.readline()
+            for line in fs:
+                elapsed, data = json.loads(line)
+                if self._speed is not None:
+                    delay = 1e-9 * (start + elapsed / self._speed - time.perf_counter_ns())
+                    if delay > 0:
+                        self._closed.wait(delay)
+                if self._closed.is_set():
+                    break
+                yield StreamRecorder.decode(kind=self._kind, data=data, speed=self._speed)
@@ -0,0 +1,163 @@
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from typing_extensions import Self
+
+from banterbot.config import STREAM_STATS_WINDOW
+from banterbot.models.stream_stats import StreamStats
+
+
+class StreamStatsAggregator:
+    """
+    Collects the `StreamStats` of the most recent streams and computes percentiles of their latencies. A process-wide
+    instance can be installed with method `enable`, after which every OpenAI ChatCompletion stream is added to it once
+    it ends; it is disabled by default so that no measurements are retained unless requested.
+    """
+
+    # The durations of `StreamStats` that can be aggregated, along with the inter-chunk gaps.
+    metrics = ("time_to_response", "time_to_first_chunk", "time_to_first_output", "processing_delay", "duration", "gap")
+
+    _instance: Optional[Self] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def enable(cls, window: int = STREAM_STATS_WINDOW) -> Self:
+        """
+        Installs a process-wide instance, or returns the existing one.
+
+        Args:
+            window (int): The number of most recent streams to retain.
+
+        Returns:
+            StreamStatsAggregator: The process-wide instance.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(window=window)
+            return cls._instance
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Removes the process-wide instance, if any.
+        """
+        with cls._instance_lock:
+            cls._instance = None
+
+    @classmethod
+    def instance(cls) -> Optional[Self]:
+        """
+        Returns the process-wide instance.
+
+        Returns:
+            Optional[StreamStatsAggregator]: The process-wide instance, or None if it has not been enabled.
+        """
+        return cls._instance
+
+    def __init__(self, window: int = STREAM_STATS_WINDOW) -> None:
+        """
+        Initializes an empty `StreamStatsAggregator` instance.
+
+        Args:
+            window (int): The number of most recent streams to retain.
+        """
+        self._lock = threading.Lock()
+        self._stats: deque[StreamStats] = deque(maxlen=window)
+
+    def add(self, stats: StreamStats) -> None:
+        """
+        Adds the measurements of a stream, discarding those of the oldest stream if the window is full.
+
+        Args:
+            stats (StreamStats): The measurements of a stream that has ended.
+        """
+        with self._lock:
+            self._stats.append(stats)
+
+    def clear(self) -> None:
+        """
+        Discards all retained measurements.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def percentiles(self, metric: str, q: tuple[float, ...] = (50, 90, 99)) -> dict[str, float]:
+        """
+        Computes percentiles of one of the metrics over the retained streams. Streams for which the metric is
+        unavailable (e.g., interrupted before their first output) are ignored. The percentiles of the gaps between
+        chunks are estimated from the samples retained by each stream.
+
+        Args:
+            metric (str): One of the names in attribute `metrics`.
+            q (tuple[float, ...]): The percentiles to compute, in the range [0, 100].
+
+        Returns:
+            dict[str, float]: The percentiles in seconds keyed by labels of the form "p50", along with the number of
+            samples under key "count"; empty apart from the count if there are no samples.
+        """
+        if metric not in self.metrics:
+            raise ValueError(f"Unknown metric `{metric}`; expected one of {self.metrics}.")
+
+        with self._lock:
+            if metric == "gap":
+                return self._gap_percentiles(q=q)
+            samples = [value for stats in self._stats if (value := getattr(stats, metric)) is not None]
+
+        result = {"count": len(samples)}
+        if samples:
+            values = np.percentile(samples, q)
+            result |= {f"p{percentile:g}": float(value) for percentile, value in zip(q, values)}
+        return result
+
+    def summary(self, q: tuple[float, ...] = (50, 90, 99)) -> dict[str, dict[str, float]]:
+        """
+        Computes percentiles of every metric over the retained streams.
+
+        Args:
+            q (tuple[float, ...]): The percentiles to compute, in the range [0, 100].
+
+        Returns:
+            dict[str, dict[str, float]]: The percentiles of each metric, as returned by method `percentiles`.
+        """
+        return {metric: self.percentiles(metric, q=q) for metric in self.metrics}
+
+    def _gap_percentiles(self, q: tuple[float, ...]) -> dict[str, float]:
+        """
+        Computes percentiles of the gaps between consecutive chunks from the samples of each stream (see class
+        `StreamStats`), each sample weighted by the number of gaps it stands for, so that long streams are not
+        underrepresented. Must be called while holding the lock.
+
+        Args:
+            q (tuple[float, ...]): The percentiles to compute, in the range [0, 100].
+
+        Returns:
+            dict[str, float]: The percentiles in seconds keyed by labels of the form "p50", along with the number of
+            gaps under key "count"; empty apart from the count if there are no gaps.
+        """
+        samples, weights = [], []
+        for stats in self._stats:
+            if stats.gap_samples:
+                samples.extend(stats.gap_samples)
+                weights.extend([stats.gap_count / len(stats.gap_samples)] * len(stats.gap_samples))
+
+        result = {"count": sum(stats.gap_count for stats in self._stats)}
+        if samples:
+            order = np.argsort(samples)
+            values = np.asarray(samples, dtype=np.float64)[order] / 1e9
+            cumulative = np.cumsum(np.asarray(weights)[order])
+            # The smallest sample at which the cumulative weight reaches each percentile (an inverted CDF).
+            indices = np.searchsorted(cumulative, np.asarray(q) / 100 * cumulative[-1], side="left")
+            indices = np.minimum(indices, len(values) - 1)
+            result |= {f"p{percentile:g}": float(values[index]) for percentile, index in zip(q, indices)}
+        return result
+
+    def __len__(self) -> int:
+        """
+        The number of retained streams.
+
+        Returns:
+            int: The number of streams.
+        """
+        return len(self._stats)
@@ -1,75 +1,100 @@
 import logging
 import threading
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Optional, Union
 
 
 class ThreadQueue:
     """
-    A class for managing and executing tasks in separate threads.
+    A class for managing and executing tasks in sequence on a background thread.
 
-    This class maintains a queue of tasks to be executed. Each task is a Thread object, which is executed in its own
-    thread. If there is a task in the queue that hasn't started executing yet, it will be prevented from running when a
-    new task is added unless it is declared unskippable.
+    This class maintains a queue of tasks to be executed one at a time, in the order in which they were added, by a
+    single dispatcher thread. Each task is a callable, which is called on the dispatcher thread, or a Thread object,
+    which is started and joined by it. If there is a task in the queue that hasn't started executing yet, it will be
+    prevented from running when a new task is added unless it is declared unskippable.
     """
 
     def __init__(self):
         logging.debug(f"ThreadQueue initialized")
-        self._lock = threading.Lock()
-        self._event_queue: list[threading.Event] = []
+        self._condition = threading.Condition(threading.Lock())
 
-    def add_task(self, thread: threading.Thread, unskippable: bool = False) -> None:
+        # The tasks that have not started yet, as pairs of a task and whether it is unskippable.
+        self._tasks: deque[tuple[Union[Callable[[], Any], threading.Thread], bool]] = deque()
+
+        # Whether a task is currently running, and the dispatcher thread (created when the first task is added).
+        self._running = False
+        self._dispatcher: Optional[threading.Thread] = None
+
+        # The number of tasks added so far, used to identify them in the logs.
+        self._count = 0
+
+    def add_task(self, task: Union[Callable[[], Any], threading.Thread], unskippable: bool = False) -> None:
         """
         Add a new task to the queue.
 
-        This method adds a new task to the queue and starts a wrapper thread to manage its execution. The wrapper thread
-        is responsible for waiting for the previous task to complete, executing the current task if it is unskippable or
-        the last task in the queue, and setting the event for the next task.
+        The task is run by the dispatcher thread once every previous task has completed, if it is unskippable or still
+        the last task in the queue by then. Completed and skipped tasks are removed from the queue.
 
         Args:
-            thread (threading.Thread): The thread to be added to the queue.
-            unskippable (bool, optional): Whether the thread should be executed even if a new task is queued.
+            task (Union[Callable[[], Any], threading.Thread]): The callable to be called (with no arguments), or for
+            backwards compatibility, the thread to be started.
+            unskippable (bool, optional): Whether the task should be executed even if a new task is queued.
         """
-        with self._lock:
-            index = len(self._event_queue)
-            self._event_queue.append(threading.Event())
-
-        wrapper_thread = threading.Thread(
-            target=self._thread_wrapper, args=(thread, index, unskippable), daemon=thread.daemon
-        )
-        wrapper_thread.start()
+        with self._condition:
+            self._tasks.append((task, unskippable))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="ThreadQueueDispatcher", daemon=True)
+                self._dispatcher.start()
+            self._condition.notify()
 
     def is_alive(self) -> bool:
         """
-        Check if the last task in the queue is still running.
+        Check if a task in the queue is still running or waiting to run.
 
         Returns:
-            bool: True if the last task is still running, False otherwise.
+            bool: True if a task is still running or waiting to run, False otherwise.
         """
-        if not self._event_queue:
-            return False
-        else:
-            return not self._event_queue[-1].is_set()
+        with self._condition:
+            return self._running or bool(self._tasks)
 
-    def _thread_wrapper(self, thread: threading.Thread, index: int, unskippable: bool) -> None:
+    def join(self, timeout: Optional[float] = None) -> bool:
         """
-        A wrapper function for executing threads in the queue.
-
-        This function is responsible for waiting for the previous task to complete before starting the current task, and
-        setting the event for the next task in the queue. If the current task is skippable and not the last task in the
-        queue, it will not be executed.
+        Block until every task in the queue has completed (or has been skipped).
 
         Args:
-            thread (threading.Thread): The thread to be executed.
-            index (int): The index of the thread in the event queue.
-            unskippable (bool): Whether the thread should be executed even if a new task is added to the queue.
+            timeout (Optional[float]): The maximum number of seconds to wait; None to wait indefinitely.
+
+        Returns:
+            bool: True if the queue is empty, False if the wait timed out.
         """
-        if index > 0:
-            self._event_queue[index - 1].wait()
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._running and not self._tasks, timeout=timeout)
 
-        if unskippable or index == len(self._event_queue) - 1:
-            logging.debug(f"ThreadQueue thread {index} started")
-            thread.start()
-            thread.join()
-        else:
-            logging.debug(f"ThreadQueue thread {index} skipped")
+    def _dispatch(self) -> None:
+        """
+        The loop of the dispatcher thread, which runs the tasks of the queue one at a time. A skippable task is only run
+        if no other task was added while it was waiting for the previous ones to complete.
+        """
+        while True:
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._tasks)
+                task, unskippable = self._tasks.popleft()
+                index = self._count
+                self._count += 1
+                if not unskippable and self._tasks:
+                    logging.debug(f"ThreadQueue task {index} skipped")
+                    continue
+                self._running = True
 
-        self._event_queue[index].set()
+            logging.debug(f"ThreadQueue task {index} started")
+            try:
+                if isinstance(task, threading.Thread):
+                    task.start()
+                    task.join()
+                else:
+                    task()
+            except Exception:
+                logging.exception(f"ThreadQueue task {index} raised an exception")
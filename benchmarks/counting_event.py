@@ -0,0 +1,107 @@
+"""
+Measures the events that signal new items between the threads of a stream. Several producers increment an event while
+a consumer claims the items: with `CountingEvent`, every pending item is claimed in one wake-up with `take_all`; with
+the legacy `IndexedEvent`, each item is claimed by a `wait` and `decrement` pair. Also measures the throughput of a
+`CloseableQueue` fed by several producers, and checks that every item is delivered exactly once.
+
+Usage: python benchmarks/counting_event.py [--producers 4] [--items 50000]
+"""
+
+import argparse
+import threading
+import time
+from typing import Union
+
+from banterbot.utils.closeable_queue import CloseableQueue
+from banterbot.utils.counting_event import CountingEvent
+from banterbot.utils.indexed_event import IndexedEvent
+
+
+def run_event(event: Union[CountingEvent, IndexedEvent], producers: int, items: int) -> None:
+    """
+    Runs the producers and the consumer of an event, and prints the number of items claimed and the throughput.
+
+    Args:
+        event (Union[CountingEvent, IndexedEvent]): The event.
+        producers (int): The number of producer threads.
+        items (int): The number of increments by each producer.
+    """
+    total = producers * items
+    claimed = 0
+
+    def produce() -> None:
+        for _ in range(items):
+            event.increment()
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while claimed < total:
+        if isinstance(event, CountingEvent):
+            if (count := event.take_all(timeout=1.0)) == 0:
+                break
+            claimed += count
+        else:
+            if not event.wait(timeout=1.0):
+                break
+            event.decrement()
+            claimed += 1
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+
+    print(
+        f"{type(event).__name__}: claimed {claimed} of {total} items (counter left at {event.counter}),"
+        f" {claimed / elapsed / 1e3:,.0f}k items/s"
+    )
+
+
+def run_queue(producers: int, items: int) -> None:
+    """
+    Feeds a `CloseableQueue` from several producers and consumes it, printing the throughput and checking that every
+    item is delivered exactly once.
+
+    Args:
+        producers (int): The number of producer threads.
+        items (int): The number of items put by each producer.
+    """
+    queue = CloseableQueue()
+
+    def produce(producer: int) -> None:
+        for item in range(items):
+            queue.put((producer, item))
+
+    threads = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+
+    def close() -> None:
+        for thread in threads:
+            thread.join()
+        queue.close()
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    threading.Thread(target=close).start()
+    received = list(queue)
+    elapsed = time.perf_counter() - start
+
+    exact = len(received) == len(set(received)) == producers * items
+    print(f"CloseableQueue: {len(received) / elapsed / 1e3:,.0f}k items/s, every item delivered exactly once: {exact}")
+
+
+def main() -> None:
+    """
+    Parses the arguments, and runs the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--items", type=int, default=50000)
+    args = parser.parse_args()
+    for event in (IndexedEvent(), CountingEvent()):
+        run_event(event=event, producers=args.producers, items=args.items)
+    run_queue(producers=args.producers, items=args.items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures the latency of streamed ChatCompletion responses through `OpenAIService.prompt_stream`, the source of the
+sentences that `Interface.respond` synthesizes, against a local `FakeOpenAIServer` with a fixed time to first token and
+token rate. Reports, over consecutive requests, the time to the first chunk and to the first complete sentence as
+measured by the `StreamStats` of each stream, the time at which the consumer receives the first sentence, and the
+overhead of each over the delays of the server.
+
+Requires the tokenizer of the model, which `tiktoken` downloads on first use.
+
+Usage: python benchmarks/openai_stream.py [--requests 50] [--tokens-per-second 100] [--time-to-first-token 0.1]
+"""
+
+import argparse
+import statistics
+import time
+
+from banterbot.data.enums import ChatCompletionRoles
+from banterbot.managers.openai_model_manager import OpenAIModelManager
+from banterbot.models.message import Message
+from banterbot.services.openai_service import OpenAIService
+from banterbot.utils.fake_openai_server import DEFAULT_RESPONSE, FakeOpenAIServer
+
+
+def report(name: str, samples: list[float], expected: float) -> None:
+    """
+    Prints the median and 90th percentile of a latency, and the median overhead over the delays of the server.
+
+    Args:
+        name (str): The name of the latency.
+        samples (list[float]): The measurements, in seconds.
+        expected (float): The delay of the server before the measured event, in seconds.
+    """
+    median = statistics.median(samples)
+    p90 = statistics.quantiles(samples, n=10)[-1] if len(samples) > 1 else median
+    print(
+        f"  {name:<28} median {median * 1000:8.2f} ms   p90 {p90 * 1000:8.2f} ms   "
+        f"overhead {(median - expected) * 1000:+8.2f} ms"
+    )
+
+
+def run(service: OpenAIService, requests: int, tokens_per_second: float, time_to_first_token: float) -> None:
+    """
+    Sends consecutive streamed requests, consuming each response completely, and prints the measurements.
+
+    Args:
+        service (OpenAIService): The service, configured to send its requests to the fake server.
+        requests (int): The number of requests.
+        tokens_per_second (float): The token rate of the server.
+        time_to_first_token (float): The time to first token of the server.
+    """
+    messages = [Message(role=ChatCompletionRoles.USER, content="Hello there.")]
+    first_chunk, first_output, first_sentence = [], [], []
+
+    for _ in range(requests):
+        start = time.perf_counter()
+        handler = service.prompt_stream(messages)
+        received = None
+        for _ in handler:
+            if received is None:
+                received = time.perf_counter() - start
+        first_chunk.append(handler.stats.time_to_first_chunk)
+        first_output.append(handler.stats.time_to_first_output)
+        first_sentence.append(received)
+
+    # The server sends the first token after its time to first token, and the first sentence once all of its tokens
+    # have been sent (the first chunk ending the sentence is the first of the next one, or the end of the stream).
+    sentence_tokens = len(DEFAULT_RESPONSE.split(". ")[0].split()) + 1
+    sentence_time = time_to_first_token + sentence_tokens / tokens_per_second
+
+    print(f"{requests} requests, {tokens_per_second:g} tokens/s, time to first token {time_to_first_token * 1000:g} ms")
+    report("time to first chunk", first_chunk, time_to_first_token)
+    report("time to first sentence", first_output, sentence_time)
+    report("first sentence at consumer", first_sentence, sentence_time)
+
+
+def main() -> None:
+    """
+    Parses the arguments, starts the fake server, and runs the benchmark against it.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--time-to-first-token", type=float, default=0.1)
+    parser.add_argument("--model", default="gpt-4o")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(tokens_per_second=args.tokens_per_second, time_to_first_token=args.time_to_first_token)
+    with server:
+        OpenAIService.configure_client(base_url=server.base_url)
+        service = OpenAIService(model=OpenAIModelManager.load(args.model))
+        run(
+            service=service,
+            requests=args.requests,
+            tokens_per_second=args.tokens_per_second,
+            time_to_first_token=args.time_to_first_token,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Measures the accuracy and throughput of the sentence segmentation backends of `NLP.segment_sentences` on the reference
+sentences of `banterbot/tests/corpora.py`: the agreement of each backend with the reference sentences, the agreement
+of the rule-based backend with the spaCy `senter` pipeline, the number of sentences segmented per second, and the
+fraction of the sentences of repeated segmentation of a stream that `IncrementalSentenceSegmenter` reproduces.
+
+The `senter` pipeline is only measured if the spaCy model `en_core_web_sm` is installed.
+
+Usage: python benchmarks/sentence_segmentation.py
+"""
+
+import functools
+import importlib.util
+import re
+import time
+from typing import Callable
+
+from banterbot.data.enums import SegmentationBackend, SpaCyLangModel
+from banterbot.tests.corpora import SENTENCES
+from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+from banterbot.utils.nlp import NLP
+
+# The number of seconds for which the throughput of each backend is measured.
+DURATION = 2.0
+
+
+def agreement(segment: Callable[[str], tuple[str, ...]], reference: Callable[[str], tuple[str, ...]]) -> float:
+    """
+    Computes the fraction of the texts of the corpus that two segmentation functions split identically.
+
+    Args:
+        segment (Callable[[str], tuple[str, ...]]): The segmentation function to evaluate.
+        reference (Callable[[str], tuple[str, ...]]): The reference segmentation function.
+
+    Returns:
+        float: The fraction of texts on which both functions agree.
+    """
+    texts = ["".join(sentences) for sentences in SENTENCES]
+    return sum(segment(text) == reference(text) for text in texts) / len(texts)
+
+
+def throughput(segment: Callable[[str], tuple[str, ...]]) -> float:
+    """
+    Measures the number of sentences per second segmented by a segmentation function, on a long text.
+
+    Args:
+        segment (Callable[[str], tuple[str, ...]]): The segmentation function.
+
+    Returns:
+        float: The number of sentences per second.
+    """
+    text = " ".join("".join(sentences) for sentences in SENTENCES) * 20
+    count = len(segment(text))
+    start = time.perf_counter()
+    repetitions = 0
+    while time.perf_counter() - start < DURATION:
+        segment(text)
+        repetitions += 1
+    return repetitions * count / (time.perf_counter() - start)
+
+
+def streaming_agreement(backend: SegmentationBackend) -> float:
+    """
+    Streams the corpus word by word, and computes the fraction of the sentences found by repeatedly segmenting the
+    accumulated buffer that are also found, at the same position, by `IncrementalSentenceSegmenter`.
+
+    Args:
+        backend (SegmentationBackend): The backend of sentence segmentation.
+
+    Returns:
+        float: The fraction of sentences reproduced.
+    """
+    chunks = re.findall(r"\s*\S+", " ".join("".join(sentences) for sentences in SENTENCES))
+
+    buffer, repeated = "", []
+    for chunk in chunks:
+        buffer += chunk
+        if len(sentences := NLP.segment_sentences(buffer, backend=backend)) > 1:
+            repeated.extend(sentences[:-1])
+            buffer = sentences[-1]
+    repeated.extend(NLP.segment_sentences(buffer, backend=backend))
+
+    segmenter = IncrementalSentenceSegmenter(backend=backend)
+    incremental = [sentence for chunk in chunks for sentence in segmenter.feed(chunk)]
+    incremental.extend(segmenter.flush())
+
+    def spans(sentences: list[str]) -> set[tuple[int, int]]:
+        ends = [0]
+        for sentence in sentences:
+            ends.append(ends[-1] + len(sentence))
+        return set(zip(ends, ends[1:]))
+
+    return len(spans(incremental) & spans(repeated)) / len(repeated)
+
+
+def main() -> None:
+    """
+    Prints the measurements of every available backend.
+    """
+    # Measure the backends themselves, rather than the cache in front of them.
+    NLP.disable_cache()
+    gold = {"".join(sentences): tuple(sentences) for sentences in SENTENCES}.__getitem__
+    backends = {"rules": SegmentationBackend.RULES}
+    if importlib.util.find_spec(SpaCyLangModel.EN_CORE_WEB_SM.value) is not None:
+        backends["senter"] = SegmentationBackend.SPACY
+    else:
+        print(f"Skipping `senter`: the spaCy model `{SpaCyLangModel.EN_CORE_WEB_SM.value}` is not installed.")
+    segment = {name: functools.partial(NLP.segment_sentences, backend=backend) for name, backend in backends.items()}
+
+    for name, backend in backends.items():
+        print(f"{name}: agreement with the reference sentences: {agreement(segment[name], gold):.1%}")
+        print(f"{name}: {throughput(segment[name]):,.0f} sentences/s")
+        reproduced = streaming_agreement(backend)
+        print(f"{name}: incremental segmentation reproduces {reproduced:.1%} of repeated segmentation")
+
+    if "senter" in backends:
+        print(f"rules: agreement with senter: {agreement(segment['rules'], segment['senter']):.1%}")
+
+
+if __name__ == "__main__":
+    main()
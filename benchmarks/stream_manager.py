@@ -0,0 +1,89 @@
+"""
+Compares the legacy and pooled modes of `StreamManager`: many short streams are started in a burst and consumed one
+after the other, while a background thread samples the number of live threads. Reports the time taken by method
+`stream` to start each stream, the peak number of threads, and the total time.
+
+Usage: python benchmarks/stream_manager.py [--streams 300] [--items 20] [--delay 0.002]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections.abc import Iterator
+
+from banterbot.managers.stream_manager import StreamManager
+
+
+def source(items: int, delay: float) -> Iterator[int]:
+    """
+    Yields consecutive integers with a delay before each, like the chunks of a streamed response.
+
+    Args:
+        items (int): The number of items.
+        delay (float): The number of seconds to wait before each item.
+
+    Yields:
+        int: The items.
+    """
+    for item in range(items):
+        time.sleep(delay)
+        yield item
+
+
+def run(pooled: bool, streams: int, items: int, delay: float) -> None:
+    """
+    Runs the benchmark in one mode, and prints its measurements.
+
+    Args:
+        pooled (bool): Whether the streams are run on the shared worker pools.
+        streams (int): The number of streams.
+        items (int): The number of items of each stream.
+        delay (float): The number of seconds to wait before each item.
+    """
+    manager = StreamManager(pooled=pooled)
+    manager.connect_processor(lambda log, index, shared_data: log[index].value)
+
+    peak = threading.active_count()
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, threading.active_count())
+            time.sleep(0.0005)
+
+    threading.Thread(target=sample, daemon=True).start()
+
+    start = time.perf_counter()
+    setup, handlers = [], []
+    for _ in range(streams):
+        timestamp = time.perf_counter_ns()
+        handlers.append(manager.stream(source(items=items, delay=delay)))
+        setup.append((time.perf_counter_ns() - timestamp) / 1e3)
+    complete = all(list(handler) == list(range(items)) for handler in handlers)
+    total = time.perf_counter() - start
+    done.set()
+
+    print(
+        f"{'pooled' if pooled else 'legacy'}: setup median {statistics.median(setup):.0f} us,"
+        f" p99 {sorted(setup)[int(0.99 * streams)]:.0f} us, peak threads {peak}, total {total:.2f} s,"
+        f" all items delivered: {complete}"
+    )
+
+
+def main() -> None:
+    """
+    Parses the arguments, and runs the benchmark in both modes.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=300)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.002)
+    args = parser.parse_args()
+    for pooled in (False, True):
+        run(pooled=pooled, streams=args.streams, items=args.items, delay=args.delay)
+
+
+if __name__ == "__main__":
+    main()
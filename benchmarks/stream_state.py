@@ -0,0 +1,124 @@
+"""
+Compares the two forms of the shared data of a stream in class `StreamManager`: a dict, which is deep copied for each
+stream and accessed by key, and a `StreamState`, which is created for each stream and accessed by attribute. Measures
+the body of the processor of `OpenAIService` per chunk (with a stub segmenter, so that only the access to the shared
+data is measured), the creation of the shared data per stream, and whole streams run through a `StreamManager`.
+
+Usage: python benchmarks/stream_state.py
+"""
+
+import time
+import timeit
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Any, Callable, Optional, Union
+
+from banterbot.managers.stream_manager import StreamManager
+from banterbot.models.number import Number
+from banterbot.models.openai_stream_state import OpenAIStreamState
+from banterbot.utils.incremental_segmenter import IncrementalSentenceSegmenter
+from banterbot.utils.stream_log import StreamLog
+
+# The number of calls over which the processor is timed, and the number of repetitions of which the best is reported.
+CALLS = 1_000_000
+REPEAT = 5
+
+# The number of streams run through a `StreamManager`, and the number of chunks of each.
+STREAMS = 200
+CHUNKS = 200
+
+
+class StubSegmenter:
+    """
+    A segmenter that never completes a sentence, so that the processor only accesses the shared data.
+    """
+
+    def feed(self, string: str) -> tuple[str, ...]:
+        """
+        Discards a chunk of text.
+        """
+        return tuple()
+
+
+def process_dict(log: StreamLog, index: int, shared_data: dict[str, Any]) -> Optional[tuple[str, ...]]:
+    """
+    The body of `OpenAIService._processor`, with the shared data accessed by key.
+    """
+    if shared_data["interrupt"] >= shared_data["init_time"]:
+        raise StopIteration
+    if log[index].value.choices[0].delta.content is not None:
+        if sentences := shared_data["segmenter"].feed(log[index].value.choices[0].delta.content):
+            return sentences
+
+
+def process_state(log: StreamLog, index: int, shared_data: OpenAIStreamState) -> Optional[tuple[str, ...]]:
+    """
+    The body of `OpenAIService._processor`, with the shared data accessed by attribute.
+    """
+    if shared_data.interrupt >= shared_data.init_time:
+        raise StopIteration
+    if log[index].value.choices[0].delta.content is not None:
+        if sentences := shared_data.segmenter.feed(log[index].value.choices[0].delta.content):
+            return sentences
+
+
+def best(func: Any, number: int) -> float:
+    """
+    Times a function, returning the best time per call in seconds.
+    """
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+def run_streams(init_shared_data: Callable[[], Union[dict[str, Any], OpenAIStreamState]]) -> float:
+    """
+    Runs streams of chunks through a `StreamManager`, returning the number of seconds taken.
+
+    Args:
+        init_shared_data (Callable[[], Union[dict[str, Any], OpenAIStreamState]]): Creates the argument
+        `init_shared_data` of each stream.
+
+    Returns:
+        float: The number of seconds taken.
+    """
+    manager = StreamManager()
+    manager.connect_processor(process_dict if isinstance(init_shared_data(), dict) else process_state)
+    chunk = SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="word "))])
+    start = time.perf_counter()
+    for _ in range(STREAMS):
+        list(manager.stream([chunk] * CHUNKS, init_shared_data=init_shared_data()))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Prints the measurements of both forms of the shared data.
+    """
+    init_time = time.perf_counter_ns() * 2
+    log = [SimpleNamespace(value=SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="word "))]))]
+    data = {"segmenter": StubSegmenter(), "init_time": init_time, "interrupt": Number(0)}
+    state = OpenAIStreamState(init_time=init_time)
+    state.segmenter = StubSegmenter()
+
+    per_chunk_dict = best(lambda: process_dict(log, 0, data), CALLS) * 1e9
+    per_chunk_state = best(lambda: process_state(log, 0, state), CALLS) * 1e9
+    print(f"per chunk: dict {per_chunk_dict:.0f} ns, state {per_chunk_state:.0f} ns")
+
+    def new_dict() -> dict[str, Any]:
+        # As in `StreamManager.stream`, where the dict given as `init_shared_data` is deep copied.
+        data = deepcopy({"segmenter": IncrementalSentenceSegmenter(), "init_time": init_time})
+        return data | {"interrupt": Number(0)}
+
+    def new_state() -> OpenAIStreamState:
+        return OpenAIStreamState(init_time=init_time)
+
+    per_stream_dict = best(new_dict, CALLS // 50) * 1e6
+    per_stream_state = best(new_state, CALLS // 50) * 1e6
+    print(f"per stream setup: deep copied dict {per_stream_dict:.1f} us, state {per_stream_state:.1f} us")
+
+    streams_dict = run_streams(lambda: {"segmenter": IncrementalSentenceSegmenter(), "init_time": init_time})
+    streams_state = run_streams(new_state)
+    print(f"{STREAMS} streams of {CHUNKS} chunks: dict {streams_dict:.2f} s, state {streams_state:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
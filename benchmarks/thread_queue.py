@@ -0,0 +1,105 @@
+"""
+Measures `ThreadQueue` under the traffic of an interface: bursts of unskippable tasks (like `send_message` for each
+recognized sentence) each followed by skippable tasks (like `respond`), all of which sleep briefly. Reports the elapsed
+time, the peak number of threads, the number of tasks run and of entries left in the queue, and the latency with which
+a task is dispatched to an idle queue. Tasks are queued as callables, and as `threading.Thread` objects (the backwards
+compatible form, which costs a thread per task).
+
+Usage: python benchmarks/thread_queue.py [--bursts 50] [--duration 0.002]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from banterbot.utils.thread_queue import ThreadQueue
+
+
+def run_bursts(threads: bool, bursts: int, duration: float) -> None:
+    """
+    Queues the bursts of tasks, waits for the queue to be drained, and prints the measurements.
+
+    Args:
+        threads (bool): Whether the tasks are queued as `threading.Thread` objects rather than callables.
+        bursts (int): The number of bursts.
+        duration (float): The number of seconds each task sleeps.
+    """
+    queue = ThreadQueue()
+    ran = []
+    peak = threading.active_count()
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, threading.active_count())
+            time.sleep(0.0005)
+
+    threading.Thread(target=sample, daemon=True).start()
+
+    def task(name: tuple) -> None:
+        ran.append(name)
+        time.sleep(duration)
+
+    def add(name: tuple, unskippable: bool) -> None:
+        func = lambda: task(name)
+        queue.add_task(threading.Thread(target=func, daemon=True) if threads else func, unskippable=unskippable)
+
+    start = time.perf_counter()
+    for burst in range(bursts):
+        for sentence in range(5):
+            add(name=(burst, "send_message", sentence), unskippable=True)
+        for response in range(10):
+            add(name=(burst, "respond", response), unskippable=False)
+    queue.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+
+    unskippable = sum(name[1] == "send_message" for name in ran)
+    print(
+        f"{'threads' if threads else 'callables'}: {elapsed:.2f} s, peak threads {peak}, ran {len(ran)} tasks"
+        f" ({unskippable} unskippable), entries left {len(queue._tasks)}"
+    )
+
+
+def run_idle(threads: bool, tasks: int = 300) -> None:
+    """
+    Adds tasks to an idle queue one at a time, and prints the latency until each starts.
+
+    Args:
+        threads (bool): Whether the tasks are queued as `threading.Thread` objects rather than callables.
+        tasks (int): The number of tasks.
+    """
+    queue = ThreadQueue()
+    latencies = []
+    for _ in range(tasks):
+        started = threading.Event()
+        start = time.perf_counter()
+        func = lambda start=start, started=started: (latencies.append(time.perf_counter() - start), started.set())
+        queue.add_task(threading.Thread(target=func, daemon=True) if threads else func)
+        started.wait()
+        queue.join()
+    latencies = sorted(latency * 1e6 for latency in latencies)
+    print(
+        f"{'threads' if threads else 'callables'}: idle dispatch latency median {statistics.median(latencies):.0f} us,"
+        f" p99 {latencies[int(0.99 * tasks)]:.0f} us"
+    )
+
+
+def main() -> None:
+    """
+    Parses the arguments, and runs the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=0.002)
+    args = parser.parse_args()
+    for threads in (True, False):
+        run_bursts(threads=threads, bursts=args.bursts, duration=args.duration)
+    for threads in (True, False):
+        run_idle(threads=threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-# For running tests: python -m unittest discover -s tests
+# For running tests: python -m unittest discover -s banterbot/tests
 # For building: python setup.py sdist bdist_wheel
 # For formatting: autoflake --remove-all-unused-imports -r -i . | isort . | black --preview --line-length 120 .
 # For compiling protos: protoc --python_out=. memory.proto
@@ -10,6 +10,7 @@ from setuptools import find_packages, setup
 
 dependencies = [
     "azure-cognitiveservices-speech>=1.37.0",
+    "httpx>=0.23.0",
     "numba>=0.59.1",
     "numpy>=1.26.2",
     "openai>=1.23.2",
@@ -33,7 +34,7 @@ with open("README.md", "r") as fs:
 
 def run_tests():
     test_loader = unittest.TestLoader()
-    test_suite = test_loader.discover("tests", pattern="test_*.py")
+    test_suite = test_loader.discover("banterbot/tests", pattern="test_*.py")
     return test_suite
 
 